@@ -0,0 +1,654 @@
+# ************************************************************************
+# *   Copyright (c) Stefan Troeger (stefantroeger@gmx.net) 2021          *
+# *                                                                      *
+# *   This library is free software; you can redistribute it and/or      *
+# *   modify it under the terms of the GNU Library General Public        *
+# *   License as published by the Free Software Foundation; either       *
+# *   version 2 of the License, or (at your option) any later version.   *
+# *                                                                      *
+# *   This library  is distributed in the hope that it will be useful,   *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of     *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the      *
+# *   GNU Library General Public License for more details.               *
+# *                                                                      *
+# *   You should have received a copy of the GNU Library General Public  *
+# *   License along with this library; see the file COPYING.LIB. If not, *
+# *   write to the Free Software Foundation, Inc., 59 Temple Place,      *
+# *   Suite 330, Boston, MA  02111-1307, USA                             *
+# ************************************************************************
+
+# In-process stand-in for the OCP node
+#
+# Implements the ocp.documents.* API used by the add-on, including the semantics of the Dml files in this
+# repository, and routes calls, events and registered procedures between multiple clients. All values are
+# converted like the WAMP serialization would do, and every call, event and transfered byte is counted per
+# client. There is no network and no router involved: the benchmark measures the cost of the add-on itself.
+
+import asyncio, collections, hashlib, mmap, uuid
+from types import SimpleNamespace
+from autobahn.wamp.exception import ApplicationError
+import Documents.Digest as Digest
+
+
+def _wire(value):
+    # converts the value like msgpack serialization does (binary types to bytes, tuples to lists)
+
+    if isinstance(value, (bytes, bytearray, memoryview, mmap.mmap)):
+        return bytes(value)
+    if isinstance(value, (list, tuple)):
+        return [_wire(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _wire(v) for k, v in value.items()}
+
+    return value
+
+
+def _size(value):
+    # payload bytes of the value (binary and string data)
+
+    if isinstance(value, (bytes, bytearray, memoryview, mmap.mmap, str)):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_size(v) for v in value)
+    if isinstance(value, dict):
+        return sum(_size(v) for v in value.values())
+
+    return 0
+
+
+def _error(message):
+    # DML exceptions are reported like the node does
+    return ApplicationError("ocp.error.user.dml.exception", message, "", [], [])
+
+
+class Stats():
+    # Counters for a single client
+
+    def __init__(self):
+        self.calls      = 0
+        self.events     = 0
+        self.bytesIn    = 0     # send by the client to the node
+        self.bytesOut   = 0     # send by the node to the client
+        self.functions  = collections.Counter()
+
+    def copy(self):
+        stats = Stats()
+        stats.calls, stats.events, stats.bytesIn, stats.bytesOut = self.calls, self.events, self.bytesIn, self.bytesOut
+        stats.functions = self.functions.copy()
+        return stats
+
+    def __sub__(self, other):
+        stats = Stats()
+        stats.calls     = self.calls - other.calls
+        stats.events    = self.events - other.events
+        stats.bytesIn   = self.bytesIn - other.bytesIn
+        stats.bytesOut  = self.bytesOut - other.bytesOut
+        stats.functions = self.functions - other.functions
+        return stats
+
+    def toDict(self):
+        return {"calls": self.calls, "events": self.events, "bytesIn": self.bytesIn, "bytesOut": self.bytesOut,
+                "functions": dict(self.functions)}
+
+
+class _Property():
+
+    def __init__(self, name, typeid, group, documentation, status):
+        self.name           = name
+        self.typeid         = typeid
+        self.group          = group
+        self.documentation  = documentation
+        self.status         = status
+        self.data           = None
+        self.version        = 0
+        self.hash           = 0
+
+
+class _Object():
+
+    def __init__(self, name, typeid, created, buckets, leafs):
+        self.typeid         = typeid
+        self.fcName         = name
+        self.created        = created   # creation id
+        self.buckets        = buckets   # bucket sums of the container: {path tuple: sum}
+        self.leafs          = leafs     # leaf membership of the container: {path tuple: {name: hash}}
+        self.hash           = 0         # object hash
+        self.dependencies   = None
+        self.extensions     = []
+        self.properties     = {}
+        self.version        = 0     # extension changes
+        self.propVersion    = 0     # PropertyContainer version
+        self.digest         = 0     # PropertyContainer digest
+
+    def touch(self, prop):
+        prop.version += 1
+        self.propVersion += 1
+
+        hash = Digest.hashProperty(prop.name, prop.data)
+        self.digest = (self.digest - prop.hash + hash) & 0xffffffff
+        prop.hash = hash
+        self.updateHash()
+
+    def updateHash(self, removed = False):
+        # keeps the object hash and the containers bucket sums and leafs up to date, like Object.UpdateHash in the DML
+
+        hash = Digest.hashObject(self.fcName, self.digest) if self.digest and not removed else 0
+        if hash == self.hash:
+            return
+
+        path = Digest.bucket(self.fcName)
+        for level in range(Digest.depth + 1):
+            self.buckets[path[:level]] = (self.buckets.get(path[:level], 0) - self.hash + hash) & 0xffffffff
+        self.hash = hash
+
+        leaf = self.leafs.setdefault(path, {})
+        if hash:
+            leaf[self.fcName] = hash
+        else:
+            leaf.pop(self.fcName, None)
+
+
+class _Document():
+
+    def __init__(self, id, dmlpath):
+        self.id           = id
+        self.dmlpath      = dmlpath
+        self.groups       = {"Objects": {}, "ViewProviders": {}}
+        self.created      = {"Objects": 0, "ViewProviders": 0}
+        self.buckets      = {"Objects": {}, "ViewProviders": {}}
+        self.leafs        = {"Objects": {}, "ViewProviders": {}}
+        self.transaction  = False
+        self.view         = False
+
+
+class FakeNode():
+    ''' In-process OCP node for benchmarking
+
+        Clients are connected via FakeConnection, which provides the subset of the OCP.API interface used by
+        the documents (call, subscribe, register, closeKey). Events are not delivered to the client that caused
+        them, like the node does for WAMP publications.
+
+        Init:
+        latency   - seconds every call is delayed, to emulate the round trip to a real node
+        batched   - if the batch binary procedures (CidsByBinary, BinariesByCid) are available
+        chunksize - size of progressive results for binary data
+    '''
+
+    def __init__(self, latency = 0, batched = True, chunksize = 1024*256):
+
+        self.latency       = latency
+        self.batched       = batched
+        self.chunksize     = chunksize
+
+        self.__documents     = {}
+        self.__binaries      = {}
+        self.__subscriptions = []   # (client, key, handler, topic, match, details)
+        self.__procedures    = {}   # uri: (client, key, handler, details)
+        self.__stats         = {}   # client: Stats
+
+
+    def stats(self, client = None):
+        # returns a copy of the stats for the client, or the sum over all clients
+
+        if client:
+            return self.__stats.setdefault(client, Stats()).copy()
+
+        result = Stats()
+        for stats in self.__stats.values():
+            result.calls     += stats.calls
+            result.events    += stats.events
+            result.bytesIn   += stats.bytesIn
+            result.bytesOut  += stats.bytesOut
+            result.functions += stats.functions
+        return result
+
+
+    # client API
+    # ********************************************************************************************
+
+    async def call(self, client, uri, args, kwargs, options):
+
+        stats = self.__stats.setdefault(client, Stats())
+        stats.calls += 1
+        stats.functions[uri.split(".")[-1]] += 1
+        stats.bytesIn += _size(args)
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        args = _wire(args)
+        progress = options.on_progress if options else None
+        if progress:
+            def progress(*update, callback = progress):
+                stats.bytesOut += _size(update)
+                callback(*_wire(update))
+
+        result = await self.__dispatch(client, uri.split("."), args, kwargs, progress)
+
+        stats.bytesOut += _size(result)
+        return _wire(result)
+
+
+    def subscribe(self, client, key, handler, topic, options):
+
+        match   = options.match if options and options.match else "exact"
+        details = options.details_arg if options else None
+        self.__subscriptions.append((client, key, handler, topic.split("."), match, details))
+
+
+    def register(self, client, key, handler, uri, options):
+
+        details = options.details_arg if options else None
+        self.__procedures[uri] = (client, key, handler, details)
+
+
+    def closeKey(self, client, key):
+
+        self.__subscriptions = [s for s in self.__subscriptions if s[0] is not client or s[1] != key]
+        for uri in [uri for uri, p in self.__procedures.items() if p[0] is client and p[1] == key]:
+            del self.__procedures[uri]
+
+
+    # internal functions
+    # ********************************************************************************************
+
+    def __publish(self, publisher, topic, args):
+
+        components = topic.split(".")
+        for client, key, handler, pattern, match, details in self.__subscriptions:
+
+            if client is publisher or not self.__matches(pattern, match, components):
+                continue
+
+            stats = self.__stats.setdefault(client, Stats())
+            stats.events += 1
+            stats.bytesOut += _size(args)
+
+            kwargs = {details: SimpleNamespace(topic=topic)} if details else {}
+            result = handler(*_wire(args), **kwargs)
+            if asyncio.iscoroutine(result):
+                asyncio.ensure_future(result)
+
+
+    def __matches(self, pattern, match, components):
+
+        if match == "prefix":
+            return components[:len(pattern)] == pattern
+
+        if len(pattern) != len(components):
+            return False
+
+        if match == "wildcard":
+            return all(not p or p == c for p, c in zip(pattern, components))
+
+        return pattern == components
+
+
+    async def __fetch(self, client, uri, key):
+        # fetches binary data from a procedure registered by a client (DataService)
+
+        if uri not in self.__procedures:
+            raise ApplicationError(ApplicationError.NO_SUCH_PROCEDURE, f"no procedure {uri}")
+
+        provider, _, handler, details = self.__procedures[uri]
+        chunks = []
+        kwargs = {details: SimpleNamespace(progress=lambda chunk: chunks.append(bytes(chunk)))} if details else {}
+        result = await handler(key, **kwargs)
+        if result is not None:
+            chunks.append(bytes(result))
+
+        data = b"".join(chunks)
+        self.__stats.setdefault(provider, Stats()).bytesIn += len(data)
+        return data
+
+
+    def __store(self, data):
+
+        cid = "ocp_cid" + hashlib.sha256(data).hexdigest()
+        self.__binaries[cid] = data
+        return cid
+
+
+    def __stream(self, data, progress, index = None):
+
+        for i in range(0, len(data), self.chunksize):
+            if index is None:
+                progress(data[i:i+self.chunksize])
+            else:
+                progress(index, data[i:i+self.chunksize])
+
+
+    async def __dispatch(self, client, path, args, kwargs, progress):
+
+        if path[:2] != ["ocp", "documents"]:
+            raise ApplicationError(ApplicationError.NO_SUCH_PROCEDURE, ".".join(path))
+
+        path = path[2:]
+        if len(path) == 1:
+            return self.__documentsFunction(client, path[0], args)
+
+        if path[0] not in self.__documents:
+            raise _error(f"Document {path[0]} not available")
+
+        doc  = self.__documents[path[0]]
+        path = path[1:]
+
+        if path[0] == "raw":
+            return await self.__raw(client, doc, path[1], args, progress)
+
+        if path[0] == "content":
+            if path[1] == "Transaction":
+                if path[2] == "IsOpen":
+                    return doc.transaction
+                if path[2] == "Close":
+                    doc.transaction = False
+                    return None
+
+            if path[1] == "Document":
+                return self.__document(client, doc, path[2:], args)
+
+        if path == ["view"]:
+            doc.view = args[0]
+            return None
+        if path == ["listPeers"]:
+            return []
+        if path == ["hasMajority"]:
+            return True
+        if path == ["prints"]:
+            return []
+
+        raise ApplicationError(ApplicationError.NO_SUCH_PROCEDURE, ".".join(path))
+
+
+    def __documentsFunction(self, client, function, args):
+
+        if function == "create":
+            id = str(uuid.uuid4())
+            self.__documents[id] = _Document(id, args[0])
+            self.__publish(client, "ocp.documents.created", [id])
+            return id
+        if function == "list":
+            return list(self.__documents.keys())
+        if function == "invitations":
+            return []
+        if function in ["open", "close"]:
+            return None
+        if function == "status":
+            return "open" if args[0] in self.__documents else "none"
+
+        raise ApplicationError(ApplicationError.NO_SUCH_PROCEDURE, function)
+
+
+    async def __raw(self, client, doc, function, args, progress):
+
+        if function in ["CidsByBinary", "BinariesByCid"] and not self.batched:
+            raise ApplicationError(ApplicationError.NO_SUCH_PROCEDURE, function)
+
+        if function == "CidByBinary":
+            data = await self.__fetch(client, *args) if len(args) == 2 else args[0]
+            return self.__store(data)
+
+        if function == "CidsByBinary":
+            datas = await asyncio.gather(*[self.__fetch(client, *entry) if isinstance(entry, list) else self.__dataOf(entry)
+                                           for entry in args[0]])
+            return [self.__store(data) for data in datas]
+
+        if function == "BinaryByCid":
+            data = self.__binaries[args[0]]
+            if not progress:
+                return data
+            self.__stream(data, progress)
+            return None
+
+        if function == "BinariesByCid":
+            for index, cid in enumerate(args[0]):
+                self.__stream(self.__binaries[cid], progress, index)
+            return None
+
+        raise ApplicationError(ApplicationError.NO_SUCH_PROCEDURE, function)
+
+
+    async def __dataOf(self, data):
+        return data
+
+
+    def __document(self, client, doc, path, args):
+        # implements Dml/main.dml, objectmap.dml, object.dml and property.dml
+
+        if len(path) == 1 and path[0] == "sync":
+            self.__publish(client, f"ocp.documents.{doc.id}.content.Document.sync", args)
+            return None
+        
+        group = path[0]
+        if group not in doc.groups:
+            raise ApplicationError(ApplicationError.NO_SUCH_PROCEDURE, ".".join(path))
+
+        objects = doc.groups[group]
+        topic   = f"ocp.documents.{doc.id}.content.Document.{group}"
+
+        if group == "Objects":
+            doc.transaction = True
+
+        if len(path) == 2:
+            function = path[1]
+            if function == "NewObject":
+                name, typeid = args
+                if name in objects:
+                    raise _error("Name already taken")
+                doc.created[group] += 1
+                objects[name] = _Object(name, typeid, doc.created[group], doc.buckets[group], doc.leafs[group])
+                self.__publish(client, topic + ".onObjectCreated", [name, typeid])
+                return None
+            if function == "RemoveObject":
+                objects.pop(args[0]).updateHash(removed=True)
+                self.__publish(client, topic + ".onObjectRemoved", [args[0]])
+                return None
+            if function == "Has":
+                return args[0] in objects
+            if function == "Keys":
+                return list(objects.keys())
+            if function == "GetObjectTypes":
+                return {name: obj.typeid for name, obj in objects.items()}
+            if function == "GetChanges":
+                known   = args[0]
+                changed = {}
+                for name, obj in objects.items():
+                    version = f"{obj.created}:{obj.version + obj.propVersion}"
+                    if known.get(name) != version:
+                        changed[name] = [obj.typeid, version, {p: prop.version for p, prop in obj.properties.items()},
+                                         obj.version, obj.created]
+                return {"objects": changed, "removed": [name for name in known if name not in objects]}
+            if function == "GetDigest":
+                path = tuple(args[0])
+                if len(path) < Digest.depth:
+                    return [doc.buckets[group].get(path + (i,), 0) for i in range(Digest.fanout)]
+                return dict(doc.leafs[group].get(path, {}))
+            if function == "MigrateDigest":
+                # the hashes are always up to date here
+                return None
+
+            raise ApplicationError(ApplicationError.NO_SUCH_PROCEDURE, function)
+
+        name = path[1]
+        if name not in objects:
+            raise _error(f"Object {name} not available")
+
+        obj   = objects[name]
+        topic = f"{topic}.{name}"
+
+        if len(path) == 3:
+            attribute = path[2]
+            if attribute.startswith("on"):
+                self.__publish(client, f"{topic}.{attribute}", args)
+                return None
+            if args:
+                setattr(obj, attribute, args[0])
+                return None
+            return getattr(obj, attribute)
+
+        if path[2] == "Extensions":
+            return self.__extensions(client, obj, topic, path[3], args)
+
+        if path[2] == "Properties":
+            if len(path) == 4:
+                return self.__properties(client, obj, topic + ".Properties", path[3], args)
+
+            return self.__property(client, obj, topic + f".Properties.{path[3]}", path[3], path[4], args)
+
+        raise ApplicationError(ApplicationError.NO_SUCH_PROCEDURE, ".".join(path))
+
+
+    def __extensions(self, client, obj, topic, function, args):
+
+        if function == "Append":
+            obj.extensions.append(args[0])
+            obj.version += 1
+            self.__publish(client, topic + ".onExtensionCreated", [args[0]])
+            return None
+        if function == "GetAll":
+            return list(obj.extensions)
+        if function == "Has":
+            return args[0] in obj.extensions
+        if function == "RemoveByName":
+            if args[0] not in obj.extensions:
+                raise _error("Cannot remove extension: not available")
+            obj.extensions.remove(args[0])
+            obj.version += 1
+            self.__publish(client, topic + ".onExtensionRemoved", [args[0]])
+            return None
+
+        raise ApplicationError(ApplicationError.NO_SUCH_PROCEDURE, function)
+
+
+    def __setup(self, obj, name, typeid, group, documentation, status):
+
+        if name in obj.properties:
+            raise _error(f"Property {name} already exists")
+        obj.properties[name] = _Property(name, typeid, group, documentation, status)
+        obj.propVersion += 1
+
+
+    def __properties(self, client, obj, topic, function, args):
+
+        if function == "SetupProperty":
+            self.__setup(obj, *args)
+            return None
+        if function == "SetupProperties":
+            for name, info in zip(*args):
+                self.__setup(obj, name, info["typeid"], info["group"], info["docu"], info["status"])
+            return None
+        if function == "CreateDynamicProperty":
+            self.__setup(obj, *args)
+            self.__publish(client, topic + ".onDynamicPropertyCreated", args)
+            return None
+        if function == "CreateDynamicProperties":
+            for name, info in zip(*args):
+                self.__setup(obj, name, info["typeid"], info["group"], info["docu"], info["status"])
+            self.__publish(client, topic + ".onDynamicPropertiesCreated", args)
+            return None
+        if function == "RemoveDynamicProperty":
+            obj.digest = (obj.digest - obj.properties.pop(args[0]).hash) & 0xffffffff
+            obj.updateHash()
+            obj.propVersion += 1
+            self.__publish(client, topic + ".onDynamicPropertyRemoved", args)
+            return None
+        if function in ["SetValues", "SetValuesTraced"]:
+            failed  = [name for name in args[0] if name not in obj.properties]
+            written = [(name, value) for name, value in zip(args[0], args[1]) if name in obj.properties]
+            for name, value in written:
+                obj.properties[name].data = value
+                obj.touch(obj.properties[name])
+            event = [[w[0] for w in written], [w[1] for w in written]]
+            if function == "SetValuesTraced" and args[2]:
+                event.append(args[2])
+            self.__publish(client, topic + ".onDatasChanged", event)
+            return failed
+        if function in ["SetStatus", "SetEditorModes"]:
+            failed = []
+            for name, status in zip(*args):
+                if name not in obj.properties:
+                    failed.append(name)
+                    continue
+                self.__status(client, obj, obj.properties[name], f"{topic}.{name}", status, function == "SetEditorModes")
+            return failed
+        if function == "Keys":
+            return list(obj.properties.keys())
+        if function == "GetDigests":
+            return {name: prop.hash for name, prop in obj.properties.items() if prop.hash}
+        if function == "GetVersions":
+            return {name: prop.version for name, prop in obj.properties.items()}
+        if function == "Has":
+            return args[0] in obj.properties
+
+        raise ApplicationError(ApplicationError.NO_SUCH_PROCEDURE, function)
+
+
+    def __status(self, client, obj, prop, topic, status, editorMode):
+
+        if editorMode:
+            status = [s for s in prop.status if s not in ["Hidden", "ReadOnly"]] + list(status)
+
+        prop.status = status
+        obj.touch(prop)
+        self.__publish(client, topic + ".onStatusChanged", [status])
+
+
+    def __property(self, client, obj, topic, name, function, args):
+
+        if name not in obj.properties:
+            raise _error(f"Property {name} not available")
+
+        prop = obj.properties[name]
+        if function in ["SetValue", "SetValueTraced"]:
+            prop.data = args[0]
+            obj.touch(prop)
+            self.__publish(client, topic + ".onDataChanged", list(args))
+            return None
+        if function == "GetValue":
+            return prop.data
+        if function == "GetInfo":
+            return {"id": prop.typeid, "group": prop.group, "docu": prop.documentation, "status": prop.status}
+        if function == "SetEditorMode":
+            self.__status(client, obj, prop, topic, args[0], True)
+            return None
+        if function == "status" and args:
+            self.__status(client, obj, prop, topic, args[0], False)
+            return None
+        if function in ["status", "typeid", "group", "documentation", "data"]:
+            return getattr(prop, function)
+
+        raise ApplicationError(ApplicationError.NO_SUCH_PROCEDURE, function)
+
+
+class _FakeAPI():
+    # The subset of OCP.API used by documents and data service
+
+    def __init__(self, node):
+        self.__node = node
+        self.connected = True
+
+    async def waitTillReady(self):
+        pass
+
+    async def waitForCapacity(self):
+        pass
+
+    async def call(self, uri, *args, options = None, **kwargs):
+        return await self.__node.call(self, uri, list(args), kwargs, options)
+
+    async def subscribe(self, key, handler, topic, options = None):
+        self.__node.subscribe(self, key, handler, topic, options)
+
+    async def register(self, key, handler, uri, options = None):
+        self.__node.register(self, key, handler, uri, options)
+
+    async def closeKey(self, key):
+        self.__node.closeKey(self, key)
+
+
+class FakeConnection():
+    # Replacement for OCP.OCPConnection connected to a FakeNode
+
+    def __init__(self, node):
+        self.node = node
+        self.api  = _FakeAPI(node)
@@ -0,0 +1,558 @@
+# ************************************************************************
+# *   Copyright (c) Stefan Troeger (stefantroeger@gmx.net) 2021          *
+# *                                                                      *
+# *   This library is free software; you can redistribute it and/or      *
+# *   modify it under the terms of the GNU Library General Public        *
+# *   License as published by the Free Software Foundation; either       *
+# *   version 2 of the License, or (at your option) any later version.   *
+# *                                                                      *
+# *   This library  is distributed in the hope that it will be useful,   *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of     *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the      *
+# *   GNU Library General Public License for more details.               *
+# *                                                                      *
+# *   You should have received a copy of the GNU Library General Public  *
+# *   License along with this library; see the file COPYING.LIB. If not, *
+# *   write to the Free Software Foundation, Inc., 59 Temple Place,      *
+# *   Suite 330, Boston, MA  02111-1307, USA                             *
+# ************************************************************************
+
+import asyncio, json, time, platform, random, shutil, statistics, tempfile, uuid
+import FreeCAD
+import Documents.Observer as Observer
+import Documents.Object   as Object
+import Documents.Replica  as Replica
+import Documents.Property as Property
+import Documents.Version  as Version
+import Documents.Spill    as Spill
+from Documents.OnlineDocument import OnlineDocument
+from Documents.Dataservice    import DataService
+from Benchmark.FakeNode       import FakeNode, FakeConnection
+
+# all benchmark documents use this prefix, which allows the observer handler to separate them from user documents
+DocumentPrefix = "OCPBenchmark"
+
+
+class Peer():
+    # A collaborator with its own FreeCAD document, connection and data service. Provides the attributes the
+    # observer expects from a Manager entity
+
+    def __init__(self, node, name):
+
+        self.name             = name
+        self.connection       = FakeConnection(node)
+        self.dataservice      = DataService(str(uuid.uuid4()), self.connection)
+        self.fcdocument       = FreeCAD.newDocument(DocumentPrefix + name)
+        self.online_document  = None
+        self.journal          = None
+
+    async def setup(self, docId, mirror = None):
+
+        await self.dataservice.setup()
+        self.online_document = OnlineDocument(docId, self.fcdocument, self.connection, self.dataservice, mirror)
+        await self.online_document.setup()
+
+    async def close(self):
+
+        if self.online_document:
+            await self.online_document.close()
+        await self.dataservice.close()
+        FreeCAD.closeDocument(self.fcdocument.Name)
+
+
+class _Handler():
+    # Observer handler serving the benchmark peers. Everything else is forwarded to the handler used before,
+    # so that a running collaboration setup is not disturbed
+
+    def __init__(self):
+        self.peers    = []
+        self.previous = None
+
+    def getEntities(self):
+        entities = list(self.peers)
+        if self.previous:
+            entities += self.previous.getEntities()
+        return entities
+
+    def getEntity(self, key, val):
+        for peer in self.peers:
+            if getattr(peer, key) == val:
+                return peer
+
+        if self.previous:
+            return self.previous.getEntity(key, val)
+        return None
+
+    def onFCDocumentOpened(self, doc):
+        if self.previous and not doc.Name.startswith(DocumentPrefix):
+            self.previous.onFCDocumentOpened(doc)
+
+    def onFCDocumentClosed(self, doc):
+        if self.previous and not doc.Name.startswith(DocumentPrefix):
+            self.previous.onFCDocumentClosed(doc)
+
+
+def _createObjects(doc, count, values):
+    # synthetic objects: each has a large numeric list (binary transfer) and some small properties
+
+    for i in range(count):
+        obj = doc.addObject("App::FeaturePython", f"Feature{i}")
+        obj.addProperty("App::PropertyFloatList", "Values", "Benchmark")
+        obj.addProperty("App::PropertyFloat", "Scalar", "Benchmark")
+        obj.addProperty("App::PropertyString", "Text", "Benchmark")
+        obj.Values = [float(v) for v in range(values)]
+        obj.Scalar = 0.0
+        obj.Text   = f"Feature {i}"
+
+
+async def _waitFor(condition, timeout):
+    # waits till condition is true, returns the time it took
+
+    start = time.perf_counter()
+    while not condition():
+        if time.perf_counter() - start > timeout:
+            raise Exception("Benchmark timed out waiting for remote change")
+        await asyncio.sleep(0.0005)
+
+    return time.perf_counter() - start
+
+
+def _latencies(values):
+
+    values = sorted(values)
+    return {"mean": statistics.mean(values),
+            "p50": values[len(values)//2],
+            "p95": values[min(len(values)-1, int(len(values)*0.95))],
+            "max": values[-1]}
+
+
+async def _upload(node, peer, objects, values):
+
+    #the objects are uploaded by asyncSetup, like when sharing an existing document
+    with Observer.blocked(peer.fcdocument):
+        _createObjects(peer.fcdocument, objects, values)
+
+    before = node.stats(peer.connection.api)
+    start  = time.perf_counter()
+    await peer.online_document.asyncSetup()
+    await peer.online_document.waitTillCloseout(60)
+    elapsed = time.perf_counter() - start
+    stats   = node.stats(peer.connection.api) - before
+
+    return {"seconds": elapsed,
+            "objects": objects,
+            "objectsPerSecond": objects / elapsed,
+            "bytesPerSecond": stats.bytesIn / elapsed,
+            "node": stats.toDict()}
+
+
+async def _download(node, peer, objects):
+
+    before = node.stats(peer.connection.api)
+    start  = time.perf_counter()
+    await peer.online_document.asyncLoad()
+    await peer.online_document.waitTillCloseout(60)
+    elapsed = time.perf_counter() - start
+    stats   = node.stats(peer.connection.api) - before
+
+    return {"seconds": elapsed,
+            "objects": objects,
+            "objectsPerSecond": objects / elapsed,
+            "bytesPerSecond": stats.bytesOut / elapsed,
+            "node": stats.toDict()}
+
+
+async def _edit(node, sender, receiver, objects, edits):
+
+    latencies = []
+    before = node.stats()
+    for i in range(edits):
+
+        name   = f"Feature{i % objects}"
+        value  = float(i + 1)
+        remote = receiver.fcdocument.getObject(name)
+
+        start = time.perf_counter()
+        sender.fcdocument.getObject(name).Scalar = value
+        await _waitFor(lambda: remote.Scalar == value, 10)
+        latencies.append(time.perf_counter() - start)
+
+    await sender.online_document.waitTillCloseout(60)
+    await receiver.online_document.waitTillCloseout(60)
+    stats = node.stats() - before
+
+    return {"edits": edits,
+            "latency": _latencies(latencies),
+            "callsPerEdit": stats.calls / edits,
+            "eventsPerEdit": stats.events / edits,
+            "node": stats.toDict()}
+
+
+async def _burst(node, peer, objects, values, repeats):
+    # rapid repeated edits of large list properties: each object is changed multiple times in a row before the
+    # runners can process the changes
+
+    before = node.stats(peer.connection.api)
+    start  = time.perf_counter()
+    for i in range(objects):
+        obj = peer.fcdocument.getObject(f"Feature{i}")
+        for r in range(repeats):
+            obj.Values = [float(v + r) for v in range(values)]
+
+    await peer.online_document.waitTillCloseout(60)
+    elapsed = time.perf_counter() - start
+    stats   = node.stats(peer.connection.api) - before
+    writes  = sum(stats.functions[f] for f in ["SetValue", "SetValues", "SetValueTraced", "SetValuesTraced"])
+
+    return {"seconds": elapsed,
+            "edits": objects * repeats,
+            "editsPerSecond": objects * repeats / elapsed,
+            "writes": writes,
+            "bytesIn": stats.bytesIn,
+            "node": stats.toDict()}
+
+
+async def _verify(node, peers):
+    # digest comparison of every peer with the node after all work is done. Nothing may diverge
+
+    for peer in peers:
+        await peer.online_document.waitTillCloseout(60)
+
+    before = node.stats()
+    start  = time.perf_counter()
+    divergent = {}
+    for peer in peers:
+        result = await peer.online_document.verify()
+        divergent[peer.name] = sum(len(entries) for entries in result.values())
+    elapsed = time.perf_counter() - start
+    stats   = node.stats() - before
+
+    return {"seconds": elapsed,
+            "divergent": divergent,
+            "calls": stats.calls}
+
+
+async def _replica(node, handler, sender, objects, edits):
+    # opening a replicated document: the replica is warmed up, follows some remote edits, and is then applied to
+    # a new document which loads only the changes since the last refresh
+
+    path = tempfile.mkdtemp()
+    peer = Peer(node, "Replica")
+    handler.peers.append(peer)
+    docId = sender.online_document.id
+
+    try:
+        await peer.dataservice.setup()
+        replica = Replica.Replica(docId, peer.connection, peer.dataservice, path)
+
+        start = time.perf_counter()
+        await replica.refresh()
+        warmup = time.perf_counter() - start
+
+        for i in range(edits):
+            sender.fcdocument.getObject(f"Feature{i % objects}").Text = f"Replica {i}"
+        await sender.online_document.waitTillCloseout(60)
+
+        before  = node.stats(peer.connection.api)
+        start   = time.perf_counter()
+        await replica.refresh()
+        refresh = time.perf_counter() - start
+        refreshStats = node.stats(peer.connection.api) - before
+
+        before = node.stats(peer.connection.api)
+        start  = time.perf_counter()
+        mirror = replica.apply(peer.fcdocument)
+        await peer.setup(docId, mirror)
+        await peer.online_document.asyncLoad()
+        await peer.online_document.waitTillCloseout(60)
+        elapsed = time.perf_counter() - start
+        stats   = node.stats(peer.connection.api) - before
+
+        divergent = await peer.online_document.verify()
+
+    finally:
+        handler.peers.remove(peer)
+        await peer.close()
+        shutil.rmtree(path, ignore_errors=True)
+
+    return {"warmupSeconds": warmup,
+            "refreshSeconds": refresh,
+            "refreshCalls": refreshStats.calls,
+            "seconds": elapsed,
+            "objects": objects,
+            "divergent": sum(len(entries) for entries in divergent.values()),
+            "node": stats.toDict()}
+
+
+async def _apply(peer, objects, changes):
+    # throughput of applying remote changes to FreeCAD objects, one by one and within a single bulk
+
+    objs = [peer.fcdocument.getObject(f"Feature{i}") for i in range(objects)]
+
+    start = time.perf_counter()
+    for i in range(changes):
+        Object.setProperty(objs[i % objects], "Scalar", float(i))
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with Object.bulkApply(peer.fcdocument):
+        for i in range(changes):
+            Object.setProperty(objs[i % objects], "Scalar", float(i))
+    bulk = time.perf_counter() - start
+
+    return {"changes": changes,
+            "changesPerSecond": changes / single,
+            "bulkChangesPerSecond": changes / bulk}
+
+
+async def _guiObserver(peer, objects, changes):
+    # throughput of the GUI observer path for viewprovider changes, i.e. how fast FreeCAD changes are dispatched
+    # into the online document runners. Processing of the queued tasks is not part of the measurement
+
+    vps = [obj.ViewObject for obj in peer.fcdocument.Objects if obj.ViewObject]
+    if not vps:
+        return {"changes": 0}
+
+    start = time.perf_counter()
+    for i in range(changes):
+        vps[i % len(vps)].Visibility = bool(i % 2)
+    elapsed = time.perf_counter() - start
+
+    await peer.online_document.waitTillCloseout(600)
+
+    return {"objects": objects,
+            "changes": changes,
+            "seconds": elapsed,
+            "changesPerSecond": changes / elapsed}
+
+
+def _perCall(fnc, calls, rounds):
+    # average microseconds per call of fnc for all argument tuples in calls
+
+    start = time.perf_counter()
+    for i in range(rounds):
+        for args in calls:
+            fnc(*args)
+    return (time.perf_counter() - start) / (rounds * len(calls)) * 1e6
+
+
+def _uncachedInformation(obj, prop):
+    # the property information as created before the information cache: all metadata is read per call
+
+    info = {}
+    info["docu"] = obj.getDocumentationOfProperty(prop)
+    info["group"] = obj.getGroupOfProperty(prop)
+    info["typeid"] = obj.getTypeIdOfProperty(prop)
+    info["status"] = Property.getStatus(obj, prop)
+    return info
+
+
+def _parsedVersion():
+    # the version check as done before Documents/Version: the FreeCAD version is parsed per call
+    return float(".".join(FreeCAD.Version()[0:2])) >= 0.19
+
+
+def _cachedVersion():
+    return Version.hasPropertyStatus
+
+
+def _information(doc, rounds):
+    # cost of the property information and version checks done by the observer callbacks and property
+    # conversions, with and without the caches
+
+    calls = [(obj, prop) for obj in doc.Objects for prop in obj.PropertiesList]
+    Property.__informationCache__.clear()
+
+    return {"calls": len(calls) * rounds,
+            "uncachedMicroseconds": _perCall(_uncachedInformation, calls, rounds),
+            "cachedMicroseconds": _perCall(Property.createInformation, calls, rounds),
+            "parsedVersionMicroseconds": _perCall(_parsedVersion, [()] * len(calls), rounds),
+            "cachedVersionMicroseconds": _perCall(_cachedVersion, [()] * len(calls), rounds)}
+
+
+def _conversion(doc, values):
+    # throughput of a float list property: FreeCADs compressed property dump as used before the buffer
+    # converters, against packing into and unpacking from the buffers. About 8 MB are converted per direction
+
+    obj    = doc.getObject("Feature0")
+    size   = values * 8 / 1e6
+    rounds = max(1, int(8 / size))
+
+    start = time.perf_counter()
+    for i in range(rounds):
+        dump = obj.dumpPropertyContent("Values", Compression=9)
+    dumped = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(rounds):
+        obj.restorePropertyContent("Values", dump)
+    restored = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(rounds):
+        buffer = Property.convertPropertyToWamp(obj, "Values")
+        if i < rounds - 1:
+            Spill.release(buffer)
+    packed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(rounds):
+        Property.convertWampToProperty(obj, "Values", buffer)
+    unpacked = time.perf_counter() - start
+    Spill.release(buffer)
+
+    return {"values": values,
+            "rounds": rounds,
+            "dumpMBs": size * rounds / dumped,
+            "restoreMBs": size * rounds / restored,
+            "packMBs": size * rounds / packed,
+            "unpackMBs": size * rounds / unpacked}
+
+
+async def observer(output = None, objects = 10000, changes = 10000):
+    ''' Measures the GUI observer throughput for a document with many objects and returns the results as dict.
+        If output is given the results are additionally written as JSON into that file.
+
+        objects - number of objects in the document
+        changes - number of viewprovider property changes
+    '''
+
+    node    = FakeNode()
+    handler = _Handler()
+    handler.previous = Observer.setHandler(handler)
+
+    peer = Peer(node, "Observer")
+    handler.peers = [peer]
+
+    try:
+        docId = await peer.connection.api.call("ocp.documents.create", "")
+        await peer.setup(docId)
+
+        with Observer.blocked(peer.fcdocument):
+            for i in range(objects):
+                peer.fcdocument.addObject("App::FeaturePython", f"Feature{i}")
+        await peer.online_document.asyncSetup()
+        await peer.online_document.waitTillCloseout(600)
+
+        results = {"guiObserver": await _guiObserver(peer, objects, changes)}
+
+    finally:
+        await peer.close()
+
+        if handler.previous:
+            Observer.setHandler(handler.previous)
+        else:
+            handler.peers = []
+
+    report = {"timestamp": time.time(),
+              "platform": platform.platform(),
+              "python": platform.python_version(),
+              "freecad": ".".join(FreeCAD.Version()[0:3]),
+              "config": {"objects": objects, "changes": changes},
+              "results": results}
+
+    if output:
+        with open(output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    return report
+
+
+async def properties(output = None, objects = 100, values = 1000000, rounds = 100):
+    ''' Measures the property handling of the observer callbacks and the property conversion, each in the way it
+        was done before the caches and buffer converters and the current one. Returns the results as dict, if output
+        is given they are additionally written as JSON into that file.
+
+        objects - number of synthetic objects whose property information is created
+        values  - number of floats in the converted list property
+        rounds  - repetitions of the property information creation for all properties
+    '''
+
+    handler = _Handler()
+    handler.previous = Observer.setHandler(handler)
+    doc = FreeCAD.newDocument(DocumentPrefix + "Properties")
+
+    try:
+        # not online, the observers only see a document without entity
+        with Observer.blocked(doc):
+            _createObjects(doc, objects, 1)
+            # coordinate like data, which compresses about as well as real geometry
+            generator = random.Random(0)
+            doc.getObject("Feature0").Values = [round(generator.uniform(-1000, 1000), 3) for v in range(values)]
+
+            results = {"information": _information(doc, rounds),
+                       "conversion": _conversion(doc, values)}
+
+    finally:
+        FreeCAD.closeDocument(doc.Name)
+        Observer.setHandler(handler.previous)
+
+    report = {"timestamp": time.time(),
+              "platform": platform.platform(),
+              "python": platform.python_version(),
+              "freecad": ".".join(FreeCAD.Version()[0:3]),
+              "config": {"objects": objects, "values": values, "rounds": rounds},
+              "results": results}
+
+    if output:
+        with open(output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    return report
+
+
+async def run(output = None, objects = 100, values = 10000, edits = 50, latency = 0, batched = True, repeats = 10):
+    ''' Runs all benchmark scenarios and returns the results as dict. If output is given the results are
+        additionally written as JSON into that file.
+
+        objects - number of synthetic objects in the document
+        values  - number of floats in the list property of each object
+        edits   - number of single property edits for the latency measurement
+        latency - seconds the fake node delays each call
+        batched - if the fake node supports the batch binary procedures
+        repeats - number of consecutive edits per object in the burst scenario
+    '''
+
+    node    = FakeNode(latency=latency, batched=batched)
+    handler = _Handler()
+    handler.previous = Observer.setHandler(handler)
+
+    sender   = Peer(node, "Sender")
+    receiver = Peer(node, "Receiver")
+    handler.peers = [sender, receiver]
+
+    try:
+        docId = await sender.connection.api.call("ocp.documents.create", "")
+        await sender.setup(docId)
+        await receiver.setup(docId)
+
+        results = {"upload":   await _upload(node, sender, objects, values),
+                   "download": await _download(node, receiver, objects),
+                   "edit":     await _edit(node, sender, receiver, objects, edits),
+                   "burst":    await _burst(node, sender, objects, values, repeats),
+                   "verify":   await _verify(node, [sender, receiver]),
+                   "replica":  await _replica(node, handler, sender, objects, edits),
+                   "apply":    await _apply(receiver, objects, edits * 100)}
+
+    finally:
+        await sender.close()
+        await receiver.close()
+        
+        if handler.previous:
+            Observer.setHandler(handler.previous)
+        else:
+            handler.peers = []
+
+    report = {"timestamp": time.time(),
+              "platform": platform.platform(),
+              "python": platform.python_version(),
+              "freecad": ".".join(FreeCAD.Version()[0:3]),
+              "config": {"objects": objects, "values": values, "edits": edits, "latency": latency, "batched": batched,
+                         "repeats": repeats},
+              "results": results}
+
+    if output:
+        with open(output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    return report
@@ -0,0 +1,470 @@
+# ************************************************************************
+# *   Copyright (c) Stefan Troeger (stefantroeger@gmx.net) 2021          *
+# *                                                                      *
+# *   This library is free software; you can redistribute it and/or      *
+# *   modify it under the terms of the GNU Library General Public        *
+# *   License as published by the Free Software Foundation; either       *
+# *   version 2 of the License, or (at your option) any later version.   *
+# *                                                                      *
+# *   This library  is distributed in the hope that it will be useful,   *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of     *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the      *
+# *   GNU Library General Public License for more details.               *
+# *                                                                      *
+# *   You should have received a copy of the GNU Library General Public  *
+# *   License along with this library; see the file COPYING.LIB. If not, *
+# *   write to the Free Software Foundation, Inc., 59 Temple Place,      *
+# *   Suite 330, Boston, MA  02111-1307, USA                             *
+# ************************************************************************
+
+# Headless stand-in for the FreeCAD module
+#
+# Provides the part of the FreeCAD API used by the Documents package: documents, objects with static and dynamic
+# properties, property status, content dumps, extensions and document observers. Behaves like FreeCAD 0.19.
+# Only meant for benchmarking and profiling, there is no geometry and no recompute logic.
+
+import pickle, traceback, zlib
+from types import SimpleNamespace
+
+GuiUp = False
+
+def Version():
+    return ["0", "19", "0 (Headless)"]
+
+
+# Base types
+# ********************************************************************************************
+
+class Vector():
+
+    def __init__(self, x = 0.0, y = 0.0, z = 0.0):
+        self.x, self.y, self.z = float(x), float(y), float(z)
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+
+class Rotation():
+
+    def __init__(self, q0 = 0.0, q1 = 0.0, q2 = 0.0, q3 = 1.0):
+        self.Q = (float(q0), float(q1), float(q2), float(q3))
+
+
+class Placement():
+
+    def __init__(self, base = None, rotation = None):
+        self.Base     = base if base else Vector()
+        self.Rotation = rotation if rotation else Rotation()
+
+
+class Matrix():
+
+    def __init__(self, *values):
+        self.A = tuple(values) if values else (1.0,0.0,0.0,0.0, 0.0,1.0,0.0,0.0, 0.0,0.0,1.0,0.0, 0.0,0.0,0.0,1.0)
+
+
+# python extension types known to the type system
+Base = SimpleNamespace(TypeId = SimpleNamespace(getAllDerivedFrom = lambda base: [SimpleNamespace(Name=n) for n in _Extensions]))
+
+_Extensions = ["App::GroupExtensionPython", "App::GeoFeatureGroupExtensionPython", "App::OriginGroupExtensionPython",
+                "Part::AttachExtensionPython"]
+
+# status names as supported by FreeCAD 0.19
+_Status = ["Immutable", "ReadOnly", "Hidden", "Transient", "MaterialEdit", "NoMaterialListEdit", "Output",
+            "LockDynamic", "NoModify", "PartialTrigger", "NoRecompute", "Single", "Ordered", "EvalOnRestore"]
+
+
+# Observers
+# ********************************************************************************************
+
+_Observers = []
+
+def addDocumentObserver(observer):
+    _Observers.append(observer)
+
+def removeDocumentObserver(observer):
+    _Observers.remove(observer)
+
+def _notify(observers, slot, *args):
+    # calls the slot on all observers that implement it. Like FreeCAD, exceptions are printed but not propagated
+
+    for observer in list(observers):
+        function = getattr(observer, slot, None)
+        if function:
+            try:
+                function(*args)
+            except Exception:
+                traceback.print_exc()
+
+
+def _notifyApp(slot, *args):
+    _notify(_Observers, slot, *args)
+
+
+# Property containers
+# ********************************************************************************************
+
+class _Property():
+
+    __slots__ = ["typeid", "group", "docu", "status", "value", "dynamic"]
+
+    def __init__(self, typeid, group, docu, status, value, dynamic):
+        self.typeid  = typeid
+        self.group   = group
+        self.docu    = docu
+        self.status  = status
+        self.value   = value
+        self.dynamic = dynamic
+
+
+def _default(typeid):
+
+    if typeid.endswith("List") or typeid == "App::PropertyExpressionEngine":
+        return []
+    if typeid in ["App::PropertyBool"]:
+        return False
+    if typeid in ["App::PropertyInteger", "App::PropertyPercent"]:
+        return 0
+    if typeid in ["App::PropertyString", "App::PropertyPath", "App::PropertyUUID"]:
+        return ""
+    if typeid.startswith("App::PropertyLink") or typeid == "App::PropertyPythonObject":
+        return None
+    if typeid in ["App::PropertyVector", "App::PropertyVectorDistance", "App::PropertyPosition", "App::PropertyDirection"]:
+        return Vector()
+    if typeid == "App::PropertyPlacement":
+        return Placement()
+    if typeid == "App::PropertyMatrix":
+        return Matrix()
+    if typeid == "App::PropertyColor":
+        return (0.0, 0.0, 0.0, 0.0)
+
+    return 0.0
+
+
+class PropertyContainer():
+    # Base for document objects and view providers. Property values are stored in a dict, attribute access
+    # works like in FreeCAD and notifies the observers
+
+    def __init__(self, typeid):
+        object.__setattr__(self, "_properties", {})
+        object.__setattr__(self, "_extensions", [])
+        object.__setattr__(self, "TypeId", typeid)
+
+    def _addStatic(self, typeid, name, group = "Base", value = None):
+        self._properties[name] = _Property(typeid, group, "", [], value if value is not None else _default(typeid), False)
+
+    def _changed(self, prop):
+        pass
+
+    def _observers(self):
+        return _Observers
+
+    def __getattr__(self, name):
+        properties = object.__getattribute__(self, "_properties")
+        if name in properties:
+            return properties[name].value
+        raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        if name in self._properties:
+            self._properties[name].value = value
+            self._changed(name)
+        else:
+            object.__setattr__(self, name, value)
+
+    @property
+    def PropertiesList(self):
+        return list(self._properties.keys())
+
+    def getPropertyByName(self, prop):
+        return self._properties[prop].value
+
+    def getTypeIdOfProperty(self, prop):
+        return self._properties[prop].typeid
+
+    def getGroupOfProperty(self, prop):
+        return self._properties[prop].group
+
+    def getDocumentationOfProperty(self, prop):
+        return self._properties[prop].docu
+
+    def getTypeOfProperty(self, prop):
+        return [s for s in self._properties[prop].status if s in ["ReadOnly", "Transient", "Hidden", "Output", "NoRecompute"]]
+
+    def getEditorMode(self, prop):
+        return [s for s in self._properties[prop].status if s in ["ReadOnly", "Hidden"]]
+
+    def setEditorMode(self, prop, mode):
+        status = [s for s in self._properties[prop].status if s not in ["ReadOnly", "Hidden"]]
+        self._properties[prop].status = status + list(mode)
+        _notify(self._observers(), "slotChangePropertyEditor", self, prop)
+
+    def getPropertyStatus(self, prop = None):
+        if prop is None:
+            return list(_Status)
+
+        # like FreeCAD, status bits without name are reported as integer, e.g. 21 for dynamic properties
+        entry  = self._properties[prop]
+        status = [stat for stat in entry.status if stat != 21]
+        if entry.dynamic:
+            status.append(21)
+        return status
+
+    def setPropertyStatus(self, prop, status):
+        if not isinstance(status, list):
+            status = [status]
+
+        current = self._properties[prop].status
+        for entry in status:
+            if isinstance(entry, str) and entry.startswith("-"):
+                if entry[1:] in current:
+                    current.remove(entry[1:])
+            elif isinstance(entry, int) and entry < 0:
+                if -entry in current:
+                    current.remove(-entry)
+            elif entry not in current:
+                current.append(entry)
+
+        _notify(self._observers(), "slotChangePropertyEditor", self, prop)
+
+    def addProperty(self, typeid, name, group = "", doc = "", attr = 0, readonly = False, hidden = False):
+        if name in self._properties:
+            raise Exception(f"Property {name} already exists")
+
+        status = []
+        if readonly:
+            status.append("ReadOnly")
+        if hidden:
+            status.append("Hidden")
+
+        self._properties[name] = _Property(typeid, group, doc, status, _default(typeid), True)
+        _notify(self._observers(), "slotAppendDynamicProperty", self, name)
+        return self
+
+    def removeProperty(self, name):
+        if name not in self._properties or not self._properties[name].dynamic:
+            return False
+
+        _notify(self._observers(), "slotRemoveDynamicProperty", self, name)
+        del self._properties[name]
+        return True
+
+    def dumpPropertyContent(self, prop, Compression = 3):
+        # like FreeCAD the dump is a compressed stream
+        return bytearray(zlib.compress(pickle.dumps(self._properties[prop].value), Compression))
+
+    def restorePropertyContent(self, prop, data):
+        self._properties[prop].value = pickle.loads(zlib.decompress(data))
+        self._changed(prop)
+
+    def hasExtension(self, extension):
+        return extension in self._extensions
+
+    def addExtension(self, extension, proxy = None):
+        _notify(self._observers(), "slotBeforeAddingDynamicExtension", self, extension)
+        self._extensions.append(extension)
+        if "ExtensionProxy" not in self._properties:
+            self._addStatic("App::PropertyPythonObject", "ExtensionProxy")
+        _notify(self._observers(), "slotAddedDynamicExtension", self, extension)
+
+    def removeExtension(self, extension, proxy = None):
+        self._extensions.remove(extension)
+
+
+class DocumentObject(PropertyContainer):
+
+    def __init__(self, document, typeid, name):
+        super().__init__(typeid)
+
+        object.__setattr__(self, "Document", document)
+        object.__setattr__(self, "Name", name)
+        object.__setattr__(self, "Removing", False)
+        object.__setattr__(self, "_touched", False)
+        object.__setattr__(self, "ViewObject", None)
+
+        self._addStatic("App::PropertyString", "Label", value=name)
+        self._addStatic("App::PropertyString", "Label2")
+        self._addStatic("App::PropertyExpressionEngine", "ExpressionEngine")
+        self._addStatic("App::PropertyBool", "Visibility", value=True)
+        if typeid.endswith("Python"):
+            self._addStatic("App::PropertyPythonObject", "Proxy")
+
+    def _changed(self, prop):
+        object.__setattr__(self, "_touched", True)
+        _notifyApp("slotChangedObject", self, prop)
+
+    def isDerivedFrom(self, typeid):
+        return typeid in ["App::DocumentObject", "Base::Persistence", self.TypeId]
+
+    @property
+    def State(self):
+        return ["Touched"] if self._touched else []
+
+    @property
+    def OutList(self):
+        result = []
+        for prop in self._properties.values():
+            if prop.typeid.startswith("App::PropertyLink") and isinstance(prop.value, DocumentObject):
+                result.append(prop.value)
+        return result
+
+    @property
+    def InList(self):
+        return [obj for obj in self.Document.Objects if self in obj.OutList]
+
+    def touch(self):
+        object.__setattr__(self, "_touched", True)
+
+    def purgeTouched(self):
+        object.__setattr__(self, "_touched", False)
+
+    def recompute(self):
+        object.__setattr__(self, "_touched", False)
+        _notifyApp("slotRecomputedObject", self)
+        return True
+
+    def setExpression(self, prop, expression):
+        engine = [e for e in self.ExpressionEngine if e[0] != prop]
+        if expression is not None:
+            engine.append((prop, expression))
+        self._properties["ExpressionEngine"].value = engine
+
+
+# Documents
+# ********************************************************************************************
+
+_Documents = {}
+ActiveDocument = None
+
+
+class Document():
+
+    def __init__(self, name):
+        self.Name     = name
+        self.Label    = name
+        self.UndoMode = 1
+        self.__objects = {}
+
+    def isDerivedFrom(self, typeid):
+        return typeid in ["App::Document", "App::PropertyContainer"]
+
+    def __getattr__(self, name):
+        objects = self.__dict__.get("_Document__objects", {})
+        if name in objects:
+            return objects[name]
+        raise AttributeError(name)
+
+    @property
+    def Objects(self):
+        return list(self.__objects.values())
+
+    def getObject(self, name):
+        return self.__objects.get(name, None)
+
+    def addObject(self, typeid, name = None):
+
+        base = name if name else typeid.split("::")[-1]
+        name, index = base, 0
+        while name in self.__objects:
+            index += 1
+            name = f"{base}{index:03d}"
+
+        obj = DocumentObject(self, typeid, name)
+        self.__objects[name] = obj
+        _notifyApp("slotCreatedObject", obj)
+
+        import FreeCADGui
+        FreeCADGui._createViewProvider(obj)
+        return obj
+
+    def removeObject(self, name):
+
+        obj = self.__objects[name]
+        object.__setattr__(obj, "Removing", True)
+        _notifyApp("slotDeletedObject", obj)
+        del self.__objects[name]
+
+    def recompute(self):
+
+        _notifyApp("slotBeforeRecomputeDocument", self)
+        touched = [obj for obj in self.Objects if obj._touched]
+        for obj in touched:
+            obj.recompute()
+        _notifyApp("slotRecomputedDocument", self)
+        return len(touched)
+
+
+def newDocument(name = "Unnamed"):
+    global ActiveDocument
+
+    base, index = name, 0
+    while name in _Documents:
+        index += 1
+        name = f"{base}{index}"
+
+    doc = Document(name)
+    _Documents[name] = doc
+    ActiveDocument = doc
+    _notifyApp("slotCreatedDocument", doc)
+
+    import FreeCADGui
+    FreeCADGui._createDocument(doc)
+    return doc
+
+
+def closeDocument(name):
+    global ActiveDocument
+
+    doc = _Documents.pop(name)
+    _notifyApp("slotDeletedDocument", doc)
+
+    import FreeCADGui
+    FreeCADGui._deleteDocument(doc)
+
+    if ActiveDocument is doc:
+        ActiveDocument = None
+
+
+def getDocument(name):
+    return _Documents[name]
+
+
+def listDocuments():
+    return dict(_Documents)
+
+
+# Parameters
+# ********************************************************************************************
+
+class _ParameterGroup():
+
+    def __init__(self):
+        self.__values = {}
+        self.__groups = {}
+
+    def GetGroup(self, name):
+        return self.__groups.setdefault(name, _ParameterGroup())
+
+    def HasGroup(self, name):
+        return name in self.__groups
+
+    def __get(self, name, default):
+        return self.__values.get(name, default)
+
+    def __set(self, name, value):
+        self.__values[name] = value
+
+    GetBool = GetInt = GetFloat = GetString = __get
+    SetBool = SetInt = SetFloat = SetString = __set
+
+
+_Parameters = _ParameterGroup()
+
+def ParamGet(path):
+    group = _Parameters
+    for name in path.split(":")[-1].split("/"):
+        group = group.GetGroup(name)
+    return group
@@ -0,0 +1,102 @@
+# ************************************************************************
+# *   Copyright (c) Stefan Troeger (stefantroeger@gmx.net) 2021          *
+# *                                                                      *
+# *   This library is free software; you can redistribute it and/or      *
+# *   modify it under the terms of the GNU Library General Public        *
+# *   License as published by the Free Software Foundation; either       *
+# *   version 2 of the License, or (at your option) any later version.   *
+# *                                                                      *
+# *   This library  is distributed in the hope that it will be useful,   *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of     *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the      *
+# *   GNU Library General Public License for more details.               *
+# *                                                                      *
+# *   You should have received a copy of the GNU Library General Public  *
+# *   License along with this library; see the file COPYING.LIB. If not, *
+# *   write to the Free Software Foundation, Inc., 59 Temple Place,      *
+# *   Suite 330, Boston, MA  02111-1307, USA                             *
+# ************************************************************************
+
+# Headless stand-in for the FreeCADGui module
+#
+# Every document object gets a view provider with some default properties. Like in FreeCAD the app document
+# observers are informed about dynamic property, editor mode and extension changes of view providers, while
+# value changes are only reported to the gui observers.
+
+import FreeCAD
+
+_Observers = []
+_Documents = {}
+
+
+def addDocumentObserver(observer):
+    _Observers.append(observer)
+
+def removeDocumentObserver(observer):
+    _Observers.remove(observer)
+
+
+class Document():
+
+    def __init__(self, document):
+        self.Document = document
+
+    def isDerivedFrom(self, typeid):
+        return typeid in ["Gui::Document"]
+
+    def getObject(self, name):
+        obj = self.Document.getObject(name)
+        return obj.ViewObject if obj else None
+
+
+class ViewProvider(FreeCAD.PropertyContainer):
+
+    def __init__(self, obj):
+
+        typeid = "Gui::ViewProviderPython" if obj.TypeId.endswith("Python") else "Gui::ViewProviderDocumentObject"
+        super().__init__(typeid)
+
+        object.__setattr__(self, "Object", obj)
+        self._addStatic("App::PropertyBool", "Visibility", "Display Options", True)
+        self._addStatic("App::PropertyEnumeration", "DisplayMode", "Display Options", "Default")
+        self._addStatic("App::PropertyBool", "ShowInTree", "Display Options", True)
+        self._addStatic("App::PropertyEnumeration", "OnTopWhenSelected", "Base", "Disabled")
+        self._addStatic("App::PropertyEnumeration", "SelectionStyle", "Base", "Shape")
+        if typeid.endswith("Python"):
+            self._addStatic("App::PropertyPythonObject", "Proxy")
+
+    @property
+    def Document(self):
+        return _Documents[self.Object.Document.Name]
+
+    def _changed(self, prop):
+        FreeCAD._notify(_Observers, "slotChangedObject", self, prop)
+
+    def isDerivedFrom(self, typeid):
+        return typeid in ["Gui::ViewProvider", "Gui::ViewProviderDocumentObject", self.TypeId]
+
+
+def getDocument(name):
+    return _Documents[name]
+
+
+def _createDocument(doc):
+    # called by the FreeCAD module for each new app document
+
+    guidoc = Document(doc)
+    _Documents[doc.Name] = guidoc
+    FreeCAD._notify(_Observers, "slotCreatedDocument", guidoc)
+
+
+def _deleteDocument(doc):
+
+    guidoc = _Documents.pop(doc.Name)
+    FreeCAD._notify(_Observers, "slotDeletedDocument", guidoc)
+
+
+def _createViewProvider(obj):
+    # called by the FreeCAD module for each new document object
+
+    vp = ViewProvider(obj)
+    object.__setattr__(obj, "ViewObject", vp)
+    FreeCAD._notify(_Observers, "slotCreatedObject", vp)
@@ -0,0 +1,80 @@
+# ************************************************************************
+# *   Copyright (c) Stefan Troeger (stefantroeger@gmx.net) 2021          *
+# *                                                                      *
+# *   This library is free software; you can redistribute it and/or      *
+# *   modify it under the terms of the GNU Library General Public        *
+# *   License as published by the Free Software Foundation; either       *
+# *   version 2 of the License, or (at your option) any later version.   *
+# *                                                                      *
+# *   This library  is distributed in the hope that it will be useful,   *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of     *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the      *
+# *   GNU Library General Public License for more details.               *
+# *                                                                      *
+# *   You should have received a copy of the GNU Library General Public  *
+# *   License along with this library; see the file COPYING.LIB. If not, *
+# *   write to the Free Software Foundation, Inc., 59 Temple Place,      *
+# *   Suite 330, Boston, MA  02111-1307, USA                             *
+# ************************************************************************
+
+# Minimal QtCore stand-in: the parts needed to import the Utils helpers and the Documents package. Signals work 
+# as plain python callbacks, there is no event loop or meta object system.
+
+
+def QT_TRANSLATE_NOOP(context, text):
+    return text
+
+
+class QObject():
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+class _BoundSignal():
+
+    def __init__(self):
+        self.__slots = []
+
+    def connect(self, slot):
+        self.__slots.append(slot)
+
+    def disconnect(self, slot = None):
+        if slot is None:
+            self.__slots.clear()
+        else:
+            self.__slots.remove(slot)
+
+    def emit(self, *args):
+        for slot in list(self.__slots):
+            slot(*args)
+
+
+class Signal():
+
+    def __init__(self, *types, **kwargs):
+        self.__name = None
+
+    def __set_name__(self, owner, name):
+        self.__name = "_signal_" + name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        if self.__name not in instance.__dict__:
+            instance.__dict__[self.__name] = _BoundSignal()
+        return instance.__dict__[self.__name]
+
+
+def Slot(*types, **kwargs):
+    return lambda fnc: fnc
+
+
+class Property(property):
+    # supports Property(type, getter, setter, ...) as well as the decorator form @Property(type, notify=...)
+
+    def __init__(self, type, fget = None, fset = None, **kwargs):
+        super().__init__(fget, fset)
+
+    def __call__(self, fget):
+        return Property(None, fget)
@@ -0,0 +1,43 @@
+# ************************************************************************
+# *   Copyright (c) Stefan Troeger (stefantroeger@gmx.net) 2021          *
+# *                                                                      *
+# *   This library is free software; you can redistribute it and/or      *
+# *   modify it under the terms of the GNU Library General Public        *
+# *   License as published by the Free Software Foundation; either       *
+# *   version 2 of the License, or (at your option) any later version.   *
+# *                                                                      *
+# *   This library  is distributed in the hope that it will be useful,   *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of     *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the      *
+# *   GNU Library General Public License for more details.               *
+# *                                                                      *
+# *   You should have received a copy of the GNU Library General Public  *
+# *   License along with this library; see the file COPYING.LIB. If not, *
+# *   write to the Free Software Foundation, Inc., 59 Temple Place,      *
+# *   Suite 330, Boston, MA  02111-1307, USA                             *
+# ************************************************************************
+
+# Headless FreeCAD stand-ins
+#
+# Allows the Documents package to be imported and profiled without a FreeCAD installation, e.g. with cProfile
+# or py-spy on documents with many thousand objects. install() must be called before FreeCAD is imported the
+# first time, it is a no-op if the real FreeCAD is already loaded.
+#
+# Documents imports Utils, whose package init loads the Qt based helpers. If PySide2 is not installed either, a
+# minimal QtCore stand-in (Headless/Qt) is used, which only supports defining the helpers, not running them.
+
+import os, sys
+
+def install():
+    # makes the stand-in FreeCAD and FreeCADGui modules importable. Returns True if they are used
+
+    if "FreeCAD" in sys.modules:
+        return getattr(sys.modules["FreeCAD"], "__file__", "").startswith(os.path.dirname(__file__))
+
+    try:
+        import PySide2
+    except ImportError:
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), "Qt"))
+
+    sys.path.insert(0, os.path.dirname(__file__))
+    return True
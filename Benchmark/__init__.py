@@ -0,0 +1,39 @@
+# ************************************************************************
+# *   Copyright (c) Stefan Troeger (stefantroeger@gmx.net) 2021          *
+# *                                                                      *
+# *   This library is free software; you can redistribute it and/or      *
+# *   modify it under the terms of the GNU Library General Public        *
+# *   License as published by the Free Software Foundation; either       *
+# *   version 2 of the License, or (at your option) any later version.   *
+# *                                                                      *
+# *   This library  is distributed in the hope that it will be useful,   *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of     *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the      *
+# *   GNU Library General Public License for more details.               *
+# *                                                                      *
+# *   You should have received a copy of the GNU Library General Public  *
+# *   License along with this library; see the file COPYING.LIB. If not, *
+# *   write to the Free Software Foundation, Inc., 59 Temple Place,      *
+# *   Suite 330, Boston, MA  02111-1307, USA                             *
+# ************************************************************************
+
+# Benchmark suite for the document synchronisation pipeline
+#
+# Two peers share a document through an in-process fake OCP node, and upload, download and edit latency are 
+# measured. Run from the FreeCAD python console (the collaboration event loop must be running):
+#
+#   import asyncio, Benchmark
+#   asyncio.ensure_future(Benchmark.run("benchmark.json"))
+#
+# or without FreeCAD, using the headless stand-ins in Benchmark/Headless:
+#
+#   python -m Benchmark --objects 10000 --profile profile.out
+
+try:
+    import FreeCAD
+except ImportError:
+    import Benchmark.Headless as Headless
+    Headless.install()
+
+from Benchmark.Harness  import run, observer, properties
+from Benchmark.FakeNode import FakeNode, FakeConnection
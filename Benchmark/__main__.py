@@ -0,0 +1,66 @@
+# ************************************************************************
+# *   Copyright (c) Stefan Troeger (stefantroeger@gmx.net) 2021          *
+# *                                                                      *
+# *   This library is free software; you can redistribute it and/or      *
+# *   modify it under the terms of the GNU Library General Public        *
+# *   License as published by the Free Software Foundation; either       *
+# *   version 2 of the License, or (at your option) any later version.   *
+# *                                                                      *
+# *   This library  is distributed in the hope that it will be useful,   *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of     *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the      *
+# *   GNU Library General Public License for more details.               *
+# *                                                                      *
+# *   You should have received a copy of the GNU Library General Public  *
+# *   License along with this library; see the file COPYING.LIB. If not, *
+# *   write to the Free Software Foundation, Inc., 59 Temple Place,      *
+# *   Suite 330, Boston, MA  02111-1307, USA                             *
+# ************************************************************************
+
+# Command line entry point: python -m Benchmark [options]
+#
+# Outside of FreeCAD the headless stand-ins are used (see Benchmark/Headless). With --profile the complete run
+# is recorded with cProfile, the stats file can be inspected with pstats or snakeviz. For sampling profilers
+# like py-spy simply start this module through them.
+# --observer and --properties run a single measurement instead of the synchronisation scenarios: the GUI observer
+# throughput, respectively the property information and conversion, each the way it was done before their
+# optimization and the current one.
+
+import argparse, asyncio, cProfile, json
+import Benchmark
+
+parser = argparse.ArgumentParser(prog="python -m Benchmark", description="Document synchronisation benchmark")
+parser.add_argument("--objects", type=int,   default=None,  help="number of synthetic objects (default 100)")
+parser.add_argument("--values",  type=int,   default=None,  help="floats in the list property of each object (default 10000)")
+parser.add_argument("--edits",   type=int,   default=50,    help="single property edits for latency measurement")
+parser.add_argument("--repeats", type=int,   default=10,    help="consecutive edits per object in the burst scenario")
+parser.add_argument("--latency", type=float, default=0,     help="seconds the fake node delays each call")
+parser.add_argument("--no-batch", dest="batched", action="store_false", help="disable the batch binary procedures")
+parser.add_argument("--observer", action="store_true", help="measure GUI observer throughput (default 10000 objects)")
+parser.add_argument("--changes", type=int,   default=10000, help="viewprovider changes for --observer")
+parser.add_argument("--properties", action="store_true",
+                    help="measure property information and conversion, before and after their optimization "
+                         "(default 100 objects, 1000000 values)")
+parser.add_argument("--rounds",  type=int,   default=100,   help="property information repetitions for --properties")
+parser.add_argument("--output",  default=None, help="JSON file for the report")
+parser.add_argument("--profile", default=None, help="write cProfile stats into this file")
+args = parser.parse_args()
+
+if args.observer:
+    coroutine = Benchmark.observer(output=args.output, objects=args.objects or 10000, changes=args.changes)
+elif args.properties:
+    coroutine = Benchmark.properties(output=args.output, objects=args.objects or 100, values=args.values or 1000000,
+                                     rounds=args.rounds)
+else:
+    coroutine = Benchmark.run(output=args.output, objects=args.objects or 100, values=args.values or 10000, edits=args.edits,
+                              latency=args.latency, batched=args.batched, repeats=args.repeats)
+
+loop = asyncio.get_event_loop()
+if args.profile:
+    profiler = cProfile.Profile()
+    report = profiler.runcall(loop.run_until_complete, coroutine)
+    profiler.dump_stats(args.profile)
+else:
+    report = loop.run_until_complete(coroutine)
+
+print(json.dumps(report["results"], indent=2))
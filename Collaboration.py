@@ -95,6 +95,7 @@ if not importfail:
     
     # run the OCP framework!
     connection.start()
+    QtCore.QCoreApplication.instance().aboutToQuit.connect(connection.stop)
 
     if os.getenv('OCP_TEST_RUN', "0") == "1":
         #connect to test server
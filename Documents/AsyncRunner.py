@@ -17,15 +17,18 @@
 # *   Suite 330, Boston, MA  02111-1307, USA                             *
 # ************************************************************************
 
-import asyncio
+import asyncio, time
 import Documents.Batcher as Batcher
+import Utils.Profiling as Profiling
+import Utils.Priority as Priority
 from Utils.Errorhandling import OCPErrorHandler
 from enum import Enum, auto
 from typing import Any
 
 class _Task():
     # Wraps a function to be called as _Task
-    # Works for async and normal functions, with arbitrary arguments
+    # Works for async and normal functions, with arbitrary arguments. The task is executed in the priority lane
+    # that was active when it was created
     
     def __init__(self, fnc, args):
         
@@ -33,19 +36,38 @@ class _Task():
         
         self.Func = fnc 
         self.Args = args
+        self.Lane = Priority.current()
+        
+        if Profiling.enabled:
+            self.Queued = time.perf_counter()
         
     async def execute(self):
         
-        if asyncio.iscoroutinefunction(self.Func):
-            await self.Func(*self.Args)
-        else:
-            self.Func(*self.Args)
+        # recording is decided at start, profiling may be enabled or disabled while the task awaits
+        start = time.perf_counter() if Profiling.enabled else None
+        if start is not None and hasattr(self, "Queued"):
+            Profiling.record("queue", self.name(), start - self.Queued)
+        
+        try:
+            with Priority.lane(self.Lane):
+                if asyncio.iscoroutinefunction(self.Func):
+                    await self.Func(*self.Args)
+                else:
+                    self.Func(*self.Args)
+        finally:
+            if start is not None:
+                Profiling.record("execute", self.name(), time.perf_counter() - start)
                 
     def name(self):
+        if not hasattr(self.Func, "__self__"):
+            # plain functions, e.g. batch handler wrappers
+            return self.Func.__qualname__
         return self.Func.__self__.__class__.__name__ + "." + self.Func.__name__
 
 
 class _TaskErrorHandler(OCPErrorHandler):
+    # Error handling for runners. A failing task does not affect the queued ones, they are independent operations.
+    # Recovering from the failure is up to the parent handlers, or the recover tasks registered for the error
     
     class TaskError(Enum):
         Recover = auto()    # Revocer action failed
@@ -67,14 +89,19 @@ class _TaskErrorHandler(OCPErrorHandler):
         super()._handleError(source, error, data)
         
         # we try to execute the recovery action. If it also fails we have a a new error
-        if error in self.__tasks:
-            try:
-                asyncio.gather(*(self.__tasks[error]))
-            except Exception as e:
-                recdata = self._extractErrorData(e)
-                recdata["recover_from"] = data
-                super()._handleError(self, _TaskErrorHandler.TaskError.Recover, recdata)
-                return
+        if error in self.__recoverTask:
+            asyncio.ensure_future(self.__recover(self.__recoverTask[error], data))
+            
+    async def __recover(self, tasks, data):
+        
+        try:
+            for task in tasks:
+                await task.execute()
+                
+        except Exception as e:
+            recdata = self._extractErrorData(e)
+            recdata["recover_from"] = data
+            super()._handleError(self, _TaskErrorHandler.TaskError.Recover, recdata)
         
 
 class DocumentRunner():
@@ -137,11 +164,6 @@ class OrderedRunner(_TaskErrorHandler):
         
         self.__finishEvent.set()       
 
-    def _handleError(self, source, error: Enum, data: dict[str, Any]):
-        # any error in task processing leads to deletion of all current tasks
-        self.__tasks = []
-        super()._handleError(source, error, data)
-
 
     async def __run(self):
         
@@ -152,6 +174,7 @@ class OrderedRunner(_TaskErrorHandler):
                 self.__finishEvent.clear()
                         
                 #work the tasks synchronous
+                Profiling.record("queuelength", "OrderedRunner", len(self.__tasks))
                 task = self.__tasks.pop(0)
                 while task:
                     try:
@@ -240,11 +263,6 @@ class BatchedOrderedRunner(_TaskErrorHandler):
         
         self.__finishEvent.set()
 
-    def _handleError(self, source, error: Enum, data: dict[str, Any]):
-        # any error in task processing leads to deletion of all current tasks
-        self.__tasks = []
-        super()._handleError(source, error, data)
-
     async def __run(self):
                   
         #initially we have no work
@@ -260,12 +278,11 @@ class BatchedOrderedRunner(_TaskErrorHandler):
                 self.__finishEvent.clear()            
                     
                 #work the tasks in order
+                Profiling.record("queuelength", "BatchedOrderedRunner", len(self.__tasks))
                 while self.__tasks:
                     try:
                         executed  = await Batcher.executeBatchersOnTasks(self.__batcher, self.__tasks)
-                        if executed > 0:
-                            self.__tasks = self.__tasks[executed:]
-                        else:                       
+                        if executed == 0:
                             #not batchable, execute normal operation
                             task = self.__tasks.pop(0)
                             await task.execute()
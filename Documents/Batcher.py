@@ -1,11 +1,15 @@
 
+import Utils.Profiling as Profiling
+import Utils.Priority as Priority
+
 #Batcher are used together with Batched Asyncrunner. They scan over the existing tasks of the runner and 
 #batch them together when possible. For example a single "changeProperty" task can be batched with others into
 #a "multiChangeProperty" call, hence reducing the amount of OCP node calls required.
 
 async def executeBatchersOnTasks(batchers, tasks):
     #Runs the batcher with the largest number of batchable tasks on the tasklist, and returns how many task
-    #have been executed
+    #have been executed. The executed tasks are removed from the list beforehand, so that a failing batch is not
+    #executed again
     
     #start all batchers
     for batcher in batchers:
@@ -23,8 +27,11 @@ async def executeBatchersOnTasks(batchers, tasks):
     if maxBatched > 0:
         
         #run the lucky batcher
-        idx = num.index(maxBatched)                              
-        await batchers[idx].execute()
+        idx = num.index(maxBatched)
+        del tasks[:maxBatched]
+        Profiling.record("batchsize", batchers[idx].Name, maxBatched)
+        with Profiling.timed("batch", batchers[idx].Name):
+            await batchers[idx].execute()
                     
     return maxBatched
 
@@ -67,8 +74,9 @@ class EquallityBatcher():
         for task in self.__tasks:
             await task.execute()
         
-        #now execute the batchhandler
-        await self.__handler()
+        #now execute the batchhandler, in the highest priority lane of all batched tasks
+        with Priority.lane(min((task.Lane for task in self.__tasks), default=Priority.current())):
+            await self.__handler()
 
         
     
@@ -18,44 +18,217 @@
 # ************************************************************************
 
 import asyncio
-from autobahn.wamp.types import RegisterOptions
+import Documents.Spill    as Spill
+import Documents.Recovery as Recovery
+from autobahn.wamp.types import RegisterOptions, CallOptions
+from autobahn.wamp.exception import ApplicationError
 
 class DataService():
+    # Provides binary payloads to the OCP node. Data is added with a key, which the node uses to fetch it via 
+    # the registered upload function.
+    #
+    # The data of a key lives as long as the node call that announced it: the node may fetch it any time during the
+    # call, also multiple times, and never after it. Unknown keys are reported as error to the node, which fails the
+    # call instead of storing empty data. The total amount of pending bytes is limited: adding the data of a call 
+    # waits till there is space again. Large payloads are spilled to disk and served from a memory map.
+    #
+    # Additionally it provides the conversion between binary data and cids for all writers and readers. Multiple 
+    # binaries are handled with a single node call (raw.CidsByBinary, raw.BinariesByCid). Nodes without those 
+    # batch procedures are served with parallel single calls.
     
     def __init__(self, fcid, connection):
         self.__keyCntr = 0
-        self.__data = {}
+        self.__data = {}                    # key: [data, fetched, spilled by us]
+        self.__pendingBytes = 0
+        self.__freed = asyncio.Event()
         self.uri = u'freecad.{0}.dataUpload'.format(fcid)
         self.__connection = connection
-        self.chunksize = 1024*256 #should be 0.25mb
+        self.chunksize = 1024*256           # should be 0.25mb, minimal chunk size and threshold for direct upload 
+        self.maxChunksize = 1024*1024*4     # upper bound for adaptive chunk size
+        self.maxPendingBytes = 1024*1024*512
+        
+        # metrics
+        self.bytesServed = 0
+        self.bytesEvicted = 0
+        self.keysEvicted = 0
+        
+        # node supports the batch procedures, till it reports otherwise
+        self.__batched = True
     
     async def setup(self):
+        self.__batched = True
         await self.__connection.api.register("dataservice", self.__dataUpload, self.uri, RegisterOptions(details_arg='details'))
     
     async def close(self):
         await self.__connection.api.closeKey("dataservice")
     
-    def addData(self, data):
-        key = self.__keyCntr
-        self.__data[key] = data
-        self.__keyCntr += 1
-        return key
+    async def addDatas(self, datas):
+        # Adds the data of a single node call and returns the keys to fetch it. Waits beforehand if too much data is
+        # pending already, but never between the keys of the call (a call larger than the limit is accepted if 
+        # nothing else is pending). The keys must be discarded when the call is finished
+        
+        size = sum(len(data) for data in datas)
+        while self.__pendingBytes > 0 and self.__pendingBytes + size > self.maxPendingBytes:
+            await self.__freed.wait()
+        
+        keys = []
+        for data in datas:
+            key = self.__keyCntr
+            spilled = Spill.spill(data)
+            self.__data[key] = [spilled, False, spilled is not data]
+            self.__pendingBytes += len(data)
+            self.__keyCntr += 1
+            keys.append(key)
+            
+        return keys
         
     def getData(self, key):
         if key not in self.__data:
-            return bytearray()
+            raise ApplicationError("ocp.error.dataservice.unknown_key", f"No data available for key {key}")
+        
+        entry = self.__data[key]
+        entry[1] = True
+        return entry[0]
+    
+    def discard(self, keys):
+        # removes the data of the keys after the node call is finished, fetched or not
+        
+        for key in keys:
+            entry = self.__data.pop(key, None)
+            if entry is None:
+                continue
+            
+            data, fetched, owned = entry
+            if not fetched:
+                self.bytesEvicted += len(data)
+                self.keysEvicted += 1
+                
+            self.__release(data)
+            
+            # spilled data of the caller may still be referenced, e.g. by a writer retrying the upload
+            if owned:
+                Spill.release(data)
+            
+    async def getCidsForData(self, docId, datas):
+        # Returns the list of cids for the list of binary datas in the given document
+        
+        # small data is send directly, large ones are fetched by the node from this service
+        large = [data for data in datas if len(data) > self.chunksize or Spill.isSpilled(data)]
+        keys  = iter(await self.addDatas(large))
+        entries = []
+        for data in datas:
+            if len(data) > self.chunksize or Spill.isSpilled(data):
+                entries.append([self.uri, next(keys)])
+            else:
+                entries.append(data)
+        
+        try:
+            # cids are content addressed, hence the calls can be repeated
+            if self.__batched:
+                try:
+                    uri = f"ocp.documents.{docId}.raw.CidsByBinary"
+                    return await Recovery.retry(self.__connection.api.call, uri, entries)
+                
+                except ApplicationError as e:
+                    if e.error != ApplicationError.NO_SUCH_PROCEDURE:
+                        raise e
+                    self.__batched = False
+            
+            uri = f"ocp.documents.{docId}.raw.CidByBinary"
+            tasks = []
+            for entry in entries:
+                if isinstance(entry, list):
+                    tasks.append(Recovery.retry(self.__connection.api.call, uri, *entry))
+                else:
+                    tasks.append(Recovery.retry(self.__connection.api.call, uri, entry))
+                
+            return list(await asyncio.gather(*tasks))
+        
+        finally:
+            self.discard([entry[1] for entry in entries if isinstance(entry, list)])
+    
+    
+    async def getBinaryValues(self, docId, values):
+        # Checks all values for binary cid's and fetches the real data to replace it with. Accepts single values 
+        # or lists, and returns the same (a list with a single value is returned as value)
         
-        data = self.__data[key]
-        del self.__data[key]
-        return data
+        if not isinstance(values, list):
+            values = [values]
+            
+        indices = [i for i, value in enumerate(values) if isinstance(value, str) and value.startswith("ocp_cid")]
+        if indices:
+            datas = await self.__getDataForCids(docId, [values[i] for i in indices])
+            for index, data in zip(indices, datas):
+                values[index] = data
+        
+        if len(values) == 1:
+            return values[0]
+        return values
+    
+    
+    def metrics(self):
+        return {"pendingKeys": len(self.__data),
+                "pendingBytes": self.__pendingBytes,
+                "bytesServed": self.bytesServed,
+                "bytesEvicted": self.bytesEvicted,
+                "keysEvicted": self.keysEvicted}
+    
+    def __release(self, data):
+        # frees the space of the data and wakes up all waiting additions
+        self.__pendingBytes -= len(data)
+        self.__freed.set()
+        self.__freed = asyncio.Event()
+    
+    async def __getDataForCids(self, docId, cids):
+        # Fetches the binary data for all cids. The batch procedure streams [index, chunk] pairs as progress
+        
+        receivers = [Spill.Receiver() for cid in cids]
+        
+        if self.__batched:
+            def progress(index, chunk):
+                receivers[index].progress(chunk)
+            
+            try:
+                uri = f"ocp.documents.{docId}.raw.BinariesByCid"
+                result = await self.__connection.api.call(uri, cids, options=CallOptions(on_progress=progress))
+                if result is not None:
+                    for index, chunk in result:
+                        progress(index, chunk)
+                    
+                return [receiver.result() for receiver in receivers]
+            
+            except ApplicationError as e:
+                if e.error != ApplicationError.NO_SUCH_PROCEDURE:
+                    raise e
+                self.__batched = False
+        
+        async def fetch(cid, receiver):
+            uri = f"ocp.documents.{docId}.raw.BinaryByCid"
+            result = await self.__connection.api.call(uri, cid, options=CallOptions(on_progress=receiver.progress))
+            if result is not None:
+                receiver.progress(result)
+            
+        await asyncio.gather(*[fetch(cid, receiver) for cid, receiver in zip(cids, receivers)])
+        return [receiver.result() for receiver in receivers]
+    
+    def __chunksize(self, size):
+        # large payloads use larger chunks to reduce the number of progress messages
+        return min(self.maxChunksize, max(self.chunksize, size // 32))
     
     async def __dataUpload(self, key, details=None):
 
+        data = self.getData(key)
+        
         if details.progress:
-            data = self.getData(key)
-            for i in range(0, len(data), self.chunksize):
-                block = data[i:i+self.chunksize]
-                details.progress(bytes(block))
+            # memoryview slices do not copy the data
+            view = memoryview(data)
+            size = self.__chunksize(len(view))
+            for i in range(0, len(view), size):
+                details.progress(view[i:i+size])
+                
+            self.bytesServed += len(view)
+            view.release()
                 
         else: 
-            return bytes(self.getData(key))
+            self.bytesServed += len(data)
+            return bytes(data)
@@ -0,0 +1,231 @@
+# ************************************************************************
+# *   Copyright (c) Stefan Troeger (stefantroeger@gmx.net) 2021          *
+# *                                                                      *
+# *   This library is free software; you can redistribute it and/or      *
+# *   modify it under the terms of the GNU Library General Public        *
+# *   License as published by the Free Software Foundation; either       *
+# *   version 2 of the License, or (at your option) any later version.   *
+# *                                                                      *
+# *   This library  is distributed in the hope that it will be useful,   *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of     *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the      *
+# *   GNU Library General Public License for more details.               *
+# *                                                                      *
+# *   You should have received a copy of the GNU Library General Public  *
+# *   License along with this library; see the file COPYING.LIB. If not, *
+# *   write to the Free Software Foundation, Inc., 59 Temple Place,      *
+# *   Suite 330, Boston, MA  02111-1307, USA                             *
+# ************************************************************************
+
+# Hierarchical digest of the node document
+#
+# Every property with data hashes to FNV-1a over its name and value, an object to FNV-1a over its name and the sum 
+# of its property hashes, and the objects are summed up in a tree of buckets selected by the hash of their name. 
+# All sums are modulo 2^32, which allows to update them incrementally with the difference of the changed hash.
+# The node keeps the property hashes, bucket sums and leaf membership in the DML (see property.dml, object.dml and 
+# objectmap.dml, main.dml implements the identical hashing) while the Tree here follows what this client wrote to and
+# received from the node. Comparing both top-down finds divergent objects with a call per tree level instead of downloading the document.
+#
+# Values are hashed as they are transfered, binary data hence by its cid. Numbers are hashed as 64bit floats, as
+# javascript does not distinguish integers. Properties without data (never written, default value) are not part of 
+# the digest, neither are objects without any such property (precisely: with a property hash sum of 0).
+
+import asyncio, struct
+import Documents.Recovery as Recovery
+
+fanout = 16     # children per tree node
+depth  = 2      # levels of buckets, the leafs list the objects
+
+__offset = 0x811c9dc5
+__prime  = 0x01000193
+
+
+def fnv1a(data):
+    
+    h = __offset
+    for byte in data:
+        h = ((h ^ byte) * __prime) & 0xffffffff
+    return h
+
+
+def __encode(value, out):
+    # canonical byte encoding of transfered values, with a type tag and lengths to keep it unambiguous
+    
+    if value is None:
+        out += b"n"
+    elif isinstance(value, bool):
+        out += b"t" if value else b"f"
+    elif isinstance(value, (int, float)):
+        out += b"d" + struct.pack("<d", value)
+    elif isinstance(value, str):
+        units = value.encode("utf-16-le", "surrogatepass")
+        out += b"s" + struct.pack("<I", len(units)//2) + units
+    elif isinstance(value, (bytes, bytearray)):
+        #never transfered as such, binary data becomes a cid
+        out += b"b" + struct.pack("<I", len(value)) + value
+    elif isinstance(value, (list, tuple)):
+        out += b"l" + struct.pack("<I", len(value))
+        for entry in value:
+            __encode(entry, out)
+    elif isinstance(value, dict):
+        out += b"m" + struct.pack("<I", len(value))
+        for key in sorted(value):
+            __encode(key, out)
+            __encode(value[key], out)
+    else:
+        raise Exception(f"Cannot hash value of type {type(value)}")
+    
+
+def hashProperty(name, value):
+    # hash of a single property, 0 if it has no data
+    
+    if value is None:
+        return 0
+    
+    out = bytearray()
+    __encode(name, out)
+    __encode(value, out)
+    return fnv1a(out)
+
+
+def hashObject(name, propertySum):
+    
+    out = bytearray()
+    __encode(name, out)
+    out += struct.pack("<I", propertySum)
+    return fnv1a(out)
+
+
+def bucket(name):
+    # path of the leaf bucket the object belongs to
+    
+    out = bytearray()
+    __encode(name, out)
+    h = fnv1a(out)
+    return tuple((h // fanout**level) % fanout for level in range(depth))
+
+
+class Tree():
+    # The digest tree of a document, separate for all object groups. Updated incrementally per property
+    
+    def __init__(self):
+        self.__properties = {"Objects": {}, "ViewProviders": {}}     # name: {prop: hash}
+        self.__objects    = {"Objects": {}, "ViewProviders": {}}     # name: object hash
+        self.__buckets    = {"Objects": {}, "ViewProviders": {}}     # path tuple: sum of all contained objects
+        self.__leafs      = {"Objects": {}, "ViewProviders": {}}     # leaf path tuple: set of contained object names
+        
+    
+    def __update(self, group, name):
+        # recalculates the object hash and pushes the difference to all its buckets
+        
+        props = self.__properties[group].get(name, {})
+        total = sum(props.values()) & 0xffffffff
+        old   = self.__objects[group].get(name, 0)
+        new   = hashObject(name, total) if total else 0
+        
+        if new:
+            self.__objects[group][name] = new
+        else:
+            self.__objects[group].pop(name, None)
+        if not props:
+            self.__properties[group].pop(name, None)
+        
+        if new == old:
+            return
+        
+        path = bucket(name)
+        if new:
+            self.__leafs[group].setdefault(path, set()).add(name)
+        else:
+            self.__leafs[group].get(path, set()).discard(name)
+        
+        buckets = self.__buckets[group]
+        for level in range(depth + 1):
+            buckets[path[:level]] = (buckets.get(path[:level], 0) + new - old) & 0xffffffff
+    
+    
+    def set(self, group, name, prop, value):
+        
+        h = hashProperty(prop, value)
+        props = self.__properties[group].setdefault(name, {})
+        if h:
+            props[prop] = h
+        else:
+            props.pop(prop, None)
+        
+        self.__update(group, name)
+    
+    
+    def remove(self, group, name, prop = None):
+        # removes the property, or the whole object if no property is given
+        
+        if prop is None:
+            self.__properties[group].pop(name, None)
+        else:
+            self.__properties[group].get(name, {}).pop(prop, None)
+        
+        self.__update(group, name)
+    
+    
+    def clear(self):
+        for group in self.__properties:
+            self.__properties[group].clear()
+            self.__objects[group].clear()
+            self.__buckets[group].clear()
+            self.__leafs[group].clear()
+    
+    
+    def root(self, group):
+        return self.__buckets[group].get((), 0)
+    
+    
+    def children(self, group, path):
+        # sums of all child buckets of the inner tree node
+        
+        path = tuple(path)
+        return [self.__buckets[group].get(path + (i,), 0) for i in range(fanout)]
+    
+    
+    def objects(self, group, path):
+        # object hashes of all objects in the leaf bucket
+        
+        objects = self.__objects[group]
+        return {name: objects[name] for name in self.__leafs[group].get(tuple(path), ())}
+    
+    
+    def properties(self, group, name):
+        return dict(self.__properties[group].get(name, {}))
+            
+
+async def divergentObjects(connection, docId, tree, group):
+    # Compares the tree top-down with the node and returns the names of all objects which differ. Only the subtrees
+    # that differ are descended, in parallel
+    
+    uri = f"ocp.documents.{docId}.content.Document.{group}.GetDigest"
+    
+    async def walk(path):
+        remote = await Recovery.retry(connection.api.call, uri, path)
+        
+        if len(path) < depth:
+            local = tree.children(group, path)
+            tasks = [walk(path + [i]) for i in range(fanout) if remote[i] != local[i]]
+            results = await asyncio.gather(*tasks)
+            return [name for result in results for name in result]
+        
+        local = tree.objects(group, path)
+        return [name for name in set(remote) | set(local) if remote.get(name) != local.get(name)]
+    
+    return await walk([])
+
+
+async def divergentProperties(connection, docId, tree, group, name):
+    # Compares the property hashes of a single object with the node and returns the names of the differing ones.
+    # None if the object does not exist on the node
+    
+    base = f"ocp.documents.{docId}.content.Document.{group}."
+    if not await Recovery.retry(connection.api.call, base + "Has", name):
+        return None
+    
+    remote = await Recovery.retry(connection.api.call, base + f"{name}.Properties.GetDigests")
+    local  = tree.properties(group, name)
+    return [prop for prop in set(remote) | set(local) if remote.get(prop, 0) != local.get(prop, 0)]
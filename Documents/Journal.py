@@ -0,0 +1,482 @@
+# ************************************************************************
+# *   Copyright (c) Stefan Troeger (stefantroeger@gmx.net) 2021          *
+# *                                                                      *
+# *   This library is free software; you can redistribute it and/or      *
+# *   modify it under the terms of the GNU Library General Public        *
+# *   License as published by the Free Software Foundation; either       *
+# *   version 2 of the License, or (at your option) any later version.   *
+# *                                                                      *
+# *   This library  is distributed in the hope that it will be useful,   *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of     *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the      *
+# *   GNU Library General Public License for more details.               *
+# *                                                                      *
+# *   You should have received a copy of the GNU Library General Public  *
+# *   License along with this library; see the file COPYING.LIB. If not, *
+# *   write to the Free Software Foundation, Inc., 59 Temple Place,      *
+# *   Suite 330, Boston, MA  02111-1307, USA                             *
+# ************************************************************************
+
+# Offline change journal
+#
+# While the node connection is lost the entity of a shared document has no online document anymore, and the 
+# observer reports all changes to the journal instead. It appends one json line per event to a file, hence it 
+# survives crashes and restarts. The lines are buffered and written together at the end of each recompute (the 
+# transaction boundary the observer reports) or latest after _flushDelay seconds, so a crash loses at most the 
+# changes of that moment, but editing offline does not cost a write per property change. Only the keys are recorded: the values are read from the FreeCAD document when
+# replayed, which makes the journal per (object, property) last-writer-wins by construction.
+#
+# On reconnect the journal is compacted, the current values are captured from FreeCAD (before the node state is
+# loaded and overrides them) and after loading they are set again and handed to the online document as normal 
+# changes, which processes them with the default batched writes. The replay cost hence only depends on the number 
+# of changed objects and properties, not on the document size. Creation and removal order is kept. Objects created
+# offline are captured completely, if the node got an object with the same name meanwhile they are recreated 
+# under a new name.
+#
+# Journal directory: FC_OCP_JOURNAL_DIR, default "Collaboration/Journal" in the FreeCAD user data directory
+
+import FreeCAD
+import os, json, logging, asyncio
+import Documents.Object   as Object
+import Documents.Property as Property
+
+
+def directory():
+    path = os.getenv("FC_OCP_JOURNAL_DIR", "")
+    if not path:
+        path = os.path.join(FreeCAD.getUserAppDataDir(), "Collaboration", "Journal")
+    return path
+
+
+class _Entry():
+    # compacted changes of a single object or viewprovider
+
+    def __init__(self):
+        self.changed    = {}    # ordered set of changed properties
+        self.status     = {}    # ordered set of properties with changed status
+        self.added      = {}    # ordered set of added dynamic properties
+        self.removed    = {}    # ordered set of removed dynamic properties
+        self.extensions = {}    # ordered set of added extensions
+        
+    def records(self, group, name):
+        records  = [{"op": "extension", "group": group, "name": name, "ext": ext} for ext in self.extensions]
+        records += [{"op": "removeProperty", "group": group, "name": name, "prop": prop} for prop in self.removed]
+        records += [{"op": "addProperty", "group": group, "name": name, "prop": prop} for prop in self.added]
+        records += [{"op": "change", "group": group, "name": name, "prop": prop} for prop in self.changed]
+        records += [{"op": "status", "group": group, "name": name, "prop": prop} for prop in self.status]
+        return records
+    
+
+class Journal():
+    ''' Records the changes of a FreeCAD document while disconnected. Provides the same observer API as the 
+        online document '''
+    
+    _compactEvery = 1000
+    _flushDelay   = 0.5
+    
+    def __init__(self, docId, doc):
+        
+        self.id        = docId
+        self.document  = doc
+        self.logger    = logging.getLogger("Journal " + docId[-5:])
+        self.path      = os.path.join(directory(), f"{docId}.journal")
+        self.__file    = None
+        self.__appends = 0
+        self.__lines   = []      # appended records not yet written to the file
+        self.__flusher = None
+        
+        # known viewproviders by identity: the GUI observer must not access viewproviders before they are created
+        self.__viewproviders = {id(obj.ViewObject) for obj in doc.Objects if getattr(obj, "ViewObject", None)}
+        
+        os.makedirs(directory(), exist_ok=True)
+        
+        self.__records = []
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                for line in f:
+                    try:
+                        self.__records.append(json.loads(line))
+                    except ValueError:
+                        # incomplete last line after a crash
+                        break
+        
+        self.__rewrite()
+        
+    
+    @property
+    def size(self):
+        # number of (not compacted) records
+        return len(self.__records)
+    
+    
+    def close(self):
+        if self.__file:
+            self.flush()
+            self.__file.close()
+            self.__file = None
+    
+    
+    def flush(self):
+        # writes all buffered records to the file
+        
+        if self.__flusher:
+            self.__flusher.cancel()
+            self.__flusher = None
+        
+        if self.__lines and self.__file:
+            self.__file.write("".join(self.__lines))
+            self.__file.flush()
+        self.__lines = []
+    
+    
+    def discard(self):
+        # closes and removes the journal file
+        self.__lines = []
+        self.close()
+        self.__records = []
+        if os.path.exists(self.path):
+            os.remove(self.path)
+    
+    
+    def __append(self, record):
+        
+        self.__records.append(record)
+        self.__lines.append(json.dumps(record) + "\n")
+        
+        self.__appends += 1
+        if self.__appends >= Journal._compactEvery:
+            self.__rewrite()
+        elif not self.__flusher:
+            self.__flusher = asyncio.get_event_loop().call_later(Journal._flushDelay, self.flush)
+    
+    
+    def __rewrite(self):
+        # replaces the journal file with the compacted records, which include the buffered ones
+        
+        self.__lines = []
+        self.close()
+        self.__records = self.compact()
+        self.__appends = 0
+        
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            for record in self.__records:
+                f.write(json.dumps(record) + "\n")
+        os.replace(tmp, self.path)
+        
+        self.__file = open(self.path, "a")
+    
+    
+    def compact(self):
+        # Returns the minimal list of records with the same outcome: properties are only listed once, changes of 
+        # removed objects are dropped, and objects created and removed while offline vanish completely. Creations
+        # and removals keep their order, followed by the changes of all other objects.
+        
+        structure = []      # [(op, name)]
+        created   = set()   # objects created while offline, they are captured and uploaded completely on replay
+        entries   = {}      # (group, name): _Entry
+        
+        for record in self.__records:
+            
+            op   = record["op"]
+            name = record["name"]
+            
+            if op == "new":
+                created.add(name)
+                structure.append(("new", name))
+                
+            elif op == "remove":
+                entries.pop(("Objects", name), None)
+                entries.pop(("ViewProviders", name), None)
+                if name in created:
+                    created.discard(name)
+                    structure.remove(("new", name))
+                else:
+                    structure.append(("remove", name))
+            
+            elif name not in created:
+                entry = entries.setdefault((record["group"], name), _Entry())
+                if op == "change":
+                    entry.changed[record["prop"]] = None
+                elif op == "status":
+                    entry.status[record["prop"]] = None
+                elif op == "addProperty":
+                    entry.removed.pop(record["prop"], None)
+                    entry.added[record["prop"]] = None
+                elif op == "removeProperty":
+                    prop = record["prop"]
+                    entry.changed.pop(prop, None)
+                    entry.status.pop(prop, None)
+                    if entry.added.pop(prop, "removed") == "removed":
+                        entry.removed[prop] = None
+                elif op == "extension":
+                    entry.extensions[record["ext"]] = None
+        
+        result = [{"op": op, "name": name} for op, name in structure]
+        for (group, name), entry in entries.items():
+            result += entry.records(group, name)
+            
+        return result
+    
+    
+    def capture(self):
+        # Reads everything needed to replay the journal from the FreeCAD document. Must be called before the node
+        # state is loaded into the document
+        
+        return _Snapshot(self.document, self.compact(), self.logger)
+    
+    
+    # Online document observer API
+    # ############################
+    
+    def __record(self, op, obj, group, **kwargs):
+        record = {"op": op, "group": group, "name": obj.Name}
+        record.update(kwargs)
+        self.__append(record)
+    
+    def newObject(self, obj):
+        self.__append({"op": "new", "name": obj.Name})
+        
+    def removeObject(self, obj):
+        if getattr(obj, "ViewObject", None):
+            self.__viewproviders.discard(id(obj.ViewObject))
+        self.__append({"op": "remove", "name": obj.Name})
+        
+    def changeObject(self, obj, prop):
+        self.__record("change", obj, "Objects", prop=prop)
+        
+    def changePropertyStatus(self, obj, prop):
+        self.__record("status", obj, "Objects", prop=prop)
+        
+    def newDynamicProperty(self, obj, prop):
+        self.__record("addProperty", obj, "Objects", prop=prop)
+        
+    def removeDynamicProperty(self, obj, prop):
+        self.__record("removeProperty", obj, "Objects", prop=prop)
+        
+    def addDynamicExtension(self, obj, extension, props):
+        self.__record("extension", obj, "Objects", ext=extension)
+    
+    def hasViewProvider(self, vp):
+        return id(vp) in self.__viewproviders
+    
+    def changeViewProvider(self, vp, prop):
+        self.__record("change", vp.Object, "ViewProviders", prop=prop)
+        
+    def changeViewProviderPropertyStatus(self, vp, prop):
+        self.__record("status", vp.Object, "ViewProviders", prop=prop)
+        
+    def newViewProviderDynamicProperty(self, vp, prop):
+        self.__record("addProperty", vp.Object, "ViewProviders", prop=prop)
+        
+    def removeViewProviderDynamicProperty(self, vp, prop):
+        self.__record("removeProperty", vp.Object, "ViewProviders", prop=prop)
+        
+    def addViewProviderDynamicExtension(self, vp, extension, props):
+        self.__record("extension", vp.Object, "ViewProviders", ext=extension)
+    
+    # viewprovider creation is part of the object creation, and recomputes only lead to property changes
+    def newViewProvider(self, vp):
+        self.__viewproviders.add(id(vp))
+    
+    def removeViewProvider(self, vp):
+        pass
+    
+    def recomputObject(self, obj):
+        pass
+    
+    def beginRecompute(self):
+        pass
+    
+    def endRecompute(self):
+        self.flush()
+    
+    def recomputeDocument(self):
+        pass
+        
+
+class _Snapshot():
+    # The values of all journaled changes, read from FreeCAD before the node state is loaded
+    
+    def __init__(self, doc, records, logger):
+        
+        self.document = doc
+        self.records  = []
+        self.logger   = logger
+        
+        for record in records:
+            
+            record = record.copy()
+            op     = record["op"]
+            obj    = self.__object(record)
+            
+            if op == "new" and obj is not None:
+                record["content"] = self.__content(obj)
+            
+            if op in ["new", "remove"]:
+                self.records.append(record)
+                continue
+            
+            if obj is None:
+                continue
+            
+            try:
+                if op == "change":
+                    record["value"] = Property.convertPropertyToWamp(obj, record["prop"])
+                elif op == "status":
+                    record["status"] = Property.getStatus(obj, record["prop"])
+                elif op == "addProperty":
+                    record["info"] = Property.createInformation(obj, record["prop"])
+                
+                self.records.append(record)
+            
+            except Exception as e:
+                # properties removed meanwhile etc.
+                self.logger.debug(f"Skip journal record {record}: {e}")
+    
+    
+    def __object(self, record):
+        
+        obj = self.document.getObject(record["name"])
+        if obj is None or record.get("group", "Objects") == "Objects":
+            return obj
+        return getattr(obj, "ViewObject", None)
+    
+    
+    def __content(self, obj):
+        # all property infos and values of an object created offline, as well as of its viewprovider
+        
+        content = {"typeid": obj.TypeId, "extensions": Object.getExtensions(obj), "Objects": self.__properties(obj)}
+        if getattr(obj, "ViewObject", None) is not None:
+            content["ViewProviders"] = self.__properties(obj.ViewObject)
+        
+        return content
+    
+    
+    def __properties(self, obj):
+        
+        result = {}
+        for prop in obj.PropertiesList:
+            try:
+                result[prop] = {"info": Property.createInformation(obj, prop), "value": Property.convertPropertyToWamp(obj, prop)}
+            except Exception as e:
+                self.logger.debug(f"Skip property {prop} of {obj.Name} created offline: {e}")
+        
+        return result
+    
+    
+    def __recreate(self, content, name):
+        # Creates the object created offline again from its captured content. Used if the node has an object 
+        # with the same name, which replaced ours when the node state was loaded. FreeCAD assigns a new name.
+        # Called within bulkApply, hence the observer is blocked already
+        
+        obj = self.document.addObject(content["typeid"], name)
+        
+        for ext in content["extensions"]:
+            Object.createExtension(obj, ext)
+            
+        self.__restore(obj, content["Objects"])
+        if getattr(obj, "ViewObject", None) is not None and "ViewProviders" in content:
+            self.__restore(obj.ViewObject, content["ViewProviders"])
+        
+        return obj
+    
+    
+    def __restore(self, obj, properties):
+        
+        for prop, entry in properties.items():
+            info = entry["info"]
+            Object.createDynamicProperty(obj, prop, info["typeid"], info["group"], info["docu"], info["status"])
+            
+        for prop, entry in properties.items():
+            try:
+                Object.setProperty(obj, prop, entry["value"])
+            except Exception as e:
+                self.logger.debug(f"Cannot restore property {prop} of {obj.Name}: {e}")
+    
+    
+    def replay(self, odoc):
+        # Sets the captured values in FreeCAD again and forwards all changes to the online document, which uploads
+        # them with its normal (batched) processing
+        
+        with Object.bulkApply(self.document):
+            
+            for record in self.records:
+                
+                op   = record["op"]
+                name = record["name"]
+                obj  = self.__object(record)
+                vp   = record.get("group", "Objects") == "ViewProviders"
+                
+                try:
+                    if op == "new":
+                        if "content" not in record:
+                            self.logger.warning(f"Object {name} created while offline was lost")
+                            continue
+                        
+                        if obj is None or name in odoc.objects:
+                            # the node state replaced or removed the object with this name when it was loaded
+                            obj = self.__recreate(record["content"], name)
+                            if obj.Name != name:
+                                self.logger.warning(f"Object {name} created while offline exists on the node, added as {obj.Name}")
+                        
+                        # the setup only uploads the property infos, the values follow as normal changes
+                        odoc.newObject(obj)
+                        for prop in record["content"]["Objects"]:
+                            if prop in obj.PropertiesList:
+                                odoc.changeObject(obj, prop)
+                        
+                        if getattr(obj, "ViewObject", None) is not None:
+                            odoc.newViewProvider(obj.ViewObject)
+                            for prop in record["content"].get("ViewProviders", {}):
+                                if prop in obj.ViewObject.PropertiesList:
+                                    odoc.changeViewProvider(obj.ViewObject, prop)
+                    
+                    elif op == "remove":
+                        if obj is not None:
+                            odoc.removeObject(obj)
+                            self.document.removeObject(name)
+                    
+                    elif obj is None:
+                        continue
+                    
+                    elif op == "extension":
+                        before = set(obj.PropertiesList)
+                        Object.createExtension(obj, record["ext"])
+                        added = [prop for prop in obj.PropertiesList if prop not in before]
+                        if vp:
+                            odoc.addViewProviderDynamicExtension(obj, record["ext"], added)
+                        else:
+                            odoc.addDynamicExtension(obj, record["ext"], added)
+                    
+                    elif op == "removeProperty":
+                        Object.removeDynamicProperty(obj, record["prop"])
+                        if vp:
+                            odoc.removeViewProviderDynamicProperty(obj, record["prop"])
+                        else:
+                            odoc.removeDynamicProperty(obj, record["prop"])
+                    
+                    elif op == "addProperty":
+                        info = record["info"]
+                        Object.createDynamicProperty(obj, record["prop"], info["typeid"], info["group"], info["docu"], info["status"])
+                        if vp:
+                            odoc.newViewProviderDynamicProperty(obj, record["prop"])
+                        else:
+                            odoc.newDynamicProperty(obj, record["prop"])
+                    
+                    elif op == "change":
+                        Object.setProperty(obj, record["prop"], record["value"])
+                        if vp:
+                            odoc.changeViewProvider(obj, record["prop"])
+                        else:
+                            odoc.changeObject(obj, record["prop"])
+                        
+                    elif op == "status":
+                        Object.setPropertyStatus(obj, record["prop"], record["status"])
+                        if vp:
+                            odoc.changeViewProviderPropertyStatus(obj, record["prop"])
+                        else:
+                            odoc.changePropertyStatus(obj, record["prop"])
+                
+                except Exception as e:
+                    self.logger.error(f"Replay of journal record {op} for {name} failed: {e}")
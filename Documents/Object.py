@@ -22,6 +22,8 @@
 
 import Documents.Property as Property
 import Documents.Observer as Observer
+import Documents.Version  as Version
+import Utils.Profiling    as Profiling
 import FreeCAD, FreeCADGui
 from contextlib import contextmanager
 
@@ -49,10 +51,52 @@ def __fcobject_cleanup(obj):
 # Simplify object handling by combining observer blockingand object cleanup
 @contextmanager
 def __fcobject_processing(obj):
+    
+    deferred = __bulk.get(__appDocument(obj.Document), None)
+    if deferred is not None:
+        # within bulkApply: observers are already blocked, cleanup is done at its end
+        deferred[id(obj)] = obj
+        yield (None, None)
+        return
+    
     with Observer.blocked(obj.Document) as a, __fcobject_cleanup(obj) as b:
         yield (a, b)
 
 
+# Bulk processing: documents currently in bulkApply, with the objects to cleanup at its end
+__bulk = {}
+
+def __appDocument(doc):
+    # viewprovider belong to the gui document, bulk processing is done per app document
+    if doc.isDerivedFrom("App::Document"):
+        return doc
+    return doc.Document
+
+
+@contextmanager
+def bulkApply(doc):
+    # Applies many changes to objects of the document at once: observers are blocked a single time, and the 
+    # object cleanup (purgeTouched, spreadsheet recompute) is done once per changed object at the end.
+    # Note: must not span any await, as the observers would stay blocked for other coroutines too
+    
+    doc = __appDocument(doc)
+    if doc in __bulk:
+        yield
+        return
+    
+    __bulk[doc] = {}
+    try:
+        with Observer.blocked(doc):
+            try:
+                yield
+            finally:
+                for obj in __bulk[doc].values():
+                    with __fcobject_cleanup(obj):
+                        pass
+    finally:
+        del __bulk[doc]
+
+
 
 def createDynamicProperty(obj, prop, typeID, group, documentation, status):
         
@@ -63,8 +107,9 @@ def createDynamicProperty(obj, prop, typeID, group, documentation, status):
         
         attributes = Property.statusToType(status)            
         obj.addProperty(typeID, prop, group, documentation, attributes)
+        Property.invalidateInformation(obj, prop)
         
-        if float(".".join(FreeCAD.Version()[0:2])) >= 0.19:
+        if Version.hasPropertyStatus:
             obj.setPropertyStatus(prop, status)
         else:
             mode = Property.statusToEditorMode(status)
@@ -81,8 +126,9 @@ def createDynamicProperties(obj, props, infos):
                             
             attributes = Property.statusToType(info["status"])            
             obj.addProperty(info["id"], prop, info["group"], info["docu"], attributes)
+            Property.invalidateInformation(obj, prop)
             
-            if float(".".join(FreeCAD.Version()[0:2])) >= 0.19:
+            if Version.hasPropertyStatus:
                 obj.setPropertyStatus(prop, info["status"])
             else:
                 mode = Property.statusToEditorMode(info["status"])
@@ -97,6 +143,7 @@ def removeDynamicProperty(obj, prop):
             
     with __fcobject_processing(obj):
         obj.removeProperty(prop)
+        Property.invalidateInformation(obj, prop)
 
             
 def removeDynamicProperties(obj, props):
@@ -107,6 +154,7 @@ def removeDynamicProperties(obj, props):
                 continue
     
             obj.removeProperty(prop)
+            Property.invalidateInformation(obj, prop)
         
 
 def createExtension(obj, ext):
@@ -118,7 +166,7 @@ def createExtension(obj, ext):
 
     with __fcobject_processing(obj):
 
-        if  float(".".join(FreeCAD.Version()[0:2])) >= 0.19:
+        if Version.hasPropertyStatus:
             obj.addExtension(ext)
         else:
             obj.addExtension(ext, None)
@@ -135,13 +183,14 @@ def removeExtension(obj, ext):
 
 def setProperty(obj, prop, value):
         
-    with __fcobject_processing(obj):
+    with Profiling.timed("apply", "setProperty"), __fcobject_processing(obj):
         Property.convertWampToProperty(obj, prop, value)
 
     
 def setProperties(obj, props, values):
         
-    with __fcobject_processing(obj):
+    Profiling.record("batchsize", "setProperties", len(props))
+    with Profiling.timed("apply", "setProperties"), __fcobject_processing(obj):
         for prop, value in zip(props, values):
             Property.convertWampToProperty(obj, prop, value)
            
@@ -150,7 +199,7 @@ def setPropertyStatus(obj, prop, status):
 
     with __fcobject_processing(obj):
     
-        if  float(".".join(FreeCAD.Version()[0:2])) >= 0.19:
+        if Version.hasPropertyStatus:
 
             if status:
                 #to set the status multiple things need to happen:
@@ -182,7 +231,7 @@ def setPropertyStatus(obj, prop, status):
 
 def getExtensions(obj):
     
-    if  float(".".join(FreeCAD.Version()[0:2])) >= 0.19:
+    if Version.hasPropertyStatus:
        
         allExt    = [e.Name for e in FreeCAD.Base.TypeId.getAllDerivedFrom("App::Extension")]
         pythonExt = [e for e in allExt if "Python" in e]
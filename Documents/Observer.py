@@ -20,6 +20,8 @@
 import asyncio
 from contextlib import contextmanager 
 import FreeCAD, FreeCADGui
+import Documents.Property as Property
+import Documents.Version  as Version
 
 #Global variable to allow observer activation/deactivation handling for other parts of the code
 __Observer = None
@@ -41,6 +43,20 @@ def initialize(docManager):
     __Observer = __ObserverManager(__guiObserver, __observer)
 
 
+def setHandler(handler):
+    # Exchanges the handler the observers report to and returns the previous one (None if the observers
+    # were not initialized before). Used to run the observers for documents not managed by the docManager
+    
+    if not __Observer:
+        initialize(handler)
+        return None
+    
+    previous = __Observer.obs.handler
+    __Observer.obs.handler = handler
+    __Observer.uiobs.handler = handler
+    return previous
+
+
 @contextmanager
 def blocked(doc):
     try: 
@@ -103,7 +119,7 @@ class __ObserverBase():
     def __init__(self, handler):
         
         self.handler = handler
-        self.inactive = []
+        self.inactive = set()
         self.objExtensions = {}
         self._createdWhileDeactivated = {}
         self._removing = []
@@ -111,8 +127,7 @@ class __ObserverBase():
 
     def activateFor(self, doc):
        
-        while doc in self.inactive:
-           self.inactive.remove(doc)
+        self.inactive.discard(doc)
         
         if doc in self._createdWhileDeactivated:
             self._createdWhileDeactivated.pop(doc)
@@ -128,23 +143,19 @@ class __ObserverBase():
         if doc in self.inactive:
             raise Exception(f"Document {doc} already deactivated: not allowed to happen")
         
-        self.inactive.append(doc)
+        self.inactive.add(doc)
         self._createdWhileDeactivated[doc] = []
         
         
     def isDeactivatedFor(self, doc):
-        
-        if doc in self.inactive:
-            return True 
-        
-        return False
+        return doc in self.inactive
     
     def createdWhileDeactivated(self, doc):
         return self._createdWhileDeactivated[doc]
     
     
     def isRemoving(self, obj):
-        if float(".".join(FreeCAD.Version()[0:2])) >= 0.19:
+        if Version.hasPropertyStatus:
             return obj.Removing
         else:
             #no equivalent in 0.18
@@ -196,7 +207,8 @@ class __ObserverBase():
             entity = self.handler.getEntity("fcdocument", fcdoc.Document)
             
         if entity:
-            result = entity.online_document
+            # while disconnected the changes are recorded by the journal, which has the same API
+            result = entity.online_document or entity.journal
             
         return result
     
@@ -254,7 +266,7 @@ class __DocumentObserver(__ObserverBase):
         
         #0.18 workaround: we cannot access the Removing object status, and hence not detect if a OriginGroupExtension object is removed
         #this leads to a stranding Origin. Let's try to detect if we currently remove a part
-        if float(".".join(FreeCAD.Version()[0:2])) == 0.18:
+        if Version.isFC018:
             if obj.TypeId == "App::Origin":
                 self._removing += obj.InList
                 
@@ -279,7 +291,7 @@ class __DocumentObserver(__ObserverBase):
             return
             
         #0.18 workaround: get new extensions (in >=0.19 there are observer events for that)
-        if float(".".join(FreeCAD.Version()[0:2])) == 0.18:
+        if Version.isFC018:
             added = self.fc018GetNewExtensions(obj)
             for extension in added:
                 props = self.fc018GetPropertiesForExtension(extension)
@@ -291,6 +303,8 @@ class __DocumentObserver(__ObserverBase):
 
     def slotAppendDynamicProperty(self, obj, prop):    
                
+        Property.invalidateInformation(obj, prop)
+        
         doc = obj.Document
         if self.isDeactivatedFor(doc):
             return
@@ -306,6 +320,8 @@ class __DocumentObserver(__ObserverBase):
     
     def slotRemoveDynamicProperty(self, obj, prop):   
                
+        Property.invalidateInformation(obj, prop)
+        
         doc = obj.Document
         if self.isDeactivatedFor(doc):
             return
@@ -379,14 +395,30 @@ class __DocumentObserver(__ObserverBase):
         
     
     
-    def slotRecomputedDocument(self, doc):
+    def slotBeforeRecomputeDocument(self, doc):
+        #works for >=0.19: changes during recompute are buffered by the online document
         
         if self.isDeactivatedFor(doc):
             return
         
         odoc = self._getOnlineDocument(doc)
         if odoc:
-            odoc.recomputeDocument()
+            odoc.beginRecompute()
+    
+    
+    def slotRecomputedDocument(self, doc):
+        
+        odoc = self._getOnlineDocument(doc)
+        if not odoc:
+            return
+        
+        #flush buffered changes even if deactivated meanwhile, otherwise buffering would never end
+        odoc.endRecompute()
+        
+        if self.isDeactivatedFor(doc):
+            return
+        
+        odoc.recomputeDocument()
     
     #def slotUndoDocument(self, doc):
         #pass
@@ -426,12 +458,10 @@ class __GUIDocumentObserver(__ObserverBase):
         super().__init__(handler)
  
     def _hasOnlineViewProvider(self, vp):
+        # the entity is found by the handlers document index, only its online document needs to check the vp
         
-        for entity in self.handler.getEntities(): 
-            if entity.online_document and entity.online_document.hasViewProvider(vp):
-                return True
-        
-        return False
+        odoc = self._getOnlineDocument(vp.Object.Document)
+        return bool(odoc) and odoc.hasViewProvider(vp)
        
     def slotCreatedDocument(self, doc):
         pass
@@ -482,7 +512,7 @@ class __GUIDocumentObserver(__ObserverBase):
             return
         
         #0.18 workaround: get new extensions (in >=0.19 there are observer events for that)
-        if float(".".join(FreeCAD.Version()[0:2])) == 0.18:
+        if Version.isFC018:
             added = self.fc018GetNewExtensions(vp)
             for extension in added:
                 props = self.fc018GetPropertiesForExtension(extension)
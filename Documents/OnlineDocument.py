@@ -21,6 +21,9 @@ import asyncio, logging, os, traceback
 import Documents.Property   as Property
 import Documents.Syncer     as Syncer
 import Documents.Observer   as Observer
+import Documents.Object     as Object
+import Documents.Digest     as Digest
+import Utils.Priority       as Priority
 from Documents.OnlineObserver   import OnlineObserver
 from Documents.OnlineObject     import OnlineObject, OnlineViewProvider
 from Documents.AsyncRunner      import DocumentRunner
@@ -28,13 +31,123 @@ from Utils.Errorhandling        import OCPErrorHandler, attachErrorData
 
 from autobahn.wamp.exception    import ApplicationError
 
+
+class _ViewProviderMap(dict):
+    # Online viewproviders by object name, with a reverse map from the FreeCAD viewprovider (identity) to the
+    # online one. Allows O(1) membership checks for the GUI observer, which is called for every vp change
+
+    def __init__(self):
+        super().__init__()
+        self.byViewProvider = {}
+
+    def __setitem__(self, name, ovp):
+        if name in self:
+            self.byViewProvider.pop(id(self[name].obj), None)
+        super().__setitem__(name, ovp)
+        self.byViewProvider[id(ovp.obj)] = ovp
+
+    def __delitem__(self, name):
+        self.byViewProvider.pop(id(self[name].obj), None)
+        super().__delitem__(name)
+
+    def pop(self, name, *default):
+        if name in self:
+            self.byViewProvider.pop(id(self[name].obj), None)
+        return super().pop(name, *default)
+
+    def clear(self):
+        self.byViewProvider.clear()
+        super().clear()
+
+
+class VersionMirror():
+    # The node versions of all objects and viewproviders at the last sync, and the local changes since then. The
+    # node increases an objects version on any change, hence comparing the versions shows which objects and 
+    # properties diverged. The mirror is kept by the entity over the lifetime of an online document, to allow an
+    # incremental resync after reconnects. 
+    # The digest follows the node data we know of, to verify it against the node (see Digest)
+    
+    def __init__(self):
+        self.versions = {"Objects": {}, "ViewProviders": {}}    # name: [typeid, version, {prop: version}, extension version, creation id]
+        self.touched  = {"Objects": {}, "ViewProviders": {}}    # name: set of changed props, or True if unknown
+        self.loading  = {"Objects": {}, "ViewProviders": {}}    # touched entries reported by known(), cleared by update()
+        self.digest   = Digest.Tree()
+    
+    @property
+    def synced(self):
+        return bool(self.versions["Objects"])
+    
+    def touch(self, group, name, prop = None):
+        # marks a local change, which may not have reached the node
+        
+        touched = self.touched[group]
+        if prop is None:
+            touched[name] = True
+        elif touched.get(name) is not True:
+            touched.setdefault(name, set()).add(prop)
+    
+    def known(self, group):
+        # the versions to compare against the node. Touched objects get an invalid one to be reported in any case
+        
+        touched = self.touched[group]
+        self.loading[group] = {name: props if props is True else set(props) for name, props in touched.items()}
+        return {name: -1 if name in touched else entry[1] for name, entry in self.versions[group].items()}
+    
+    def divergent(self, group, name, change):
+        # Returns the properties that need to be downloaded for the changed node object (as returned by GetChanges), 
+        # or None if the whole object needs to be downloaded
+        
+        old = self.versions[group].get(name)
+        touched = self.touched[group].get(name)
+        if old is None or touched is True or old[4:] != change[4:]:
+            # unknown, or recreated under the same name (different creation id)
+            return None
+        
+        props, extVersion = change[2], change[3]
+        if extVersion != old[3] or props.keys() != old[2].keys():
+            return None
+        
+        result = [prop for prop, version in props.items() if old[2][prop] != version]
+        if touched:
+            result += [prop for prop in touched if prop in props and prop not in result]
+        return result
+    
+    def update(self, group, changes):
+        # stores the node versions after the changes are loaded. Only the touches reported by known() are cleared,
+        # local changes done while loading stay touched
+        
+        versions = self.versions[group]
+        for name in changes["removed"]:
+            versions.pop(name, None)
+            self.digest.remove(group, name)
+        versions.update(changes["objects"])
+        
+        touched = self.touched[group]
+        for name, loaded in self.loading[group].items():
+            current = touched.get(name)
+            if current is None or (current is True and loaded is not True):
+                continue
+            if loaded is True or not current - loaded:
+                touched.pop(name)
+            else:
+                touched[name] = current - loaded
+        
+        self.loading[group] = {}
+    
+    def remove(self, name):
+        for group in self.versions:
+            self.versions[group].pop(name, None)
+            self.touched[group].pop(name, None)
+            self.digest.remove(group, name)
+
+
 class OnlineDocument(OCPErrorHandler):
     ''' Describing a FreeCAD document in the OCP framework. Properties can be changed or objects added/removed 
         like with a normal FreeCAD document, with the difference, that all changes are mirrored to all collabrators.
         Changes to the online doc do not change anything on the local one. The intenion is to mirror all user changes 
         done to the local document'''
 
-    def __init__(self, id, doc, connection, dataservice):
+    def __init__(self, id, doc, connection, dataservice, mirror = None):
         
         super().__init__()
         
@@ -45,10 +158,22 @@ class OnlineDocument(OCPErrorHandler):
         self.data = dataservice
         self.onlineObs = OnlineObserver(self)
         self.objects = {}
-        self.viewproviders = {}
+        self.viewproviders = _ViewProviderMap()
         self.logger = logging.getLogger("Document " + id[-5:])
         self.sync = None        
         self.synced = os.getenv('FC_OCP_SYNC_MODE', "0") == "1"
+        self.bufferRecompute = os.getenv('FC_OCP_RECOMPUTE_BUFFER', "1") == "1"
+        self.recomputeTimeout = 60
+        self.__recomputing = None    # timeout handle while a recompute is buffered
+        self.__buffer = {}
+        self.lazyLoad = os.getenv('FC_OCP_LAZY_LOAD', "0") == "1"
+        self.lazyChunk = 10
+        self.__pending = {}
+        self.__pendingTask = None
+        self.mirror = mirror if mirror else VersionMirror()
+        self.verifyInterval = float(os.getenv('FC_OCP_VERIFY_INTERVAL', "0"))
+        self.__verifyTask = None
+        self.__digestMigrated = False
             
         #Online documents cannot use the FreeCAD Transaction framework
         doc.UndoMode = 0
@@ -64,6 +189,16 @@ class OnlineDocument(OCPErrorHandler):
         # we close the online doc. That means closing the observer and all objects/viewproviders
         
         try:
+            if self.__pendingTask and not self.__pendingTask.done():
+                self.__pendingTask.cancel()
+            self.__pending = {}
+            if self.__verifyTask and not self.__verifyTask.done():
+                self.__verifyTask.cancel()
+            if self.__recomputing:
+                self.__recomputing.cancel()
+                self.__recomputing = None
+            self.__buffer = {}
+            
             tasks = []
             tasks.append(self.onlineObs.close())
             
@@ -76,8 +211,8 @@ class OnlineDocument(OCPErrorHandler):
             if tasks:
                 await asyncio.gather(*tasks)
                 
-            self.objects = []
-            self.viewproviders = []
+            self.objects = {}
+            self.viewproviders = _ViewProviderMap()
         
         except Exception as e:
             attachErrorData(e, "ocp_message", "Closing document failed")
@@ -108,6 +243,7 @@ class OnlineDocument(OCPErrorHandler):
             
         return False
     
+    @Priority.inLane(Priority.Lane.Structure)
     def newObject(self, obj):
                
         if self.shouldExcludeTypeId(obj.TypeId):
@@ -142,6 +278,7 @@ class OnlineDocument(OCPErrorHandler):
             oobj.setup()
      
      
+    @Priority.inLane(Priority.Lane.Structure)
     def removeObject(self, obj):
         
         if self.shouldExcludeTypeId(obj.TypeId):
@@ -159,6 +296,10 @@ class OnlineDocument(OCPErrorHandler):
         #remove the async runner for that object after all other current objects are done
         oobj = self.objects[obj.Name]
         del(self.objects[obj.Name])
+        self.__buffer.pop(("Objects", obj.Name), None)
+        self.__buffer.pop(("ViewProviders", obj.Name), None)
+        self.clearPending("Objects", obj.Name)
+        self.clearPending("ViewProviders", obj.Name)
         oobj.synchronize(Syncer.WaitAcknowledgeSyncer(ackno))
         oobj.remove()
         self._unregisterSubErrorhandler(oobj)
@@ -180,6 +321,12 @@ class OnlineDocument(OCPErrorHandler):
                 self.logger.error(f"Property {prop} change but object does not exist in online document")
                 return
         
+        if self.__recomputing:
+            self.__mark("Objects", obj.Name)["props"][prop] = None
+            return
+        
+        self.clearPending("Objects", obj.Name, [prop])
+        self.mirror.touch("Objects", obj.Name, prop)
         oobj = self.objects[obj.Name]
         oobj.changeProperty(prop)
     
@@ -193,6 +340,7 @@ class OnlineDocument(OCPErrorHandler):
             self.logger.error(f"OnlineDocument called for object {obj.Name}, but is not setup")
             return
         
+        self.mirror.touch("Objects", obj.Name, prop)
         oobj = self.objects[obj.Name]
         oobj.changePropertyStatus(prop)
     
@@ -206,6 +354,7 @@ class OnlineDocument(OCPErrorHandler):
             self.logger.error(f"OnlineDocument called for object {obj.Name}, but is not setup")
             return
         
+        self.mirror.touch("Objects", obj.Name)
         oobj = self.objects[obj.Name]
         oobj.createDynamicProperty(prop)
         
@@ -219,6 +368,7 @@ class OnlineDocument(OCPErrorHandler):
             self.logger.error(f"OnlineDocument called for object {obj.Name}, but is not setup")
             return
         
+        self.mirror.touch("Objects", obj.Name)
         oobj = self.objects[obj.Name]
         oobj.removeDynamicProperty(prop)
 
@@ -231,6 +381,7 @@ class OnlineDocument(OCPErrorHandler):
             self.logger.error(f"OnlineDocument called for object {obj.Name}, but is not setup")
             return
         
+        self.mirror.touch("Objects", obj.Name)
         oobj = self.objects[obj.Name]
         oobj.addDynamicExtension(extension, props)
         
@@ -244,19 +395,19 @@ class OnlineDocument(OCPErrorHandler):
             self.logger.error(f"OnlineDocument called for object {obj.Name}, but is not setup")
             return
         
+        if self.__recomputing:
+            self.__mark("Objects", obj.Name)["recomputed"] = True
+            return
+        
         oobj = self.objects[obj.Name]
         oobj.recompute()
     
     
     def hasViewProvider(self, vp):
-        ovps = self.viewproviders.values()
-        for ovp in ovps:
-            if ovp.obj is vp:
-                return True
-        
-        return False
+        return id(vp) in self.viewproviders.byViewProvider
     
     
+    @Priority.inLane(Priority.Lane.ViewProvider)
     def newViewProvider(self, vp):
         #Setups and uploads a new ViewProvider
         
@@ -273,6 +424,7 @@ class OnlineDocument(OCPErrorHandler):
         ovp.setup() #no sync, as it uses the OnlineObject runner, which is synced
         
      
+    @Priority.inLane(Priority.Lane.ViewProvider)
     def removeViewProvider(self, vp):
         
         if self.shouldExcludeTypeId(vp.Object.TypeId):
@@ -284,6 +436,7 @@ class OnlineDocument(OCPErrorHandler):
         ovp.remove()
         
         
+    @Priority.inLane(Priority.Lane.ViewProvider)
     def changeViewProvider(self, vp, prop):
         
         if self.shouldExcludeTypeId(vp.Object.TypeId):
@@ -293,10 +446,17 @@ class OnlineDocument(OCPErrorHandler):
             self.logger.error(f"OnlineDocument called for viewprovider {vp.Object.Name}, but is not setup")
             return
         
+        if self.__recomputing:
+            self.__mark("ViewProviders", vp.Object.Name)["props"][prop] = None
+            return
+        
+        self.clearPending("ViewProviders", vp.Object.Name, [prop])
+        self.mirror.touch("ViewProviders", vp.Object.Name, prop)
         ovp = self.viewproviders[vp.Object.Name]
         ovp.changeProperty(prop)
     
     
+    @Priority.inLane(Priority.Lane.ViewProvider)
     def changeViewProviderPropertyStatus(self, vp, prop):
         
         if self.shouldExcludeTypeId(vp.Object.TypeId):
@@ -306,10 +466,12 @@ class OnlineDocument(OCPErrorHandler):
             self.logger.error(f"OnlineDocument called for viewprovider {vp.Object.Name}, but is not setup")
             return
         
+        self.mirror.touch("ViewProviders", vp.Object.Name, prop)
         ovp = self.viewproviders[vp.Object.Name]
         ovp.changePropertyStatus(prop)
         
     
+    @Priority.inLane(Priority.Lane.ViewProvider)
     def newViewProviderDynamicProperty(self, vp, prop):
         
         if self.shouldExcludeTypeId(vp.Object.TypeId):
@@ -319,10 +481,12 @@ class OnlineDocument(OCPErrorHandler):
             self.logger.error(f"OnlineDocument called for viewprovider {vp.Object.Name}, but is not setup")
             return
         
+        self.mirror.touch("ViewProviders", vp.Object.Name)
         ovp = self.viewproviders[vp.Object.Name]
         ovp.createDynamicProperty(prop)
         
         
+    @Priority.inLane(Priority.Lane.ViewProvider)
     def removeViewProviderDynamicProperty(self, vp, prop):
         
         if self.shouldExcludeTypeId(vp.Object.TypeId):
@@ -332,10 +496,12 @@ class OnlineDocument(OCPErrorHandler):
             self.logger.error(f"OnlineDocument called for viewprovider {vp.Object.Name}, but is not setup")
             return
         
+        self.mirror.touch("ViewProviders", vp.Object.Name)
         ovp = self.viewproviders[vp.Object.Name]
         ovp.removeDynamicProperty(prop)
 
 
+    @Priority.inLane(Priority.Lane.ViewProvider)
     def addViewProviderDynamicExtension(self, vp, extension, props):
         if self.shouldExcludeTypeId(vp.Object.TypeId):
             return
@@ -344,10 +510,85 @@ class OnlineDocument(OCPErrorHandler):
             self.logger.error(f"OnlineDocument called for viewprovider {vp.Object.Name}, but is not setup")
             return
         
+        self.mirror.touch("ViewProviders", vp.Object.Name)
         ovp = self.viewproviders[vp.Object.Name]
         ovp.addDynamicExtension(extension, props)
         
         
+    # Recompute buffering
+    # *******************
+    
+    # A single recompute fires many change callbacks per object. While FreeCAD recomputes, changes are only marked
+    # and flushed in order of their first change, as one coalesced batch per object, when the recompute finished.
+    # This way the node transaction closed afterwards maps to the user action. Disable with FC_OCP_RECOMPUTE_BUFFER=0
+    # GUI transactions are not buffered: online documents run with UndoMode 0, hence FreeCAD opens no transactions
+    # for them and the observer gets no transaction events.
+
+    def beginRecompute(self):
+        # FreeCAD does not nest document recomputes: if we are still buffering, the last recompute never reported 
+        # its end (e.g. it raised) and its changes are flushed now
+        
+        if not self.bufferRecompute:
+            return
+        
+        if self.__recomputing:
+            self.__flush()
+        
+        self.__recomputing = asyncio.get_event_loop().call_later(self.recomputeTimeout, self.__recomputeTimedOut)
+    
+    
+    def endRecompute(self):
+        
+        if self.__recomputing:
+            self.__flush()
+    
+    
+    def __recomputeTimedOut(self):
+        # guards against a recompute end that never arrives, which would buffer all changes forever
+        
+        self.logger.warning(f"Recompute did not finish within {self.recomputeTimeout}s, stop buffering its changes")
+        self.__recomputing = None
+        self.__flush()
+    
+    
+    def __mark(self, group, name):
+        # returns the buffer entry for the object or viewprovider. Property dict is used as ordered set
+        
+        key = (group, name)
+        if key not in self.__buffer:
+            self.__buffer[key] = {"props": {}, "recomputed": False}
+        
+        return self.__buffer[key]
+    
+    
+    def __flush(self):
+        
+        # ends the buffering in any case, even if replaying a change fails
+        if self.__recomputing:
+            self.__recomputing.cancel()
+            self.__recomputing = None
+        
+        buffer = self.__buffer
+        self.__buffer = {}
+        
+        for (group, name), entry in buffer.items():
+            
+            online = self.objects if group == "Objects" else self.viewproviders
+            if name not in online:
+                continue
+            
+            # replayed through the change callbacks for the same bookkeeping (pending data, mirror, priority lane)
+            oobj   = online[name]
+            props  = oobj.obj.PropertiesList
+            change = self.changeObject if group == "Objects" else self.changeViewProvider
+            for prop in entry["props"]:
+                if prop in props:
+                    change(oobj.obj, prop)
+                
+            if entry["recomputed"]:
+                oobj.recompute()
+        
+        
     def recomputeDocument(self):
         
         #the document has been fully recomputed. That means we have received all object changes that belong to 
@@ -405,6 +646,7 @@ class OnlineDocument(OCPErrorHandler):
             self._processException(e)        
 
 
+    @Priority.inLane(Priority.Lane.Bulk)
     async def asyncSetup(self):
         # Loads the existing FreeCAD doc into the ocp node
         # called from entity, and not a runner, hence requires any exception to be raised
@@ -430,53 +672,122 @@ class OnlineDocument(OCPErrorHandler):
             if tasks:
                 await asyncio.gather(*tasks)
             
+            # node and document are in sync now, remember the node versions for incremental resyncs
+            uri = f"ocp.documents.{self.id}.content.Document."
+            for group in ["Objects", "ViewProviders"]:
+                self.mirror.update(group, await self.connection.api.call(uri + f"{group}.GetChanges", {}))
+            
+            self.__startVerification()
+            
         except Exception as e:
             attachErrorData(e, "ocp_message", "Unable to setup document")
             raise e
 
             
                    
+    @Priority.inLane(Priority.Lane.Bulk)
     async def asyncLoad(self):
-        # loads the online doc into the freecad doc
-        # called from entity, and not a runner, hence requires any exception to be raised
+        # Loads the online doc into the freecad doc. If the document was synced before (the version mirror is
+        # available) only the objects and properties that diverged since then are loaded, everything else is kept.
+        # Called from entity, and not a runner, hence requires any exception to be raised
         
         try:
             #first we need to get into view mode for the document, to have a steady picture of the current state of things and
             #to not get interrupted
             await self.connection.api.call(f"ocp.documents.{self.id}.view", True)
             
-            #create all document objects!
-            uri = f"ocp.documents.{self.id}.content.Document.Objects.GetObjectTypes"
-            objs = await self.connection.api.call(uri)
+            #get all node objects that differ from our last known state (all for the initial load)
+            uri = f"ocp.documents.{self.id}.content.Document."
+            objChanges, vpChanges = await asyncio.gather(self.connection.api.call(uri + "Objects.GetChanges", self.mirror.known("Objects")),
+                                                         self.connection.api.call(uri + "ViewProviders.GetChanges", self.mirror.known("ViewProviders")))
+            if self.mirror.synced:
+                self.logger.info(f"Incremental load: {len(objChanges['objects'])} objects and {len(vpChanges['objects'])} viewproviders changed")
    
             tasks = []              
             with Observer.blocked(self.document):
-                for name, objtype in objs.items():
+                
+                #objects removed on the node
+                for name in objChanges["removed"]:
+                    if self.document.getObject(name) and name not in objChanges["objects"]:
+                        self.document.removeObject(name)
+                
+                #all still existing objects known from the last sync stay as they are
+                for name in self.mirror.versions["Objects"]:
+                    if name in objChanges["objects"] or name in objChanges["removed"]:
+                        continue
+                    
+                    fcobj = self.document.getObject(name)
+                    if fcobj is None:
+                        # removed locally: node status wins, and the node object is still as we know it
+                        objChanges["objects"][name] = self.mirror.versions["Objects"][name]
+                        continue
+                    
+                    self.objects[name] = OnlineObject(fcobj, self)
+                
+                #changed and new objects
+                recreated = set()
+                for name, change in objChanges["objects"].items():
                     
-                    if hasattr(self.document, name):
+                    fcobj = self.document.getObject(name)
+                    props = self.mirror.divergent("Objects", name, change)
+                    
+                    if fcobj is not None and props is not None and fcobj.TypeId == change[0]:
+                        # only some properties changed
+                        oobj = OnlineObject(fcobj, self)
+                        self.objects[name] = oobj
+                        tasks.append(oobj.downloadProperties(fcobj, props))
+                        continue
+                    
+                    if fcobj is not None:
                         self.document.removeObject(name)
                     
                     # create the FC object
-                    fcobj = self.document.addObject(objtype, name)
+                    fcobj = self.document.addObject(change[0], name)
                     if fcobj.Name != name:
                         raise Exception("Cannot setup object, name wrong")
 
                     # create and load the online object
                     oobj = OnlineObject(fcobj, self)
                     self.objects[name] = oobj
-                    tasks.append(oobj.download(fcobj))
+                    recreated.add(name)
+                    tasks.append(self.__download("Objects", name, oobj, fcobj))
+                    
+                #create and load the online viewproviders
+                for name, oobj in self.objects.items():
+                    
+                    fcobj = oobj.obj
+                    if not fcobj.ViewObject:
+                        continue
                     
-                    # create and load the online viewprovider
-                    if fcobj.ViewObject:
-                        ovp = OnlineViewProvider(fcobj.ViewObject, self.objects[name], self)
-                        self.viewproviders[name] = ovp
-                        tasks.append(ovp.download(fcobj.ViewObject))
+                    ovp = OnlineViewProvider(fcobj.ViewObject, oobj, self)
+                    self.viewproviders[name] = ovp
+                    
+                    change = vpChanges["objects"].get(name, None)
+                    if name in recreated:
+                        tasks.append(self.__download("ViewProviders", name, ovp, fcobj.ViewObject))
+                    elif change:
+                        props = self.mirror.divergent("ViewProviders", name, change)
+                        if props is None:
+                            tasks.append(self.__download("ViewProviders", name, ovp, fcobj.ViewObject))
+                        else:
+                            tasks.append(ovp.downloadProperties(fcobj.ViewObject, props))
               
             #TODO: load document properties
               
             # we do this outside of the observer blocking context, as the object loads block themself
             if tasks:
                 await asyncio.gather(*tasks)
+            
+            self.mirror.update("Objects", objChanges)
+            self.mirror.update("ViewProviders", vpChanges)
+            
+            # the document is usable now, the binary data of lazy loaded properties follows in the background
+            if self.__pending:
+                num = sum(len(props) for props in self.__pending.values())
+                self.logger.info(f"Lazy loading {num} binary properties of {len(self.__pending)} objects")
+                self.__pendingTask = asyncio.ensure_future(self.__fetchPending())
+            
+            self.__startVerification()
         
         except Exception as e:
             attachErrorData(e, "ocp_message", "Unable to load document")
@@ -486,6 +797,235 @@ class OnlineDocument(OCPErrorHandler):
             await self.connection.api.call(f"ocp.documents.{self.id}.view", False)
         
     
+    async def __download(self, group, name, oobj, obj):
+        # downloads the online object and remembers all binary properties that have been left out in lazy mode
+        
+        pending = await oobj.download(obj, self.lazyLoad)
+        if pending:
+            self.__pending[(group, name)] = pending
+    
+    
+    # Lazy loading
+    # ############
+    
+    # In lazy load mode the binary properties (shapes, meshes etc.) are not downloaded when loading the document,
+    # but only their cids are stored. Objects stay in a placeholder state, i.e. without geometry, till the data 
+    # is fetched in the background. Any change to a pending property, local or remote, is newer than the pending
+    # data and hence removes it.
+    
+    def isPending(self, name):
+        # returns True if the object or its viewprovider still waits for binary data
+        return ("Objects", name) in self.__pending or ("ViewProviders", name) in self.__pending
+    
+    
+    def pendingObjects(self):
+        # returns the names of all objects that wait for binary data
+        return list(dict.fromkeys(name for _, name in self.__pending))
+    
+    
+    def clearPending(self, group, name, props = None):
+        # removes the given properties from the pending list. If no props are given, all are removed
+        
+        if not self.__pending:
+            return
+        
+        key = (group, name)
+        if key not in self.__pending:
+            return
+        
+        if props is None:
+            del self.__pending[key]
+            return
+        
+        entry = self.__pending[key]
+        for prop in props:
+            entry.pop(prop, None)
+        if not entry:
+            del self.__pending[key]
+    
+    
+    def __selectedNames(self):
+        # the names of all objects selected in the tree. Not available without GUI
+        try:
+            import FreeCADGui
+            return {obj.Name for obj in FreeCADGui.Selection.getSelection(self.document.Name)}
+        except (ImportError, AttributeError):
+            return set()
+    
+    
+    def __pendingObject(self, key):
+        # returns the FreeCAD object or viewprovider for the pending key, None if it does not exist anymore
+        
+        group, name = key
+        obj = self.document.getObject(name)
+        if obj is None or group == "Objects":
+            return obj
+        return getattr(obj, "ViewObject", None)
+    
+    
+    def __pendingPriority(self, key, selected):
+        # visible objects first, then selected ones, and finally all the rest
+        
+        obj = self.document.getObject(key[1])
+        if obj is None:
+            return 3
+        vp = getattr(obj, "ViewObject", None)
+        if vp is not None and getattr(vp, "Visibility", False):
+            return 0
+        if key[1] in selected:
+            return 1
+        return 2
+    
+    
+    async def __fetchPendingChunk(self, requests):
+        # fetches the data for [(key, prop, cid)] requests. If the cids cannot be resolved anymore, e.g. as the 
+        # data was removed from the network, the current property values are read from the node instead
+        
+        try:
+            values = await self.data.getBinaryValues(self.id, [cid for _, _, cid in requests])
+            if len(requests) == 1:
+                values = [values]
+            return values
+        
+        except Exception as e:
+            self.logger.debug(f"Fetching pending binary data failed ({e}), read current values instead")
+        
+        values = []
+        for key, prop, _ in requests:
+            group, name = key
+            oobj = self.objects.get(name) if group == "Objects" else self.viewproviders.get(name)
+            if oobj is None:
+                values.append(None)
+            else:
+                values.append(await oobj.Reader.properties([prop]))
+        return values
+    
+    
+    async def __fetchPending(self):
+        # Fetches the pending binary data in chunks of objects. The priority is evaluated for each chunk, so that
+        # changed visibility or selection during the background load is respected
+        
+        try:
+            while self.__pending:
+                
+                selected = self.__selectedNames()
+                keys     = sorted(self.__pending, key=lambda key: self.__pendingPriority(key, selected))[:self.lazyChunk]
+                requests = [(key, prop, cid) for key in keys for prop, cid in self.__pending[key].items()]
+                values   = await self.__fetchPendingChunk(requests)
+                
+                # apply all data that is still pending, i.e. was not changed or removed in the meantime
+                apply = {}
+                for (key, prop, cid), value in zip(requests, values):
+                    entry = self.__pending.get(key)
+                    if not entry or entry.get(prop) != cid:
+                        continue
+                    
+                    del entry[prop]
+                    if value is not None:
+                        apply.setdefault(key, ([], []))
+                        apply[key][0].append(prop)
+                        apply[key][1].append(value)
+                    
+                for key in keys:
+                    if key in self.__pending and not self.__pending[key]:
+                        del self.__pending[key]
+                
+                with Object.bulkApply(self.document):
+                    for key, (props, values) in apply.items():
+                        obj = self.__pendingObject(key)
+                        if obj is None:
+                            continue
+                        
+                        # dynamic properties could have been removed meanwhile
+                        available = obj.PropertiesList
+                        values = [value for prop, value in zip(props, values) if prop in available]
+                        props  = [prop for prop in props if prop in available]
+                        try:
+                            Object.setProperties(obj, props, values)
+                        except Exception as e:
+                            self.logger.error(f"Applying lazy loaded properties {props} of {key[1]} failed: {e}")
+                
+            self.logger.info("Lazy loading finished")
+        
+        except asyncio.CancelledError:
+            pass
+        
+        except Exception as e:
+            attachErrorData(e, "ocp_message", "Lazy loading binary properties failed")
+            self._processException(e)
+    
+    
+    async def verify(self, repair = False):
+        # Compares the node data known to us (the digest of the mirror) top-down with the node. Returns the divergent 
+        # objects as {group: {name: [props]}}, with None instead of the properties if the object exists only on one 
+        # side. Changes in flight are reported too, hence to be called when idle. If repair is given the divergent 
+        # objects are recovered from the node.
+        
+        try:
+            # documents with data from before the digest get their node hashes calculated once, a no-op otherwise
+            uri = f"ocp.documents.{self.id}.content.Document."
+            if not self.__digestMigrated:
+                for group in ["Objects", "ViewProviders"]:
+                    await self.connection.api.call(uri + f"{group}.MigrateDigest")
+                self.__digestMigrated = True
+            
+            digest = self.mirror.digest
+            result = {}
+            for group in ["Objects", "ViewProviders"]:
+                names = await Digest.divergentObjects(self.connection, self.id, digest, group)
+                props = await asyncio.gather(*[Digest.divergentProperties(self.connection, self.id, digest, group, name) 
+                                               for name in names])
+                result[group] = dict(zip(names, props))
+            
+            if repair:
+                self.__repair(result)
+            
+            return result
+        
+        except Exception as e:
+            attachErrorData(e, "ocp_message", "Verifying document failed")
+            raise e
+    
+    
+    def __repair(self, divergent):
+        
+        for group, entries in divergent.items():
+            online = self.objects if group == "Objects" else self.viewproviders
+            for name, props in entries.items():
+                if name in online:
+                    self.logger.warning(f"{group[:-1]} {name} diverged from node, recover {props if props else 'all'}")
+                    online[name].recover(props)
+                else:
+                    self.logger.warning(f"{group[:-1]} {name} diverged from node, but is not available locally")
+    
+    
+    def __startVerification(self):
+        
+        if self.verifyInterval > 0 and not self.__verifyTask:
+            self.__verifyTask = asyncio.ensure_future(self.__verification())
+    
+    
+    async def __verification(self):
+        # Background verification. Changes in flight show up as divergence temporarily, hence only objects and 
+        # properties reported by two consecutive checks are recovered
+        
+        suspects = {}
+        while True:
+            await asyncio.sleep(self.verifyInterval)
+            try:
+                found     = await self.verify()
+                confirmed = {group: {name: props for name, props in entries.items() if name in suspects.get(group, {})}
+                             for group, entries in found.items()}
+                
+                self.__repair(confirmed)
+                suspects = {group: {name: props for name, props in entries.items() if name not in confirmed[group]}
+                            for group, entries in found.items()}
+            
+            except Exception as e:
+                attachErrorData(e, "ocp_message", "Background verification failed")
+                self._processException(e)
+    
+    
     async def asyncUnload(self):
         pass
     
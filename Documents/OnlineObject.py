@@ -27,6 +27,10 @@ import asyncio, logging, os, traceback
 import Documents.Batcher  as Batcher
 import Documents.Property as Property
 import Documents.Object   as Object
+import Documents.Version  as Version
+import Documents.Tracing  as Tracing
+import Documents.Recovery as Recovery
+import Utils.Priority     as Priority
 from Documents.AsyncRunner import BatchedOrderedRunner, DocumentRunner
 from Documents.Writer import OCPObjectWriter
 from Documents.Reader import OCPObjectReader
@@ -53,11 +57,20 @@ class FreeCADOnlineObject(OCPErrorHandler):
                 self._runner     = parentOnlineObj._runner
 
         self._registerSubErrorhandler(self._runner)
-        self._runner.setRecoverTask(OCPErrorHandler.OCPError.Application, self.download)
-        self._runner.setRecoverTask(OCPErrorHandler.OCPError.Connection, self.download)
+        
+        #recovery state: the writes to queue again ({prop: "value"|"status"}) and the properties to download, 
+        #True for the whole object
+        self._breaker    = Recovery.Breaker()
+        self.__requeue   = {}
+        self.__recover   = set()
+        self.__scheduled = None
 
         self.Writer = OCPObjectWriter(name, objGroup, onlinedoc, self.logger)
         self.Reader = OCPObjectReader(name, objGroup, onlinedoc, self.logger)
+        
+        self._name   = name
+        self._group  = objGroup
+        self._digest = onlinedoc.mirror.digest
 
     # Error Handling
     # ##############
@@ -67,8 +80,16 @@ class FreeCADOnlineObject(OCPErrorHandler):
     
     def _handleError(self, source, error, data):
         
-        # after any error we need to ensure FreeCAD and Node status match
-        self._runner.run(self.download)
+        # after any error we need to ensure FreeCAD and Node status match. Writes that failed transiently are 
+        # queued again, otherwise the involved properties are downloaded, or the whole object if they are unknown
+        self._breaker.failure()
+        props = data.get("ocp_properties", None)
+        if props and "ocp_write" in data and Recovery.isTransient(data.get("exception", None)):
+            for prop in props:
+                self.__requeue[prop] = data["ocp_write"]
+            self.__scheduleRecovery()
+        else:
+            self.recover(props)
         
         if "ocp_message" in data:
                         
@@ -80,6 +101,79 @@ class FreeCADOnlineObject(OCPErrorHandler):
         
         super()._handleError(source, error, data)
     
+    
+    def recover(self, props = None):
+        # downloads the given properties, or the whole object if None, in the next recovery slot
+        
+        if props and self.__recover is not True:
+            self.__recover.update(props)
+        else:
+            self.__recover = True
+            
+        self.__scheduleRecovery()
+    
+    
+    def __scheduleRecovery(self):
+        # starts the recovery in the next slot the breaker allows. All failures till then are recovered together
+        
+        if self.__scheduled:
+            return
+        
+        delay = self._breaker.schedule()
+        if self._breaker.isOpen:
+            self.logger.error(f"Too many failures, recovery suspended for {delay:.0f}s")
+        
+        self.__scheduled = asyncio.get_event_loop().call_later(delay, self.__startRecovery)
+    
+    
+    def __startRecovery(self):
+        
+        self.__scheduled = None
+        requeue, self.__requeue = self.__requeue, {}
+        recover, self.__recover = self.__recover, set()
+        
+        if requeue:
+            self._runner.run(self.__requeueWrites, requeue)
+        if recover:
+            self._runner.run(self.__recoverDownload, None if recover is True else list(recover))
+    
+    
+    def _cancelRecovery(self):
+        if self.__scheduled:
+            self.__scheduled.cancel()
+            self.__scheduled = None
+    
+    
+    async def __requeueWrites(self, writes):
+        # writes the current FreeCAD values again. Properties removed in the meantime are skipped
+        
+        available = self.obj.PropertiesList
+        for prop, kind in writes.items():
+            if prop not in available:
+                continue
+            if kind == "status":
+                self.Writer.changePropertyStatus(prop, Property.getStatus(self.obj, prop))
+            else:
+                self.Writer.markProperty(self.obj, prop)
+                
+        await self.Writer.processPropertyChanges()
+        await self.Writer.processPropertyStatusChanges()
+        self._breaker.success()
+    
+    
+    @Priority.inLane(Priority.Lane.Bulk)
+    async def __recoverDownload(self, props):
+        
+        if props is None:
+            self.logger.info("Recover object by full download")
+            await self.download(self.obj)
+        else:
+            props = [prop for prop in props if prop in self.obj.PropertiesList]
+            self.logger.info(f"Recover properties {props} by download")
+            await self.downloadProperties(self.obj, props)
+            
+        self._breaker.success()
+    
 
     # Common FreeCAD object functionality
     # ###################################
@@ -102,6 +196,7 @@ class FreeCADOnlineObject(OCPErrorHandler):
 
         
     async def close(self):   
+        self._cancelRecovery()
         await self._runner.close()
 
         
@@ -109,9 +204,11 @@ class FreeCADOnlineObject(OCPErrorHandler):
         self._runner.sync(syncer)
         
     
-    async def download(self, obj):
+    async def download(self, obj, lazy = False):
         # Loads the OCP node data for this object into the FreeCAD one. If changes exist 
         # the local version will be overridden, hene can be used to reset a object
+        # In lazy mode binary properties are not downloaded but returned as {prop: cid} dict, for the caller
+        # to fetch them later. Otherwise the return value is always empty.
         # Note: this function works async, but cannot handle any changes during execution,
         #       neither on the node nor in the FC object
         
@@ -120,58 +217,108 @@ class FreeCADOnlineObject(OCPErrorHandler):
             
             #first check if we are available online to setup. Could happen that e.g. we load before the viewprovider was uploaded
             if not await self.Reader.isAvailable():
-                return
+                return {}
             
             #add the extensions (do that before properties, as extensions adds props too)
-            extensions = await self.Reader.extensions()
-            for extension in extensions:
-                self.logger.debug(f"Add extension {extension}")
-                Object.createExtension(obj, extension)
+            extensions, oProps = await asyncio.gather(self.Reader.extensions(), self.Reader.propertyList())
+            with Object.bulkApply(obj.Document):
+                for extension in extensions:
+                    self.logger.debug(f"Add extension {extension}")
+                    Object.createExtension(obj, extension)
             
-            oProps = await self.Reader.propertyList()
             if not oProps:
                 #no properties mean we loaded directly after object creation, before default property setup. Nothing is written yet
-                return
+                return {}
             defProps = self.obj.PropertiesList
+            remove   = set(defProps) - set(oProps)
+            add      = set(oProps) - set(defProps)
+            
+            #read everything first, so that all changes can be applied to FreeCAD in a single bulk
+            # Note: data can be None in case the property was never written (default value)
+            infos, values, defInfos = await asyncio.gather(self.Reader.propertiesInfos(add), 
+                                                           self.Reader.properties(oProps, resolve = False), 
+                                                           self.Reader.propertiesInfos(defProps))
             
-            # check if we need to remove some local props
-            remove = set(defProps) - set(oProps)
-            if remove:
-                self.logger.debug(f"Local object has too many properties, remove {remove}")
-                Object.removeDynamicProperties(obj, remove)
-                    
-            # create the dynamic properties
-            add = set(oProps) - set(defProps)
-            infos = await self.Reader.propertiesInfos(add)
-            self.logger.debug(f"Create and set dynamic properties {add}")
-            Object.createDynamicProperties(obj, add, infos)
+            self._digest.remove(self._group, self._name)
+            self._record(oProps, values)
+            if not lazy:
+                values = await self.Reader.resolve(values)
             
-            # set all property values. Note that data can be None in case the property was never written (default value)
-            values = await self.Reader.properties(oProps)
             writeProps  = []
             writeValues = []
+            pending     = {}
             for prop, value in zip(oProps, values):
-                if value:
+                if lazy and isinstance(value, str) and value.startswith("ocp_cid"):
+                    pending[prop] = value
+                elif value:
                     writeProps.append(prop)
                     writeValues.append(value)
-
-            self.logger.debug(f"Read properties {writeProps}")
-            Object.setProperties(obj, writeProps, writeValues)
             
-            # set the correct status for the non-dnamic properties
-            infos = await self.Reader.propertiesInfos(defProps)
-            status = [info["status"] for info in infos]
-            self.logger.debug(f"Set status of default properties {defProps} to {status}")
-            for prop, stat in zip(defProps, status):
-                Object.setPropertyStatus(obj, prop, stat)
+            with Object.bulkApply(obj.Document):
+                
+                # check if we need to remove some local props
+                if remove:
+                    self.logger.debug(f"Local object has too many properties, remove {remove}")
+                    Object.removeDynamicProperties(obj, remove)
+                        
+                # create the dynamic properties
+                self.logger.debug(f"Create and set dynamic properties {add}")
+                Object.createDynamicProperties(obj, add, infos)
+                
+                # set all property values
+                self.logger.debug(f"Read properties {writeProps}")
+                Object.setProperties(obj, writeProps, writeValues)
+                
+                # set the correct status for the non-dnamic properties
+                status = [info["status"] for info in defInfos]
+                self.logger.debug(f"Set status of default properties {defProps} to {status}")
+                for prop, stat in zip(defProps, status):
+                    Object.setPropertyStatus(obj, prop, stat)
 
             self.logger.debug(f"Object download finished")
+            if pending:
+                self.logger.debug(f"Binary properties {list(pending)} pending")
+            
+            return pending
             
         except Exception as e:
             attachErrorData(e, "ocp_message", "Downloading object failed")
             raise e
       
 
+    async def downloadProperties(self, obj, props):
+        # Loads the values and status of the given properties from the OCP node into the FreeCAD object. Used for
+        # incremental loads, where the object itself is known to be in sync
+        
+        try:
+            if not props:
+                return
+            
+            self.logger.debug(f"Download properties {props}")
+            values, infos = await asyncio.gather(self.Reader.properties(props, resolve = False), self.Reader.propertiesInfos(props))
+            self._record(props, values)
+            values = await self.Reader.resolve(values)
+            
+            with Object.bulkApply(obj.Document):
+                writeProps  = [prop for prop, value in zip(props, values) if value]
+                writeValues = [value for value in values if value]
+                Object.setProperties(obj, writeProps, writeValues)
+                
+                for prop, info in zip(props, infos):
+                    Object.setPropertyStatus(obj, prop, info["status"])
+            
+        except Exception as e:
+            attachErrorData(e, "ocp_message", "Downloading object properties failed")
+            raise e
+    
+
+    def _record(self, props, values):
+        # follows the node data in the digest. Values are still as transfered, binary data as cid
+        
+        for prop, value in zip(props, values):
+            self._digest.set(self._group, self._name, prop, value)
+    
+
     async def upload(self, obj):
         # Creates and uploads the object data into the ocp node
         # Note: this function works async, but cannot handle any changes during execution,
@@ -259,6 +406,7 @@ class OnlineObject(FreeCADOnlineObject):
         return self.Writer.setupStage
     
     def remove(self):
+        self._cancelRecovery()
         self._runner.run(self.Writer.remove)
         
         #we cannot use the runner to run close on itself, because it would wait for itself till it finishes: 
@@ -292,18 +440,24 @@ class OnlineObject(FreeCADOnlineObject):
     
     
     def changeProperty(self, prop):
-        value = Property.convertPropertyToWamp(self.obj, prop)
-        inlist = [obj.Name for obj in self.obj.InList]
-        self._runner.run(self.__changeProperty, prop, value, inlist)
+        trace = None
+        if Tracing.enabled:
+            trace = Tracing.newTrace()
+            Tracing.stamp(trace, "observer")
+        
+        #the value is serialized by the writer when the change is processed
+        self._runner.run(self.__changeProperty, prop, trace)
+        Tracing.stamp(trace, "enqueue")
         
-    def __changeProperty(self, prop, value, inlist):
+    def __changeProperty(self, prop, trace = None):
         #indirection for batcher named tasks
-        self.Writer.changeProperty(prop, value, inlist)
+        Tracing.stamp(trace, "runner")
+        self.Writer.markProperty(self.obj, prop, trace)
 
  
     def changePropertyStatus(self, prop):
-        info = Property.createInformation(self.obj, prop)        
-        self._runner.run(self.__changePropertyStatus, prop, info["status"])
+        status = Property.getStatus(self.obj, prop)
+        self._runner.run(self.__changePropertyStatus, prop, status)
         
     def __changePropertyStatus(self, prop, info):
         #indirection for batcher named tasks
@@ -336,7 +490,7 @@ class OnlineViewProvider(FreeCADOnlineObject):
           
     def setup(self, sync=None):
         
-        if float(".".join(FreeCAD.Version()[0:2])) == 0.18:
+        if Version.isFC018:
             #part of the FC 0.18 no proxy change event workaround
             if hasattr(self.obj, 'Proxy'):
                 self.proxydata = self.obj.Proxy
@@ -361,6 +515,7 @@ class OnlineViewProvider(FreeCADOnlineObject):
 
     
     def remove(self):
+        self._cancelRecovery()
         self._runner.run(self.Writer.remove)
         
     
@@ -382,32 +537,37 @@ class OnlineViewProvider(FreeCADOnlineObject):
     
     def changeProperty(self, prop):
         
-        value = Property.convertPropertyToWamp(self.obj, prop)
+        trace = None
+        if Tracing.enabled:
+            trace = Tracing.newTrace()
+            Tracing.stamp(trace, "observer")
         
-        if float(".".join(FreeCAD.Version()[0:2])) == 0.18:
+        if Version.isFC018:
             #work around missing proxy callback in ViewProvider. This may add to some delay, as proxy change is only forwarded 
             #when another property changes afterwards, however, at least the order of changes is kept
             if hasattr(self.obj, 'Proxy'):
                 if not self.proxydata is self.obj.Proxy:
                     self.proxydata = self.obj.Proxy
-                    self._runner.run(self.__changeProperty, 'Proxy', self.obj.dumpPropertyContent('Proxy'), [])
+                    self._runner.run(self.__changeProperty, 'Proxy')
             
-        
-        self._runner.run(self.__changeProperty, prop, value, [])
+        #the value is serialized by the writer when the change is processed
+        self._runner.run(self.__changeProperty, prop, trace)
+        Tracing.stamp(trace, "enqueue")
 
 
     def changePropertyStatus(self, prop):
-        info = Property.createInformation(self.obj, prop)        
-        self._runner.run(self.__changePropertyStatus, prop, info["status"])
+        status = Property.getStatus(self.obj, prop)
+        self._runner.run(self.__changePropertyStatus, prop, status)
         
         
     def __changePropertyStatus(self, prop, info):
         #indirection for batcher named tasks
         self.Writer.changePropertyStatus(prop, info)
 
-    def __changeProperty(self, prop, value, inlist):
+    def __changeProperty(self, prop, trace = None):
         #indirection for batcher named tasks
-        self.Writer.changeProperty(prop, value, inlist)
+        Tracing.stamp(trace, "runner")
+        self.Writer.markProperty(self.obj, prop, trace)
         
     def __addDynamicProperty(self, prop, info):
         #indirection for batcher named tasks
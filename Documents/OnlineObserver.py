@@ -23,9 +23,11 @@ import Documents.Object         as Object
 import Documents.AsyncRunner    as AsyncRunner
 import Documents.Observer       as Observer
 import Documents.Syncer         as Syncer
+import Documents.Tracing        as Tracing
+import Utils.Priority           as Priority
 from Documents.OnlineObject import OnlineObject
 from Documents.OnlineObject import OnlineViewProvider
-from autobahn.wamp.types    import SubscribeOptions, CallOptions
+from autobahn.wamp.types    import SubscribeOptions
 from autobahn.wamp          import ApplicationError
 
 class OnlineObserver():
@@ -66,6 +68,14 @@ class OnlineObserver():
         self.docCBs = {
             }
         
+        # number of event arguments if the event carries a trace id
+        self.tracedEvents = {
+                "Objects...onDatasChanged": 3,
+                "Objects....onDataChanged": 2,
+                "ViewProviders...onDatasChanged": 3,
+                "ViewProviders....onDataChanged": 2,
+            }
+        
         if os.getenv('FC_OCP_SYNC_MODE', "0") == "1":
             self.synced = True
         else:
@@ -108,6 +118,9 @@ class OnlineObserver():
         if key not in self.callbacks:
             return
         
+        if Tracing.enabled and len(args) == self.tracedEvents.get(key, 0):
+            Tracing.stamp(args[-1], "event")
+        
         #if object and property names are provided, add them to argument list
         if len(path) == 2 or len(path) == 3:
             #.MyObject.onEventName  or .MyObject.Properties.onEventName
@@ -125,12 +138,24 @@ class OnlineObserver():
             # runner name starts with number, as this is invalid freecad name and hence can never be used by FC
             self.logger.debug(f"Object created event: {args[0]}")
             blocker = Syncer.BlockSyncer()
-            self.getRunner("11_creator").run(fnc, *args)
+            with Priority.lane(Priority.Lane.Structure):
+                self.getRunner("11_creator").run(fnc, *args)
             self.getRunner("11_creator").sync(Syncer.RestartBlockSyncer(blocker))
             self.getRunner(args[0]).sync(blocker)
      
         else:
-            self.getRunner(args[0]).run(fnc, *args) #first argument is name
+            with Priority.lane(self.__lane(key)):
+                self.getRunner(args[0]).run(fnc, *args) #first argument is name
+    
+    
+    def __lane(self, key):
+        # priority lane for the processing of the event with given callback key
+        
+        if key.startswith("ViewProviders"):
+            return Priority.Lane.ViewProvider
+        if key == "Objects.onObjectRemoved":
+            return Priority.Lane.Structure
+        return Priority.Lane.Interactive
         
     
     async def __runDocProperties(self, *args, details=None):
@@ -227,6 +252,11 @@ class OnlineObserver():
             with Observer.blocked(self.onlineDoc.document):
                 self.onlineDoc.document.removeObject(name)
                    
+            self.onlineDoc.clearPending("Objects", name)
+            self.onlineDoc.clearPending("ViewProviders", name)
+            self.onlineDoc.mirror.digest.remove("Objects", name)
+            self.onlineDoc.mirror.digest.remove("ViewProviders", name)
+            
             #remove online object
             oobj = self.onlineDoc.objects[name]
             await oobj.close()
@@ -243,22 +273,26 @@ class OnlineObserver():
             self.logger.error(f"Object ({name}): Remove object online callback failed: {e}")
         
         
-    async def __cbChangeObject(self, name, prop, value):
+    async def __cbChangeObject(self, name, prop, value, trace = None):
         
         obj = self.onlineDoc.document.getObject(name)
         if obj is None:
             return
         
-        await self.__setProperty(obj, prop, value, f"Object ({name})")
+        self.onlineDoc.clearPending("Objects", name, [prop])
+        self.__record("Objects", name, [prop], [value])
+        await self.__setProperty(obj, prop, value, f"Object ({name})", trace)
         
         
-    async def __cbChangeMultiObject(self, name, props, values):
+    async def __cbChangeMultiObject(self, name, props, values, trace = None):
         
         obj = self.onlineDoc.document.getObject(name)
         if obj is None:
             return
         
-        await self.__setProperties(obj, props, values, f"Object ({name})")
+        self.onlineDoc.clearPending("Objects", name, props)
+        self.__record("Objects", name, props, values)
+        await self.__setProperties(obj, props, values, f"Object ({name})", trace)
  
  
     async def __cbChangePropStatus(self, name, prop, status):
@@ -298,9 +332,10 @@ class OnlineObserver():
                 return
             
             self.logger.debug(f"Object ({name}): Create dynamic properties {props}")
-            for i in range(0, len(props)):
-                info = infos[i]
-                Object.createDynamicProperty(obj, props[i], info["typeid"], info["group"], info["docu"], info["status"])
+            with Object.bulkApply(self.onlineDoc.document):
+                for i in range(0, len(props)):
+                    info = infos[i]
+                    Object.createDynamicProperty(obj, props[i], info["typeid"], info["group"], info["docu"], info["status"])
                 
         except Exception as e:
             self.logger.error(f"Dynamic properties adding failed: {e}")      
@@ -315,6 +350,7 @@ class OnlineObserver():
                 return
             
             self.logger.debug(f"Object ({name}): Remove dynamic property {prop}")
+            self.onlineDoc.mirror.digest.remove("Objects", name, prop)
             Object.removeDynamicProperty(obj, prop)
             
         except Exception as e:
@@ -396,22 +432,26 @@ class OnlineObserver():
             self.logger.error(f"Object ({name}): Version upgrade after setup failed: {e}")
 
        
-    async def __cbChangeViewProvider(self, name, prop, value):
+    async def __cbChangeViewProvider(self, name, prop, value, trace = None):
         
         obj = self.onlineDoc.document.getObject(name)
         if obj is None:
             return
  
-        await self.__setProperty(obj.ViewObject, prop, value, f"ViewProvider ({name})")
+        self.onlineDoc.clearPending("ViewProviders", name, [prop])
+        self.__record("ViewProviders", name, [prop], [value])
+        await self.__setProperty(obj.ViewObject, prop, value, f"ViewProvider ({name})", trace)
      
     
-    async def __cbChangeMultiViewProdiver(self, name, props, values):
+    async def __cbChangeMultiViewProdiver(self, name, props, values, trace = None):
         
         obj = self.onlineDoc.document.getObject(name)
         if obj is None:
             return
                
-        await self.__setProperties(obj.ViewObject, props, values, f"ViewProvider ({name})")
+        self.onlineDoc.clearPending("ViewProviders", name, props)
+        self.__record("ViewProviders", name, props, values)
+        await self.__setProperties(obj.ViewObject, props, values, f"ViewProvider ({name})", trace)
      
     
     async def __cbChangeViewProvierPropStatus(self, name, prop, status):
@@ -454,9 +494,10 @@ class OnlineObserver():
             
             self.logger.debug(f"ViewProvider ({name}): Add dynamic properties {props}")
             
-            for i in range(0, len(props)):
-                info = infos[i]
-                Object.createDynamicProperty(obj.ViewObject, props[i], info["typeid"], info["group"], info["docu"], info["status"])
+            with Object.bulkApply(self.onlineDoc.document):
+                for i in range(0, len(props)):
+                    info = infos[i]
+                    Object.createDynamicProperty(obj.ViewObject, props[i], info["typeid"], info["group"], info["docu"], info["status"])
                 
         except Exception as e:
             self.logger.error("Dynamic properties adding failed: {0}".format(e))
@@ -471,6 +512,7 @@ class OnlineObserver():
                 return
             
             self.logger.debug(f"ViewProvider ({name}): Remove dynamic property {prop}")
+            self.onlineDoc.mirror.digest.remove("ViewProviders", name, prop)
             Object.removeDynamicProperty(obj.ViewObject, prop)
         
         except Exception as e:
@@ -538,69 +580,36 @@ class OnlineObserver():
     #Internal functions for the online oberser
     #******************************************************************************************************************************************************
 
-    async def __getBinaryValues(self, values):
-        #checks all values for binary Cid's and fetches the real data to replace it with
-        
-        if not isinstance(values, list):
-            values = [values]
+    def __record(self, group, name, props, values):
+        # follows the node data in the digest. Values are still as transfered, binary data as cid
         
-        tasks = []
-        for index, value in enumerate(values):
+        for prop, value in zip(props, values):
+            self.onlineDoc.mirror.digest.set(group, name, prop, value)
             
-            if isinstance(value, str) and value.startswith("ocp_cid"):                   
-                
-                async def worker(index, cid):
-                    class Data():
-                        def __init__(self): 
-                            self.data = bytes()
-                                    
-                        def progress(self, update):
-                            self.data += bytes(update)
-                            
-                    #get the binary data
-                    uri = f"ocp.documents.{self.onlineDoc.id}.raw.BinaryByCid"
-                    dat = Data()
-                    opt = CallOptions(on_progress=dat.progress)
-                    result = await self.onlineDoc.connection.api.call(uri, cid, options=opt)
-                    if result is not None:
-                        dat.progress(result)
-                        
-                    values[index] = dat.data
-                    
-                tasks.append(worker(index, value))
-        
-        if tasks:
-            tasks = [asyncio.ensure_future(task) for task in tasks]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            exceptions = [i for i in results if isinstance(i, Exception)]
-            if exceptions:
-                self.logger.error(f"Getting binary data from node failed: {exceptions[0]}")
-                raise exceptions[0]
-        
-        if len(values) == 1:
-            return values[0]
-        return values
-
-
-    async def __setProperty(self, obj, prop,  value, logentry):
+    
+    async def __setProperty(self, obj, prop,  value, logentry, trace = None):
         
         try:                      
             self.logger.debug(f"{logentry}: Set property {prop}")
+            Tracing.stamp(trace, "remote")
             
-            value = await self.__getBinaryValues(value)
+            value = await self.onlineDoc.data.getBinaryValues(self.onlineDoc.id, value)
             Object.setProperty(obj, prop, value)
+            Tracing.stamp(trace, "apply")
 
         except Exception as e:
             self.logger.error(f"{logentry} Set property {prop} error: {e}")
     
     
-    async def __setProperties(self, obj, props, values, logentry):
+    async def __setProperties(self, obj, props, values, logentry, trace = None):
         
         try:      
             self.logger.debug(f"{logentry}: Set properties {props}")
+            Tracing.stamp(trace, "remote")
             
-            values = await self.__getBinaryValues(values)
+            values = await self.onlineDoc.data.getBinaryValues(self.onlineDoc.id, values)
             Object.setProperties(obj, props, values)
+            Tracing.stamp(trace, "apply")
            
         except Exception as e:
             self.logger.error(f"{logentry} Set properties {props} error: {e}")
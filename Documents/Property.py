@@ -24,6 +24,9 @@
 
 
 import FreeCAD as App
+import Documents.Version as Version
+import array, itertools, sys
+import Documents.Spill as Spill
 
 __typeToStatusMap__ = {
     "NoRecompute": 23,
@@ -38,14 +41,44 @@ __non_default_property_types__ = [
     "App::PropertyUUID"
 ]
 
+#static property information (docu, group, typeid) per (TypeId, property). The status is not part of it,
+#as it can change per object and at any time. Only static properties are cached: dynamic ones are per object, 
+#e.g. all FeaturePython objects share the TypeId but not their properties
+__informationCache__ = {}
+
+#status bit of dynamic properties (Property::PropDynamic), reported as integer by getPropertyStatus
+__dynamicStatus__ = 21
+
 def createInformation(obj, prop):
-    info = {}
-    info["docu"] = obj.getDocumentationOfProperty(prop)
-    info["group"] = obj.getGroupOfProperty(prop)
-    info["typeid"] = obj.getTypeIdOfProperty(prop)
+    
+    status = getStatus(obj, prop)
+    key = (obj.TypeId, prop)
+    info = __informationCache__.get(key, None)
+    if info is None:
+        info = {}
+        info["docu"] = obj.getDocumentationOfProperty(prop)
+        info["group"] = obj.getGroupOfProperty(prop)
+        info["typeid"] = obj.getTypeIdOfProperty(prop)
+        
+        #without status support dynamic properties cannot be detected
+        if Version.hasPropertyStatus and __dynamicStatus__ not in status:
+            __informationCache__[key] = info
+    
+    info = info.copy()
+    info["status"] = status
+       
+    return info
+
+
+def invalidateInformation(obj, prop):
+    #a static property is never added or removed, hence this only drops a wrongly cached entry
+    __informationCache__.pop((obj.TypeId, prop), None)
+
+
+def getStatus(obj, prop):
     
     status = []
-    if  float(".".join(App.Version()[0:2])) >= 0.19:
+    if Version.hasPropertyStatus:
         status = obj.getPropertyStatus(prop)
     else:
         #add the types (those are static status entries in >=0.19)
@@ -56,9 +89,7 @@ def createInformation(obj, prop):
         for edit in obj.getEditorMode(prop):
             status.append(edit)
 
-    info["status"] = status
-       
-    return info
+    return status
 
 def statusToType(status):
     #converts a status list, as returned by "getPropertyStatus", into a attribute bit list as used by property type
@@ -105,8 +136,9 @@ def convertWampToProperty(obj, prop, value):
         raise Exception(f"Property {prop} not available")
     
     #we do not set read-only properties
-    if  float(".".join(App.Version()[0:2])) >= 0.19:
-        if "Immutable" in obj.getPropertyStatus(prop) or 24 in obj.getPropertyStatus(prop):
+    if Version.hasPropertyStatus:
+        status = obj.getPropertyStatus(prop)
+        if "Immutable" in status or 24 in status:
             return
     else:
         if "ReadOnly" in obj.getTypeOfProperty(prop):
@@ -130,6 +162,57 @@ def getNonDefaultValueProperties(obj):
     return result
 
 
+# Numeric list properties are transfered as contiguous little endian buffers instead of FreeCADs XML dump.
+# The buffer starts with a header to detect the format, as well as the array typecode used. Values without 
+# the header are dumps (e.g. from older versions) and restored as such.
+# Note: this is a one way compatibility break. Documents written by older versions load fine, but older versions
+# cannot read the buffers and fail to restore these properties: all collaborators of a document need this version.
+__bufferHeader__ = b"OCPA\x01"
+__bufferTypecodes__ = ("d", "q", "f")
+__packChunk__ = 1024*64     # values converted at once
+
+def __pack(typecode, values):
+    # Converts the values chunkwise into the receiver, which spills large buffers to disk while they are written.
+    # Neither the full array nor the full buffer is ever held in memory
+    
+    receiver = Spill.Receiver()
+    receiver.progress(__bufferHeader__ + typecode.encode())
+    
+    values = iter(values)
+    while True:
+        data = array.array(typecode, itertools.islice(values, __packChunk__))
+        if not data:
+            break
+        if sys.byteorder == "big":
+            data.byteswap()
+        receiver.progress(data.tobytes())
+        
+    return receiver.result()
+
+
+def __unpack(value, typecode):
+    
+    view   = memoryview(value)
+    offset = len(__bufferHeader__)
+    if len(view) <= offset or view[:offset] != __bufferHeader__:
+        return None
+    
+    #the typecode is wire data: only accept the one used for the property type, with a matching size
+    received = chr(view[offset])
+    if received not in __bufferTypecodes__ or received != typecode:
+        raise Exception(f"Invalid typecode {received!r} in numeric buffer, expected {typecode!r}")
+
+    data = array.array(typecode)
+    if (len(view) - offset - 1) % data.itemsize:
+        raise Exception(f"Numeric buffer size does not match typecode {typecode!r}")
+    
+    data.frombytes(view[offset+1:])
+    if sys.byteorder == "big":
+        data.byteswap()
+        
+    return data
+
+
 def __toFloat(obj, prop):
     return float(obj.getPropertyByName(prop))
 
@@ -149,6 +232,20 @@ def __toString(obj, prop):
 def __toRaw(obj, prop):
    return obj.dumpPropertyContent(prop, Compression=9)
 
+def __toFloatBuffer(obj, prop):
+    return __pack("d", obj.getPropertyByName(prop))
+
+def __toIntegerBuffer(obj, prop):
+    return __pack("q", obj.getPropertyByName(prop))
+
+def __vectorsToBuffer(obj, prop):
+    #flattened x,y,z values of all vectors
+    return __pack("d", itertools.chain.from_iterable(obj.getPropertyByName(prop)))
+
+def __colorsToBuffer(obj, prop):
+    #flattened r,g,b,a values of all colors
+    return __pack("f", itertools.chain.from_iterable(obj.getPropertyByName(prop)))
+
 def __linkToString(obj, prop):
     linked = getattr(obj, prop)
     if not linked:
@@ -185,7 +282,11 @@ __PropertyToWamp = {
 "App::PropertyLink": __linkToString,
 "App::PropertyLinkChild": __linkToString,
 "App::PropertyLinkGlobal": __linkToString,
-"App::PropertyExpressionEngine": __toJson
+"App::PropertyExpressionEngine": __toJson,
+"App::PropertyFloatList": __toFloatBuffer,
+"App::PropertyIntegerList": __toIntegerBuffer,
+"App::PropertyVectorList": __vectorsToBuffer,
+"App::PropertyColorList": __colorsToBuffer
 }
 
 
@@ -197,6 +298,38 @@ def __fromRaw(obj, prop, value):
     return obj.restorePropertyContent(prop, value)
 
 
+def __floatsFromBuffer(obj, prop, value):
+    data = __unpack(value, "d")
+    if data is None:
+        return __fromRaw(obj, prop, value)
+    
+    setattr(obj, prop, data.tolist())
+
+
+def __integersFromBuffer(obj, prop, value):
+    data = __unpack(value, "q")
+    if data is None:
+        return __fromRaw(obj, prop, value)
+    
+    setattr(obj, prop, data.tolist())
+
+
+def __vectorsFromBuffer(obj, prop, value):
+    data = __unpack(value, "d")
+    if data is None:
+        return __fromRaw(obj, prop, value)
+    
+    setattr(obj, prop, list(zip(data[0::3], data[1::3], data[2::3])))
+
+
+def __colorsFromBuffer(obj, prop, value):
+    data = __unpack(value, "f")
+    if data is None:
+        return __fromRaw(obj, prop, value)
+    
+    setattr(obj, prop, list(zip(data[0::4], data[1::4], data[2::4], data[3::4])))
+
+
 def __fromLinkString(obj, prop, value):
     if value == "":
         setattr(obj, prop, None)
@@ -247,7 +380,11 @@ __PropertyFromWamp = {
 "App::PropertyLink": __fromLinkString,
 "App::PropertyLinkChild": __fromLinkString,
 "App::PropertyLinkGlobal": __fromLinkString,
-"App::PropertyExpressionEngine": __exprFromJson
+"App::PropertyExpressionEngine": __exprFromJson,
+"App::PropertyFloatList": __floatsFromBuffer,
+"App::PropertyIntegerList": __integersFromBuffer,
+"App::PropertyVectorList": __vectorsFromBuffer,
+"App::PropertyColorList": __colorsFromBuffer
 }
 
 #['App::PropertyBoolList', 'App::PropertyFloatList', 'App::PropertyFloatConstraint', 'App::PropertyQuantityConstraint', 'App::PropertyFrequency', 'App::PropertyVacuumPermittivity', 'App::PropertyInteger', 'App::PropertyIntegerConstraint', 'App::PropertyEnumeration', 'App::PropertyIntegerList', 'App::PropertyIntegerSet', 'App::PropertyMap', 'App::PropertyPersistentObject', 'App::PropertyFont', 'App::PropertyStringList',  'App::PropertyLinkHidden', 'App::PropertyLinkSub', 'App::PropertyLinkSubChild', 'App::PropertyLinkSubGlobal', 'App::PropertyLinkSubHidden', 'App::PropertyLinkList', 'App::PropertyLinkListChild', 'App::PropertyLinkListGlobal', 'App::PropertyLinkListHidden', 'App::PropertyLinkSubList', 'App::PropertyLinkSubListChild', 'App::PropertyLinkSubListGlobal', 'App::PropertyLinkSubListHidden', 'App::PropertyXLink', 'App::PropertyXLinkSub', 'App::PropertyXLinkSubList', 'App::PropertyXLinkList', 'App::PropertyMatrix', 'App::PropertyVector', 'App::PropertyVectorDistance', 'App::PropertyPosition', 'App::PropertyDirection', 'App::PropertyVectorList', 'App::PropertyPlacement', 'App::PropertyPlacementList', 'App::PropertyPlacementLink', 'App::PropertyColor', 'App::PropertyColorList', 'App::PropertyMaterial', 'App::PropertyMaterialList', ' 'App::PropertyFile', 'App::PropertyFileIncluded', 'App::PropertyPythonObject', 'App::PropertyExpressionEngine', 'Part::PropertyPartShape', 'Part::PropertyGeometryList', 'Part::PropertyShapeHistory', 'Part::PropertyFilletEdges', 'TechDraw::PropertyGeomFormatList', 'TechDraw::PropertyCenterLineList', 'TechDraw::PropertyCosmeticEdgeList', 'TechDraw::PropertyCosmeticVertexList', 'Mesh::PropertyNormalList', 'Mesh::PropertyCurvatureList', 'Mesh::PropertyMeshKernel', 'Fem::PropertyFemMesh', 'Fem::PropertyPostDataObject', 'Sketcher::PropertyConstraintList', 'Robot::PropertyTrajectory']
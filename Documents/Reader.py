@@ -19,8 +19,8 @@
 
 import asyncio, FreeCAD
 import Documents.Property as Property
+import Documents.Recovery as Recovery
 from Utils.Errorhandling import attachErrorData
-from autobahn.wamp.types  import CallOptions
 
 class OCPObjectReader():
     ''' Reads object data from the OCP node document
@@ -44,6 +44,7 @@ class OCPObjectReader():
         
         self.logger             = logger
         self.docId              = onlinedoc.id
+        self.data               = onlinedoc.data
         self.connection         = onlinedoc.connection
         self.name               = name
         self.objGroup           = fctype
@@ -51,7 +52,7 @@ class OCPObjectReader():
     async def isAvailable(self):
         try:
             uri = f"ocp.documents.{self.docId}.content.Document.{self.objGroup}.Has"
-            return await self.connection.api.call(uri, self.name)
+            return await Recovery.retry(self.connection.api.call, uri, self.name)
         except Exception as e:
             attachErrorData(e, "ocp_message", "Queriying availablitiy failed")
             raise e
@@ -62,7 +63,7 @@ class OCPObjectReader():
         
         try:
             uri = f"ocp.documents.{self.docId}.content.Document.{self.objGroup}.{self.name}.Properties.Keys"
-            return await self.connection.api.call(uri)
+            return await Recovery.retry(self.connection.api.call, uri)
         
         except Exception as e:
             attachErrorData(e, "ocp_message", "Fetching property list failed")
@@ -74,22 +75,23 @@ class OCPObjectReader():
         
         try:
             uri = f"ocp.documents.{self.docId}.content.Document.{self.objGroup}.{self.name}.Properties.{prop}.GetValue"
-            value = await self.connection.api.call(uri)
-            return await self.__getBinaryValues(value)
+            value = await Recovery.retry(self.connection.api.call, uri)
+            return await self.data.getBinaryValues(self.docId, value)
         
         except Exception as e:
             attachErrorData(e, "ocp_message", f"Reading property {prop} failed")
             raise e
     
     
-    async def properties(self,  props):
-        # reads all the properties and returns a list of values ordered like the properties
+    async def properties(self,  props, resolve = True):
+        # reads all the properties and returns a list of values ordered like the properties. If resolve is False
+        # binary data is not fetched and the values stay the "ocp_cid..." identifiers
         
         try:
             values = [None]*len(props)
             async def fetch(index, prop):
                 uri = f"ocp.documents.{self.docId}.content.Document.{self.objGroup}.{self.name}.Properties.{prop}.GetValue"
-                values[index] = await self.connection.api.call(uri)
+                values[index] = await Recovery.retry(self.connection.api.call, uri)
             
             tasks = []
             for i, prop in enumerate(props):
@@ -97,20 +99,36 @@ class OCPObjectReader():
                 
             if tasks:
                 await asyncio.gather(*tasks)
+            
+            if not resolve:
+                return values
                 
-            return await self.__getBinaryValues(values)
+            return await self.data.getBinaryValues(self.docId, values)
         
         except Exception as e:
             attachErrorData(e, "ocp_message", f"Reading properties {props} failed")
             raise e
     
     
+    async def resolve(self, values):
+        # fetches the binary data of all "ocp_cid..." identifiers in the values list. Returns a new list
+        
+        try:
+            if len(values) == 1:
+                return [await self.data.getBinaryValues(self.docId, values[0])]
+            return await self.data.getBinaryValues(self.docId, list(values))
+        
+        except Exception as e:
+            attachErrorData(e, "ocp_message", "Reading binary data failed")
+            raise e
+    
+    
     async def propertyInfo(self, prop):
         # returns the property info structure for given property
         
         try:
             uri = f"ocp.documents.{self.docId}.content.Document.{self.objGroup}.{self.name}.Properties.{prop}.GetInfo"
-            return await self.connection.api.call(uri)
+            return await Recovery.retry(self.connection.api.call, uri)
         
         except Exception as e:
             attachErrorData(e, "ocp_message", f"Reading property info for {prop} failed")
@@ -124,7 +142,7 @@ class OCPObjectReader():
             infos = [None]*len(props)
             async def fetch(index, prop):
                 uri = f"ocp.documents.{self.docId}.content.Document.{self.objGroup}.{self.name}.Properties.{prop}.GetInfo"
-                infos[index] = await self.connection.api.call(uri)
+                infos[index] = await Recovery.retry(self.connection.api.call, uri)
             
             tasks = []
             for i, prop in enumerate(props):
@@ -144,55 +162,9 @@ class OCPObjectReader():
         # returns all registered extensions
         try:
             uri = f"ocp.documents.{self.docId}.content.Document.{self.objGroup}.{self.name}.Extensions.GetAll"
-            return await self.connection.api.call(uri)
+            return await Recovery.retry(self.connection.api.call, uri)
         
         except Exception as e:
             attachErrorData(e, "ocp_message", "Fetching object extensions failed")
             raise e
-        
-        
-    # internal functions
-    # ****************************************+++
-    
-    async def __getBinaryValues(self, values):
-        # checks all values for binary Cid's and fetches the real data to replace it with
-        
-        if not isinstance(values, list):
-            values = [values]
-        
-        tasks = []
-        for index, value in enumerate(values):
-            
-            if isinstance(value, str) and value.startswith("ocp_cid"):                   
-                
-                async def worker(index, cid):
-                    class Data():
-                        def __init__(self): 
-                            self.data = bytes()
-                                    
-                        def progress(self, update):
-                            self.data += bytes(update)
-                            
-                    # get the binary data
-                    uri = f"ocp.documents.{self.docId}.raw.BinaryByCid"
-                    dat = Data()
-                    opt = CallOptions(on_progress=dat.progress)
-                    result = await self.connection.api.call(uri, cid, options=opt)
-                    if result is not None:
-                        dat.progress(result)
-                        
-                    values[index] = dat.data
-                    
-                tasks.append(worker(index, value))
-        
-        if tasks:
-            tasks = [asyncio.ensure_future(task) for task in tasks]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            exceptions = [i for i in results if isinstance(i, Exception)]
-            if exceptions:
-                self.logger.error(f"Getting binary data from node failed: {exceptions[0]}")
-                raise exceptions[0]
-        
-        if len(values) == 1:
-            return values[0]
-        return values
+
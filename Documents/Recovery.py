@@ -0,0 +1,119 @@
+# ************************************************************************
+# *   Copyright (c) Stefan Troeger (stefantroeger@gmx.net) 2021          *
+# *                                                                      *
+# *   This library is free software; you can redistribute it and/or      *
+# *   modify it under the terms of the GNU Library General Public        *
+# *   License as published by the Free Software Foundation; either       *
+# *   version 2 of the License, or (at your option) any later version.   *
+# *                                                                      *
+# *   This library  is distributed in the hope that it will be useful,   *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of     *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the      *
+# *   GNU Library General Public License for more details.               *
+# *                                                                      *
+# *   You should have received a copy of the GNU Library General Public  *
+# *   License along with this library; see the file COPYING.LIB. If not, *
+# *   write to the Free Software Foundation, Inc., 59 Temple Place,      *
+# *   Suite 330, Boston, MA  02111-1307, USA                             *
+# ************************************************************************
+
+# Classified recovery of failed node calls
+#
+# Failures are either transient (call timeouts, lost transports, OCP connection errors), where the same call may 
+# succeed a moment later, or permanent, where the node rejected the operation and repeating it does not help.
+# Idempotent calls are retried with exponential backoff on transient failures. Whatever still fails is handled by
+# the online objects: writes are queued again, and rejected ones are repaired by downloading the involved properties.
+# The Breaker limits how often an object does this, so a broken object cannot flood the node with recovery work.
+
+import asyncio, os, random, time
+from autobahn import wamp
+from Utils.Errorhandling import isOCPError, OCPErrorClass
+
+attempts = int(os.getenv('FC_OCP_RETRY_ATTEMPTS', "3"))
+delay    = float(os.getenv('FC_OCP_RETRY_DELAY', "0.1"))
+
+
+def isTransient(exception):
+    # True if the failed call may succeed when repeated
+    
+    if isinstance(exception, (asyncio.TimeoutError, wamp.TransportLost)):
+        return True
+    
+    if isinstance(exception, wamp.ApplicationError):
+        if exception.error == wamp.ApplicationError.CANCELED:
+            #the call timeout
+            return True
+        
+        return isOCPError(exception, errclass=OCPErrorClass.connection)
+    
+    return False
+
+
+async def retry(fnc, *args, **kwargs):
+    # Awaits the api call fnc(*args, **kwargs) and repeats it on transient failures, with exponentially growing and 
+    # jittered delays. Only to be used for idempotent calls: a timed out call may have been executed nevertheless
+    
+    for attempt in range(attempts):
+        try:
+            return await fnc(*args, **kwargs)
+        
+        except Exception as e:
+            if attempt >= attempts - 1 or not isTransient(e):
+                raise e
+            
+        await asyncio.sleep(delay * 2**attempt * random.uniform(0.5, 1.5))
+
+
+class Breaker():
+    # Circuit breaker and rate limit for the recovery of a single object.
+    # Recoveries are spaced at least "interval" seconds apart. If "threshold" failures happen within "window" seconds 
+    # the breaker opens and no recovery is done for "cooldown" seconds. Afterwards a single trial is allowed: if it 
+    # fails too the breaker opens again directly, on success it is closed.
+    
+    def __init__(self, threshold = 5, window = 60, cooldown = 30, interval = 1):
+        
+        self.threshold = threshold
+        self.window    = window
+        self.cooldown  = cooldown
+        self.interval  = interval
+        
+        self.__failures  = []
+        self.__openUntil = 0
+        self.__tripped   = False
+        self.__next      = 0
+        
+        
+    @property
+    def isOpen(self):
+        return time.monotonic() < self.__openUntil
+    
+    
+    def failure(self):
+        
+        now = time.monotonic()
+        if self.__tripped and now >= self.__openUntil:
+            #the trial after cooldown failed
+            self.__openUntil = now + self.cooldown
+            return
+        
+        self.__failures = [t for t in self.__failures if now - t < self.window]
+        self.__failures.append(now)
+        if len(self.__failures) >= self.threshold:
+            self.__failures.clear()
+            self.__tripped   = True
+            self.__openUntil = now + self.cooldown
+    
+    
+    def success(self):
+        self.__tripped = False
+        self.__failures.clear()
+        
+        
+    def schedule(self):
+        # Reserves the next recovery slot and returns the seconds to wait for it. If the breaker is open this is the 
+        # end of the cooldown
+        
+        now  = time.monotonic()
+        slot = max(now, self.__next, self.__openUntil)
+        self.__next = slot + self.interval
+        return slot - now
@@ -0,0 +1,375 @@
+# ************************************************************************
+# *   Copyright (c) Stefan Troeger (stefantroeger@gmx.net) 2021          *
+# *                                                                      *
+# *   This library is free software; you can redistribute it and/or      *
+# *   modify it under the terms of the GNU Library General Public        *
+# *   License as published by the Free Software Foundation; either       *
+# *   version 2 of the License, or (at your option) any later version.   *
+# *                                                                      *
+# *   This library  is distributed in the hope that it will be useful,   *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of     *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the      *
+# *   GNU Library General Public License for more details.               *
+# *                                                                      *
+# *   You should have received a copy of the GNU Library General Public  *
+# *   License along with this library; see the file COPYING.LIB. If not, *
+# *   write to the Free Software Foundation, Inc., 59 Temple Place,      *
+# *   Suite 330, Boston, MA  02111-1307, USA                             *
+# ************************************************************************
+
+# Local replica of node documents
+#
+# Documents in the replicate state are on the node but not open in FreeCAD. Opening one means loading it fully
+# from the node. The replica keeps the node data of such documents on disk instead, exactly as transfered: per
+# object the extensions, property values and infos (binary data as cid), the binary data itself by cid, and the
+# node versions the data belongs to. The versions are the watermark: a refresh requests only the objects whose
+# version changed since then, and events of the node document trigger refreshes while replicating.
+# Every object is stored in its own file together with its version, hence a refresh only writes the objects it
+# fetched or removed, and a broken file only costs fetching that object again.
+#
+# On open the replica is applied to the empty FreeCAD document and its versions are handed to the online
+# document as version mirror. The load hence only fetches what changed since the last refresh. Binary data missing
+# in the replica is marked as touched in the mirror and loaded as well.
+#
+# FC_OCP_REPLICA: "0" disabled (default), "1" replicate documents that were edited on this machine before,
+#                 "all" replicate every online document
+# Replica directory: FC_OCP_REPLICA_DIR, default "Collaboration/Replica" in the FreeCAD user data directory
+
+import FreeCAD
+import asyncio, copy, json, logging, os
+import Documents.Object as Object
+import Utils.Priority   as Priority
+from Documents.Reader          import OCPObjectReader
+from Documents.OnlineDocument  import VersionMirror
+from Utils.Errorhandling       import attachErrorData
+from autobahn.wamp.types       import SubscribeOptions
+
+mode = os.getenv("FC_OCP_REPLICA", "0")
+
+
+def directory():
+    path = os.getenv("FC_OCP_REPLICA_DIR", "")
+    if not path:
+        path = os.path.join(FreeCAD.getUserAppDataDir(), "Collaboration", "Replica")
+    return path
+
+
+def enabled(docId):
+    # checks if the document shall be replicated
+    
+    if mode == "all":
+        return True
+    if mode == "1":
+        return os.path.isdir(os.path.join(directory(), docId))
+    return False
+
+
+def mark(docId):
+    # remembers that the document was edited on this machine, which makes it replicated in mode "1"
+    
+    if mode == "1":
+        os.makedirs(os.path.join(directory(), docId), exist_ok=True)
+
+
+def _isCid(value):
+    return isinstance(value, str) and value.startswith("ocp_cid")
+
+
+class Replica():
+    ''' The node data of a single document, stored on disk. Provides the attributes the object reader expects 
+        from an online document '''
+    
+    _chunk = 32     # binary values fetched per call
+    
+    def __init__(self, docId, connection, dataservice, path = None):
+        
+        self.id         = docId
+        self.connection = connection
+        self.data       = dataservice
+        self.logger     = logging.getLogger("Replica " + docId[-5:])
+        self.path       = os.path.join(path or directory(), docId)
+        self.objects    = {"Objects": {}, "ViewProviders": {}}     # name: {"extensions": [...], "properties": {prop: [value, info]}}
+        self.mirror     = VersionMirror()
+        self.__changed  = set()     # (group, name) of the objects to write or remove on save
+        
+        os.makedirs(os.path.join(self.path, "blobs"), exist_ok=True)
+        for group in self.objects:
+            os.makedirs(os.path.join(self.path, group), exist_ok=True)
+        self.__load()
+    
+    
+    def __file(self, group, name):
+        return os.path.join(self.path, group, name + ".json")
+    
+    
+    def __load(self):
+        
+        for group, objects in self.objects.items():
+            for file in os.listdir(os.path.join(self.path, group)):
+                
+                name, ext = os.path.splitext(file)
+                if ext != ".json":
+                    # leftover of an interrupted save
+                    os.remove(os.path.join(self.path, group, file))
+                    continue
+                
+                try:
+                    with open(self.__file(group, name), "r") as f:
+                        state = json.load(f)
+                    entry, version = state["entry"], state["version"]
+                    
+                except Exception as e:
+                    # the object is not known anymore, the next refresh fetches it
+                    self.logger.warning(f"Discard unreadable replica of {name}: {e}")
+                    os.remove(self.__file(group, name))
+                    continue
+                
+                objects[name] = entry
+                self.mirror.versions[group][name] = version
+                for prop, (value, _) in entry["properties"].items():
+                    self.mirror.digest.set(group, name, prop, value)
+    
+    
+    def save(self):
+        # writes the objects that changed since the last save, and removes the files of removed ones
+        
+        for group, name in list(self.__changed):
+            
+            file  = self.__file(group, name)
+            entry = self.objects[group].get(name)
+            if entry is None:
+                if os.path.exists(file):
+                    os.remove(file)
+                self.__changed.discard((group, name))
+                continue
+            
+            version = self.mirror.versions[group].get(name)
+            if version is None:
+                # fetched by an interrupted refresh, stays unsaved till the version is known
+                continue
+            
+            with open(file + ".tmp", "w") as f:
+                json.dump({"entry": entry, "version": version}, f)
+            os.replace(file + ".tmp", file)
+            self.__changed.discard((group, name))
+    
+    
+    @Priority.inLane(Priority.Lane.Bulk)
+    async def refresh(self):
+        # fetches all node changes since the last refresh. Values may get newer than the stored versions when the
+        # node changes during the refresh, which is safe: the next refresh sees the new versions and fetches again
+        
+        uri = f"ocp.documents.{self.id}.content.Document."
+        for group in self.objects:
+            
+            changes = await self.connection.api.call(uri + group + ".GetChanges", self.mirror.known(group))
+            if not changes["objects"] and not changes["removed"]:
+                continue
+            
+            # removed and recreated objects are reported as changed too
+            changes["removed"] = [name for name in changes["removed"] if name not in changes["objects"]]
+            for name in changes["removed"]:
+                self.objects[group].pop(name, None)
+                self.__changed.add((group, name))
+            
+            tasks = [self.__fetch(group, name, self.mirror.divergent(group, name, change)) for name, change in changes["objects"].items()]
+            if tasks:
+                await asyncio.gather(*tasks)
+            
+            self.mirror.update(group, changes)
+            self.logger.debug(f"Refreshed {len(changes['objects'])} {group}, {len(changes['removed'])} removed")
+        
+        await self.__fetchBinaries()
+        self.save()
+    
+    
+    async def __fetch(self, group, name, props):
+        # reads the given properties of the node object, or everything if props is None
+        
+        reader = OCPObjectReader(name, group, self, self.logger)
+        full   = props is None
+        if full:
+            extensions, props = await asyncio.gather(reader.extensions(), reader.propertyList())
+            entry = {"extensions": extensions, "properties": {}}
+        else:
+            entry = self.objects[group].get(name, {"extensions": [], "properties": {}})
+        
+        values, infos = await asyncio.gather(reader.properties(props, resolve = False), reader.propertiesInfos(props))
+        
+        self.__changed.add((group, name))
+        if full:
+            self.mirror.digest.remove(group, name)
+        for prop, value, info in zip(props, values, infos):
+            entry["properties"][prop] = [value, info]
+            self.mirror.digest.set(group, name, prop, value)
+        
+        self.objects[group][name] = entry
+    
+    
+    async def __fetchBinaries(self):
+        # stores the binary data of all referenced cids, and removes the unreferenced ones
+        
+        cids = set()
+        for objects in self.objects.values():
+            for entry in objects.values():
+                cids.update(value for value, _ in entry["properties"].values() if _isCid(value))
+        
+        blobs   = os.path.join(self.path, "blobs")
+        stored  = set(os.listdir(blobs))
+        missing = list(cids - stored)
+        for cid in stored - cids:
+            os.remove(os.path.join(blobs, cid))
+        
+        for i in range(0, len(missing), Replica._chunk):
+            chunk = missing[i:i+Replica._chunk]
+            datas = await self.data.getBinaryValues(self.id, list(chunk))
+            if len(chunk) == 1:
+                datas = [datas]
+            
+            for cid, data in zip(chunk, datas):
+                with open(os.path.join(blobs, cid + ".tmp"), "wb") as f:
+                    f.write(data)
+                os.replace(os.path.join(blobs, cid + ".tmp"), os.path.join(blobs, cid))
+    
+    
+    def __blob(self, cid):
+        
+        try:
+            with open(os.path.join(self.path, "blobs", cid), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+    
+    
+    def apply(self, doc):
+        # Sets up the empty FreeCAD document from the replica and returns the version mirror describing it, or None
+        # if there is nothing replicated. 
+        # Note: Works without any node access, hence must be followed by a load with the mirror
+        
+        if not self.mirror.synced:
+            return None
+        
+        mirror = VersionMirror()
+        mirror.versions = copy.deepcopy(self.mirror.versions)
+        
+        try:
+            with Object.bulkApply(doc):
+                for name, entry in self.objects["Objects"].items():
+                    obj = doc.addObject(self.mirror.versions["Objects"][name][0], name)
+                    if obj.Name != name:
+                        raise Exception("Cannot setup object, name wrong")
+                    self.__applyObject(mirror, "Objects", name, obj, entry)
+                
+                for name, entry in self.objects["ViewProviders"].items():
+                    obj = doc.getObject(name)
+                    if obj is not None and getattr(obj, "ViewObject", None):
+                        self.__applyObject(mirror, "ViewProviders", name, obj.ViewObject, entry)
+        
+        except Exception as e:
+            # leave the document empty for a full load
+            with Object.bulkApply(doc):
+                for obj in doc.Objects:
+                    doc.removeObject(obj.Name)
+            
+            attachErrorData(e, "ocp_message", "Applying replica failed")
+            raise e
+        
+        self.logger.info(f"Applied {len(self.objects['Objects'])} replicated objects")
+        return mirror
+    
+    
+    def __applyObject(self, mirror, group, name, obj, entry):
+        # like the online objects download, but from the replica
+        
+        props = entry["properties"]
+        for extension in entry["extensions"]:
+            Object.createExtension(obj, extension)
+        
+        defProps = obj.PropertiesList
+        remove   = [prop for prop in defProps if prop not in props]
+        add      = [prop for prop in props if prop not in defProps]
+        if remove:
+            Object.removeDynamicProperties(obj, remove)
+        Object.createDynamicProperties(obj, add, [props[prop][1] for prop in add])
+        
+        writeProps  = []
+        writeValues = []
+        for prop, (value, _) in props.items():
+            mirror.digest.set(group, name, prop, value)
+            if _isCid(value):
+                value = self.__blob(value)
+                if value is None:
+                    # not yet replicated, the load fetches it
+                    mirror.touch(group, name, prop)
+                    continue
+            if value:
+                writeProps.append(prop)
+                writeValues.append(value)
+        
+        Object.setProperties(obj, writeProps, writeValues)
+        for prop in defProps:
+            if prop in props:
+                Object.setPropertyStatus(obj, prop, props[prop][1]["status"])
+
+
+class Replicator():
+    ''' Follows the node document while it is not open in FreeCAD: node events trigger a refresh of the replica.
+        Bursts of events are collected into a single refresh '''
+    
+    _delay = float(os.getenv("FC_OCP_REPLICA_DELAY", "2"))
+    
+    def __init__(self, replica):
+        
+        self.replica = replica
+        self.logger  = replica.logger
+        self.__dirty = asyncio.Event()
+        self.__task  = None
+    
+    
+    async def start(self):
+        
+        # the first refresh catches up with everything changed while not replicating
+        self.__dirty.set()
+        self.__task = asyncio.ensure_future(self.__run())
+        
+        try:
+            uri = f"ocp.documents.{self.replica.id}.content.Document"
+            await self.replica.connection.api.subscribe(f"replica {self.replica.id}", self.__onEvent, uri, 
+                                                        options=SubscribeOptions(match="prefix"))
+        except Exception as e:
+            self.logger.error(f"Subscribing to document events failed: {e}")
+    
+    
+    async def close(self):
+        
+        await self.replica.connection.api.closeKey(f"replica {self.replica.id}")
+        if self.__task:
+            self.__task.cancel()
+            try:
+                await self.__task
+            except asyncio.CancelledError:
+                pass
+            self.__task = None
+        
+        self.replica.save()
+    
+    
+    def __onEvent(self, *args, **kwargs):
+        self.__dirty.set()
+    
+    
+    async def __run(self):
+        
+        while True:
+            await self.__dirty.wait()
+            await asyncio.sleep(Replicator._delay)
+            self.__dirty.clear()
+            
+            try:
+                await self.replica.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # retried with the next event, or after the delay
+                self.logger.warning(f"Refresh failed: {e}")
+                self.__dirty.set()
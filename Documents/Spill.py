@@ -0,0 +1,99 @@
+# ************************************************************************
+# *   Copyright (c) Stefan Troeger (stefantroeger@gmx.net) 2021          *
+# *                                                                      *
+# *   This library is free software; you can redistribute it and/or      *
+# *   modify it under the terms of the GNU Library General Public        *
+# *   License as published by the Free Software Foundation; either       *
+# *   version 2 of the License, or (at your option) any later version.   *
+# *                                                                      *
+# *   This library  is distributed in the hope that it will be useful,   *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of     *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the      *
+# *   GNU Library General Public License for more details.               *
+# *                                                                      *
+# *   You should have received a copy of the GNU Library General Public  *
+# *   License along with this library; see the file COPYING.LIB. If not, *
+# *   write to the Free Software Foundation, Inc., 59 Temple Place,      *
+# *   Suite 330, Boston, MA  02111-1307, USA                             *
+# ************************************************************************
+
+# Spilling of large binary payloads to disk
+#
+# Binary property data above the threshold is written into an anonymous temporary file and accessed via mmap. 
+# The mmap supports the buffer protocol, hence it can be used everywhere bytes are used for reading (memoryview, 
+# FreeCADs restorePropertyContent, slicing). The pages are backed by the file and can be dropped by the OS 
+# anytime, which keeps the process memory bounded independent of the payload sizes. 
+# The file is removed from disk on creation, it vanishes as soon as the mmap is closed or collected.
+# Data produced or received in chunks is streamed into the file by the Receiver, and never held in memory completely.
+# spill() is for data that only exists as a whole already, like FreeCADs property dumps: it only shortens the time
+# the full data is kept in memory.
+
+import os, mmap, tempfile
+
+threshold = int(os.getenv('FC_OCP_SPILL_THRESHOLD', str(1024*1024*16)))
+
+
+def isBinary(data):
+    # checks if data is binary property data, in memory or spilled
+    return isinstance(data, (bytes, bytearray, mmap.mmap))
+
+
+def isSpilled(data):
+    return isinstance(data, mmap.mmap)
+
+
+def spill(data):
+    # Returns the data spilled to disk if above threshold, otherwise unchanged
+    
+    if isSpilled(data) or len(data) <= threshold:
+        return data
+    
+    with tempfile.TemporaryFile() as file:
+        file.write(data)
+        file.flush()
+        return mmap.mmap(file.fileno(), len(data), access=mmap.ACCESS_READ)
+
+
+def release(data):
+    # Frees the disk space of spilled data. If views of the data are still alive it is left to the garbage collector
+    
+    if isSpilled(data):
+        try:
+            data.close()
+        except BufferError:
+            pass
+
+
+class Receiver():
+    # Collects binary data received or produced in chunks. Chunks are kept in memory till the threshold is reached, 
+    # afterwards all data is written to a temporary file.
+    
+    def __init__(self):
+        self.__chunks = []
+        self.__size   = 0
+        self.__file   = None
+        
+    def progress(self, update):
+        
+        self.__size += len(update)
+        if self.__file:
+            self.__file.write(update)
+            return
+        
+        self.__chunks.append(update)
+        if self.__size > threshold:
+            self.__file = tempfile.TemporaryFile()
+            for chunk in self.__chunks:
+                self.__file.write(chunk)
+            self.__chunks.clear()
+    
+    def result(self):
+        # Returns the received data, bytes if small and mmap if spilled
+        
+        if not self.__file:
+            return b"".join(self.__chunks)
+        
+        self.__file.flush()
+        data = mmap.mmap(self.__file.fileno(), self.__size, access=mmap.ACCESS_READ)
+        self.__file.close()
+        return data
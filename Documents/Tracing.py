@@ -0,0 +1,136 @@
+# ************************************************************************
+# *   Copyright (c) Stefan Troeger (stefantroeger@gmx.net) 2021          *
+# *                                                                      *
+# *   This library is free software; you can redistribute it and/or      *
+# *   modify it under the terms of the GNU Library General Public        *
+# *   License as published by the Free Software Foundation; either       *
+# *   version 2 of the License, or (at your option) any later version.   *
+# *                                                                      *
+# *   This library  is distributed in the hope that it will be useful,   *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of     *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the      *
+# *   GNU Library General Public License for more details.               *
+# *                                                                      *
+# *   You should have received a copy of the GNU Library General Public  *
+# *   License along with this library; see the file COPYING.LIB. If not, *
+# *   write to the Free Software Foundation, Inc., 59 Temple Place,      *
+# *   Suite 330, Boston, MA  02111-1307, USA                             *
+# ************************************************************************
+
+# End-to-end tracing of property edits
+#
+# When enabled each property change gets a trace id, which travels with the write to the OCP node and is emitted
+# with the onDataChanged/onDatasChanged events. Every peer writes a timestamp per stage into its trace file:
+#
+#   observer - FreeCAD change observed          (sender)
+#   enqueue  - change task added to the runner  (sender)
+#   runner   - change task executed by runner   (sender)
+#   call     - WAMP write call issued           (sender)
+#   event    - node event received              (receiver)
+#   remote   - event callback executed by runner(receiver)
+#   apply    - value applied to FreeCAD object  (receiver)
+#
+# Enable by setting FC_OCP_TRACE to the trace file of the FreeCAD instance. The stage latencies of multiple peers
+# are aggregated with:
+#
+#   python Documents/Tracing.py peerA.trace peerB.trace
+#
+# Timestamps use the wall clock, hence peers on different machines need synchronized clocks.
+
+import os, sys, time, uuid, itertools, collections
+
+Stages = ["observer", "enqueue", "runner", "call", "event", "remote", "apply"]
+
+__path    = os.getenv("FC_OCP_TRACE", "")
+__file    = None
+__peer    = uuid.uuid4().hex[:8]
+__counter = itertools.count()
+
+enabled = bool(__path)
+
+
+def newTrace():
+    # returns a new, globally unique trace id
+    return f"{__peer}-{next(__counter)}"
+
+
+def combine(traces):
+    # multiple traces can be batched into a single write, they are send as single comma separated id
+    return ",".join(t for t in traces if t)
+
+
+def stamp(trace, stage):
+    # records the current time for the stage of the trace (or the combined traces)
+    global __file
+
+    if not enabled or not trace:
+        return
+
+    if __file is None:
+        __file = open(__path, "a", buffering=1)
+
+    now = time.time()
+    for single in trace.split(","):
+        __file.write(f"{single} {stage} {now:.6f}\n")
+
+
+# Aggregation
+# ********************************************************************************************
+
+def __percentile(values, p):
+    return values[min(len(values)-1, int(len(values)*p))]
+
+
+def aggregate(paths):
+    # Reads the trace files of all peers and returns {stage: [latencies]}, each latency measured from the
+    # previous stage. The "total" entry holds the complete observer to apply latency. Every receiving peer
+    # results in a separate sample.
+
+    stamps = collections.defaultdict(dict)   # (trace, path) -> {stage: time}
+    for path in paths:
+        with open(path) as file:
+            for line in file:
+                parts = line.split()
+                if len(parts) == 3:
+                    stamps[(parts[0], path)][parts[1]] = float(parts[2])
+
+    senders = {}
+    for (trace, path), stages in stamps.items():
+        if "observer" in stages:
+            senders[trace] = stages
+
+    latencies = collections.defaultdict(list)
+    for (trace, path), stages in stamps.items():
+        if "apply" not in stages or trace not in senders:
+            continue
+
+        timeline = dict(senders[trace])
+        timeline.update(stages)
+
+        last = None
+        for stage in Stages:
+            if stage in timeline:
+                if last:
+                    latencies[stage].append(timeline[stage] - timeline[last])
+                last = stage
+
+        latencies["total"].append(timeline["apply"] - timeline["observer"])
+
+    return latencies
+
+
+def report(paths):
+
+    latencies = aggregate(paths)
+    print(f"{'stage':<10}{'count':>8}{'p50 [ms]':>12}{'p95 [ms]':>12}{'p99 [ms]':>12}")
+    for stage in Stages[1:] + ["total"]:
+        values = sorted(latencies.get(stage, []))
+        if not values:
+            continue
+
+        p50, p95, p99 = (__percentile(values, p)*1000 for p in [0.5, 0.95, 0.99])
+        print(f"{stage:<10}{len(values):>8}{p50:>12.3f}{p95:>12.3f}{p99:>12.3f}")
+
+
+if __name__ == "__main__":
+    report(sys.argv[1:])
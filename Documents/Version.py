@@ -0,0 +1,34 @@
+# ************************************************************************
+# *   Copyright (c) Stefan Troeger (stefantroeger@gmx.net) 2021          *
+# *                                                                      *
+# *   This library is free software; you can redistribute it and/or      *
+# *   modify it under the terms of the GNU Library General Public        *
+# *   License as published by the Free Software Foundation; either       *
+# *   version 2 of the License, or (at your option) any later version.   *
+# *                                                                      *
+# *   This library  is distributed in the hope that it will be useful,   *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of     *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the      *
+# *   GNU Library General Public License for more details.               *
+# *                                                                      *
+# *   You should have received a copy of the GNU Library General Public  *
+# *   License along with this library; see the file COPYING.LIB. If not, *
+# *   write to the Free Software Foundation, Inc., 59 Temple Place,      *
+# *   Suite 330, Boston, MA  02111-1307, USA                             *
+# ************************************************************************
+
+# FreeCAD version capabilities
+#
+# The version cannot change while FreeCAD is running, hence all checks are evaluated once at import.
+# This keeps the version handling out of the hot paths (observer callbacks, property conversion)
+
+import FreeCAD
+
+# FreeCAD version as number, e.g. 0.19
+number = float(".".join(FreeCAD.Version()[0:2]))
+
+# 0.18 needs workarounds for missing observer events (extensions, viewprovider proxy, removing status)
+isFC018 = number == 0.18
+
+# >=0.19 supports the full property status API (get/setPropertyStatus, Removing, Immutable)
+hasPropertyStatus = number >= 0.19
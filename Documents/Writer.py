@@ -19,8 +19,16 @@
 
 import asyncio, FreeCAD
 import Documents.Property as Property
+import Documents.Version  as Version
+import Documents.Spill    as Spill
+import Documents.Tracing  as Tracing
+import Documents.Recovery as Recovery
+import Utils.Priority     as Priority
 from Utils.Errorhandling import attachErrorData
 
+# marks a property in the change cache whose value is read from the FreeCAD object when the changes are processed
+_Dirty = object()
+
 class OCPObjectWriter():
     ''' Writes object data to the OCP node document
     
@@ -53,19 +61,22 @@ class OCPObjectWriter():
         self.docId              = onlinedoc.id
         self.data               = onlinedoc.data
         self.connection         = onlinedoc.connection
+        self.digest             = onlinedoc.mirror.digest
         self.name               = name
         self.objGroup           = fctype
         self.dynPropCache       = {}
         self.statusPropCache    = {}
         self.propChangeCache    = {}
         self.propChangeInlist  = []
+        self.propChangeTraces   = []
+        self.propChangeObject   = None
         self.setupStage         = True
 
     
     async def isAvailable(self):
         try:
             uri = f"ocp.documents.{self.docId}.content.Document.{self.objGroup}.Has"
-            return await self.connection.api.call(uri, self.name)
+            return await Recovery.retry(self.connection.api.call, uri, self.name)
         except Exception as e:
             attachErrorData(e, "ocp_message", "Queriying availablitiy failed")
             raise e
@@ -138,6 +149,7 @@ class OCPObjectWriter():
             self.logger.debug(f"Remove property {prop}")
             uri = u"ocp.documents.{0}.content.Document.{1}.{2}.Properties.RemoveDynamicProperty".format(self.docId, self.objGroup, self.name)
             await self.connection.api.call(uri, prop)
+            self.digest.remove(self.objGroup, self.name, prop)
         
         except Exception as e:
             attachErrorData(e, "ocp_message", f"Removing property \"{prop}\" failed")
@@ -191,93 +203,144 @@ class OCPObjectWriter():
             
             uri = f"ocp.documents.{self.docId}.content.Document.{self.objGroup}.{self.name}.Properties."
             
-            if  float(".".join(FreeCAD.Version()[0:2])) >= 0.19:
+            if Version.hasPropertyStatus:
                 #0.19 directly supports status
                 if len(props) == 1:
                     self.logger.debug("Change property status {0}".format(keys[0]))
                     uri += keys[0] + ".status"
-                    await self.connection.api.call(uri, values[0])
+                    await Recovery.retry(self.connection.api.call, uri, values[0])
                 
                 else:
                     self.logger.debug("Change batched property status: {0}".format(keys))
                     uri += "SetStatus"
-                    failed = await self.connection.api.call(uri, keys, values)
+                    failed = await Recovery.retry(self.connection.api.call, uri, keys, values)
                     if failed:
+                        keys = failed
                         raise Exception(f"Properties {failed} failed")
             else:
                 #0.18 only supports editor mode subset of status
                 if len(props) == 1:
                     self.logger.debug("Change property status {0}".format(keys[0]))
                     uri += keys[0] + ".SetEditorMode"
-                    await self.connection.api.call(uri, values[0])
+                    await Recovery.retry(self.connection.api.call, uri, values[0])
                 
                 else:
                     self.logger.debug("Change batched property status: {0}".format(keys))
                     uri += "SetEditorModes"
-                    failed = await self.connection.api.call(uri, keys, values)
+                    failed = await Recovery.retry(self.connection.api.call, uri, keys, values)
                     if failed:
+                        keys = failed
                         raise Exception(f"Properties {failed} failed")
                 
         except Exception as e:
             attachErrorData(e, "ocp_message", "Change property status from cache failed")
+            attachErrorData(e, "ocp_properties", keys)
+            attachErrorData(e, "ocp_write", "status")
             raise e
             
     
-    def changeProperty(self, prop, value, inlist):        
+    def changeProperty(self, prop, value, inlist, trace = None):        
         # change a property to new value and outlist. Note: Value must be already in serializabe format
         # Not async as it will be batched by runner
+        # Large binary values are spilled to disk till they are uploaded
+        # The optional trace id is forwarded to the node with the write (see Tracing)
+        
+        if isinstance(value, bytearray):
+            # FreeCAD dumps only exist as a whole, they are spilled to keep them on disk till uploaded
+            value = Spill.spill(value)
         
+        Spill.release(self.propChangeCache.get(prop, None))
         self.propChangeCache[prop] = value
         self.propChangeInlist = inlist #we are only interested in the last set outlist, not intermediate steps
+        if trace:
+            self.propChangeTraces.append(trace)
     
     
-    async def __getCidForData(self, data):               
-        #store the data for the processing!
+    def markProperty(self, obj, prop, trace = None):
+        # marks the property of the FreeCAD object as changed. The value is only read and serialized when the 
+        # changes are processed, hence multiple changes till then cost a single serialization
+        # Not async as it will be batched by runner
         
-        #make the data available in the provider
-        uri = f"ocp.documents.{self.docId}.raw.CidByBinary"
-        if len(data) > self.data.chunksize:
-            datakey = self.data.addData(data)
-            cid = await self.connection.api.call(uri, self.data.uri, datakey)
-            
-        else:
-            cid = await self.connection.api.call(uri, data)
-
-        return cid
+        Spill.release(self.propChangeCache.get(prop, None))
+        self.propChangeCache[prop] = _Dirty
+        self.propChangeObject = obj
+        if trace:
+            self.propChangeTraces.append(trace)
+    
+    
+    def __readDirtyProperties(self, obj, props):
+        # serializes the current values of all marked properties. Properties removed in the meantime are skipped, as
+        # is everything if the object itself was removed: the remove tasks are already queued behind us
+        
+        try:
+            available = obj.PropertiesList
+        except Exception:
+            available = []
         
+        for prop in [p for p in props if props[p] is _Dirty]:
+            if prop not in available:
+                del props[prop]
+                continue
+            
+            props[prop] = Property.convertPropertyToWamp(obj, prop)
+    
     
     async def processPropertyChanges(self):
         # Process all property changes
                  
         if not self.propChangeCache:
             return
+        
+        #viewprovider changes are shed while the node connection is behind: we wait till we would get a session 
+        #before reading the values, so only the newest one is send. Changes queued meanwhile are coalesced by the batcher
+        if self.objGroup == "ViewProviders" and Priority.current() == Priority.Lane.ViewProvider:
+            await self.connection.api.waitForCapacity()
 
         #copy everything before first async op
         props = self.propChangeCache.copy()
         self.propChangeCache.clear()
         out = self.propChangeInlist.copy()
         self.propChangeInlist.clear()
+        trace = Tracing.combine(self.propChangeTraces)
+        self.propChangeTraces.clear()
+        
+        #read the values of marked properties, and the current inlist, as they are now
+        obj = self.propChangeObject
+        self.propChangeObject = None
+        if obj is not None:
+            self.__readDirtyProperties(obj, props)
+            if not props:
+                return
+            
+            if self.objGroup == "Objects":
+                try:
+                    out = [inObj.Name for inObj in obj.InList]
+                except Exception:
+                    pass
+        
         out.sort()
                
         try:
                 
-            #get the cids for the binary properties in parallel
+            #get the cids for all binary properties together
             tasks = []
-            for prop in props:
-                if isinstance(props[prop], bytearray): 
-                    
-                    async def run(props, prop):
-                        cid = await self.__getCidForData(props[prop])
+            binaries = [prop for prop in props if Spill.isBinary(props[prop])]
+            if binaries:
+                
+                async def run(props, binaries):
+                    cids = await self.data.getCidsForData(self.docId, [props[prop] for prop in binaries])
+                    for prop, cid in zip(binaries, cids):
                         props[prop] = cid
-                        
-                    tasks.append(run(props, prop))
+                    
+                tasks.append(run(props, binaries))
 
             #also in parallel: query the current outlist (to not update everytime a property changes)
             if self.objGroup == "Objects":
                 outlist = []
                 async def getInlist():
+                    nonlocal outlist
                     uri = f"ocp.documents.{self.docId}.content.Document.{self.objGroup}.{self.name}.dependencies"
-                    outlist = await self.connection.api.call(uri)
+                    outlist = await Recovery.retry(self.connection.api.call, uri)
                     if outlist:
                         outlist.sort()
                     
@@ -289,26 +352,41 @@ class OCPObjectWriter():
                 await asyncio.gather(*tasks)
             
             #now batchwrite all properties in correct order
+            Tracing.stamp(trace, "call")
             if len(props) == 1:
                 prop = list(props.keys())[0]
                 self.logger.debug(f"Write property {props}")
-                uri = f"ocp.documents.{self.docId}.content.Document.{self.objGroup}.{self.name}.Properties.{prop}.SetValue"
-                await self.connection.api.call(uri, list(props.values())[0])
+                uri = f"ocp.documents.{self.docId}.content.Document.{self.objGroup}.{self.name}.Properties.{prop}."
+                if trace:
+                    await Recovery.retry(self.connection.api.call, uri + "SetValueTraced", list(props.values())[0], trace)
+                else:
+                    await Recovery.retry(self.connection.api.call, uri + "SetValue", list(props.values())[0])
+                self.digest.set(self.objGroup, self.name, prop, props[prop])
                 self.logger.debug(f"Done writing property {prop}")
             else:
                 self.logger.debug(f"Write properties {list(props.keys())}")
-                uri = u"ocp.documents.{0}.content.Document.{1}.{2}.Properties.SetValues".format(self.docId, self.objGroup, self.name)
-                failed = await self.connection.api.call(uri, list(props.keys()), list(props.values()))
+                uri = u"ocp.documents.{0}.content.Document.{1}.{2}.Properties.".format(self.docId, self.objGroup, self.name)
+                if trace:
+                    failed = await Recovery.retry(self.connection.api.call, uri + "SetValuesTraced", list(props.keys()), list(props.values()), trace)
+                else:
+                    failed = await Recovery.retry(self.connection.api.call, uri + "SetValues", list(props.keys()), list(props.values()))
+                for prop in props:
+                    if prop not in failed:
+                        self.digest.set(self.objGroup, self.name, prop, props[prop])
                 if failed:
+                    #only the failed ones need recovery
+                    props = {prop: props[prop] for prop in failed if prop in props}
                     raise Exception(f"Properties {failed} failed")
 
             #finally process the outlist
             if self.objGroup == "Objects" and out != outlist:
                 uri = f"ocp.documents.{self.docId}.content.Document.{self.objGroup}.{self.name}.dependencies"
-                await self.connection.api.call(uri, out)
+                await Recovery.retry(self.connection.api.call, uri, out)
 
         except Exception as e:
             attachErrorData(e, "ocp_message", f"Batch writing properties {list(props.keys())} failed")
+            attachErrorData(e, "ocp_properties", list(props.keys()))
+            attachErrorData(e, "ocp_write", "value")
             raise e
         
         
@@ -326,7 +404,7 @@ class OCPObjectWriter():
                 await self.__createProperties(False, props, infos)
                 
         except Exception as e:
-            sattachErrorData(e, "ocp_message", "Adding extension failed")
+            attachErrorData(e, "ocp_message", "Adding extension failed")
             raise e
      
      
@@ -335,6 +413,7 @@ class OCPObjectWriter():
             self.logger.debug("Remove")
             uri = u"ocp.documents.{0}".format(self.docId)
             await self.connection.api.call(uri + u".content.Document.{0}.RemoveObject".format(self.objGroup), self.name)
+            self.digest.remove(self.objGroup, self.name)
         
         except Exception as e:
             attachErrorData(e, "ocp_message", "Removing of object failed")
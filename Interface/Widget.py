@@ -24,10 +24,13 @@ from Interface.AsyncSlotWidget import AsyncSlotPromoter
 from Interface.DocView import DocView
 from Interface.DocEdit import DocEdit
 from Interface.Installer import InstallView
+import Utils.Profiling as Profiling
 
 
 class UIWidget(QtWidgets.QFrame):
     
+    LogLevels = ["trace", "debug", "info", "warn", "error"]
+    
     def __init__(self):
         super().__init__()
         
@@ -97,7 +100,7 @@ class UIWidget(QtWidgets.QFrame):
         self.ui.docButton.clicked.connect(lambda c: self.ui.stack.setCurrentIndex(1))
         
         self.__onNodeRunningChanged()
-        self.__connection.node.logModelChanged.connect(lambda: self.ui.logsView.setModel(self.__connection.node.logModel))
+        self.__connection.node.logModelChanged.connect(self.__onLogModelChanged)
         self.__connection.node.runningChanged.connect(self.__onNodeRunningChanged)
         self.__connection.node.p2pUriChanged.connect(self.__listenDetailsUpdate)
         self.__connection.node.p2pPortChanged.connect(self.__listenDetailsUpdate)
@@ -115,6 +118,35 @@ class UIWidget(QtWidgets.QFrame):
         self.ui.reconnectCheckbox.setChecked(self.__connection.api.reconnect)
         self.ui.reconnectCheckbox.toggled.connect(self.__connection.api.setReconnect)
         
+        # performance recording: first click starts recording, second click dumps the report
+        self.ui.profileButton.toggled.connect(self.__onProfileToggled)
+        self.__onProfileChanged()
+        
+        # log search: the logs view shows the stored logs filtered by minimal level and message text
+        self.__logSearch = QtWidgets.QLineEdit(self.ui)
+        self.__logSearch.setPlaceholderText("Search logs")
+        self.__logSearch.setClearButtonEnabled(True)
+        self.__logLevel = QtWidgets.QComboBox(self.ui)
+        for i, level in enumerate(UIWidget.LogLevels):
+            self.__logLevel.addItem(f"{level} and above" if i else "all levels", UIWidget.LogLevels[i:] if i else None)
+        self.__logSearchTimer = QtCore.QTimer(self.ui)
+        self.__logSearchTimer.setSingleShot(True)
+        self.__logSearchTimer.setInterval(300)
+        self.__logSearchTimer.timeout.connect(self.__onLogFilterChanged)
+        self.__logSearch.textChanged.connect(self.__logSearchTimer.start)
+        self.__logLevel.currentIndexChanged.connect(self.__onLogFilterChanged)
+        
+        self.__logFilterBar = QtWidgets.QWidget(self.ui)
+        self.__logFilterBar.setVisible(False)
+        filterLayout = QtWidgets.QHBoxLayout(self.__logFilterBar)
+        filterLayout.setContentsMargins(0, 0, 0, 0)
+        filterLayout.addWidget(self.__logSearch)
+        filterLayout.addWidget(self.__logLevel)
+        logsLayout = self.ui.logsView.parentWidget().layout()
+        logsLayout.insertWidget(logsLayout.indexOf(self.ui.logsView), self.__logFilterBar)
+        self.ui.logsCheckbox.toggled.connect(self.__logFilterBar.setVisible)
+        self.__onLogModelChanged()
+        
         self.__onNetworkUpdates()
         self.__connection.network.peerCountChanged.connect(self.__onNetworkUpdates)
         self.__connection.network.nodeIdChanged.connect(self.__onNetworkUpdates)
@@ -229,6 +261,40 @@ class UIWidget(QtWidgets.QFrame):
         self.ui.apiPort.setText(self.__connection.node.apiPort)
         self.ui.apiUri.setText(self.__connection.node.apiUri)
      
+    @QtCore.Slot()
+    def __onLogModelChanged(self):
+        self.ui.logsView.setModel(self.__connection.node.logSearchModel)
+        self.__onLogFilterChanged()
+        
+    @QtCore.Slot()
+    def __onLogFilterChanged(self):
+        
+        model = self.__connection.node.logSearchModel
+        if model:
+            model.setFilter(levels=self.__logLevel.currentData(), text=self.__logSearch.text() or None)
+            self.ui.logsView.scrollToBottom()
+     
+    def __onProfileChanged(self):
+        self.ui.profileButton.blockSignals(True)
+        self.ui.profileButton.setChecked(Profiling.enabled)
+        self.ui.profileButton.setText("Dump perf report" if Profiling.enabled else "Record perf")
+        self.ui.profileButton.blockSignals(False)
+
+    @QtCore.Slot(bool)
+    def __onProfileToggled(self, checked):
+        
+        if checked:
+            Profiling.reset()
+            Profiling.startSampling()
+        else:
+            Profiling.stop()
+            path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save performance report", "ocp-perf.folded", 
+                                                            "Collapsed stacks (*.folded *.txt)")
+            if path:
+                Profiling.dump(path)
+                
+        self.__onProfileChanged()
+     
     @QtCore.Slot(str)
     def __onEdit(self, uuid):
         
@@ -24,6 +24,8 @@ import Utils.StateMachine as SM
 from Utils import Errorhandling
 from Manager.NodeDocument import NodeDocumentManager
 from Documents.OnlineDocument import OnlineDocument
+from Documents.Journal import Journal
+import Documents.Replica as Replica
 
 class Entity(SM.StateMachine, Errorhandling.OCPErrorHandler):
     ''' data structure describing a entity in the collaboration framework. A entity is a things that can be calloborated on, e.g.:
@@ -105,13 +107,17 @@ class Entity(SM.StateMachine, Errorhandling.OCPErrorHandler):
         self._dataservice  = dataservice
         self._id = None
         self._onlinedoc = None
+        self._journal = None
+        self._mirror = None     # node versions of the last sync, for incremental resync
+        self._replica = None    # local replica of the node document, only if replication is enabled
+        self._replicator = None
         self._manager = None
         self._blocker = eventblocker
         self.__collab_path = collab_path
 
         self.uuid       = str(uuid.uuid4())
         self.error      = None
-        self.fcdocument = None
+        self._fcdocument = None
         
         # startup transitions
         self.addTransition(Entity.States.Created, Entity.States.Local, Entity.Events._local)
@@ -175,7 +181,7 @@ class Entity(SM.StateMachine, Errorhandling.OCPErrorHandler):
                 self.processEvent(Entity.Events._local)
                 return
         if id:
-            self._id = id
+            self.id = id
             if self.__connection.api.connected:
                 self.processEvent(Entity.Events._node)
             else:
@@ -216,10 +222,11 @@ class Entity(SM.StateMachine, Errorhandling.OCPErrorHandler):
         
         try:
             dmlpath = os.path.join(self.__collab_path, "Dml")
-            self._id = await self.__connection.api.call(u"ocp.documents.create", dmlpath)
+            self.id = await self.__connection.api.call(u"ocp.documents.create", dmlpath)
             
             if not self._onlinedoc:
                 self._onlinedoc = OnlineDocument(self._id, self.fcdocument, self.__connection, self._dataservice)
+                self._mirror = self._onlinedoc.mirror
                 await self._onlinedoc.setup()
             
             # Load data into node
@@ -256,9 +263,21 @@ class Entity(SM.StateMachine, Errorhandling.OCPErrorHandler):
         except Exception as e:
             self._processException(e)
 
+    @SM.onEnter(States.Local.Disconnected)
+    def _startJournal(self):
+        # record all changes till we are connected again
+        try:
+            if not self._journal:
+                self._journal = Journal(self._id, self.fcdocument)
+        except Exception as e:
+            self._processException(e)
+
     @SM.transition(States.Local.Disconnected, States.Local.Internal, Events.close)
     def _closeDisconnectedDoc(self):
-        self._id = None
+        self.id = None
+        if self._journal:
+            self._journal.discard()
+            self._journal = None
 
     # Node substatus
     # ##############
@@ -340,10 +359,21 @@ class Entity(SM.StateMachine, Errorhandling.OCPErrorHandler):
         
         try:
             if not self._onlinedoc:
-                self._onlinedoc = OnlineDocument(self._id, self.fcdocument, self.__connection, self._dataservice)
+                self.__applyReplica()
+                self._onlinedoc = OnlineDocument(self._id, self.fcdocument, self.__connection, self._dataservice, self._mirror)
+                self._mirror = self._onlinedoc.mirror
                 await self._onlinedoc.setup()
             
+            # the node state overrides the local one, hence we need to capture the values of the offline changes before
+            snapshot = self._journal.capture() if self._journal else None
+            
             await self._onlinedoc.asyncLoad()
+            
+            if snapshot:
+                snapshot.replay(self._onlinedoc)
+                self._journal.discard()
+                self._journal = None
+                
             self.processEvent(Entity.Events._done)
                 
         except asyncio.CancelledError:
@@ -365,6 +395,51 @@ class Entity(SM.StateMachine, Errorhandling.OCPErrorHandler):
                 self.processEvent(Entity.Events._failed)
 
 
+    def __applyReplica(self):
+        # sets up the empty document from the replica, the load only fetches the changes since its last refresh
+        
+        replica = self._replica
+        self._replica = None
+        if not replica or replica.id != self._id or self._mirror is not None or self.fcdocument.Objects:
+            return
+        
+        try:
+            self._mirror = replica.apply(self.fcdocument)
+        except Exception as e:
+            # the document is empty again, the full load works without replica
+            self._processException(e)
+
+
+    @SM.onEnter(States.Node.Status.Online.Replicate)
+    async def _startReplica(self):
+        try:
+            if not Replica.enabled(self._id) or self._replicator:
+                return
+            
+            self._replica = Replica.Replica(self._id, self.__connection, self._dataservice)
+            self._replicator = Replica.Replicator(self._replica)
+            await self._replicator.start()
+        
+        except Exception as e:
+            self._processException(e)
+    
+    @SM.onExit(States.Node.Status.Online.Replicate)
+    async def _stopReplica(self):
+        try:
+            replicator = self._replicator
+            self._replicator = None
+            if replicator:
+                await replicator.close()
+        except Exception as e:
+            self._processException(e)
+    
+    @SM.onEnter(States.Node.Status.Online.Edit)
+    def _enterShared(self):
+        try:
+            Replica.mark(self._id)
+        except Exception as e:
+            self._processException(e)
+    
     @SM.onExit(States.Node.Status.Online.Edit)
     async def _exitShared(self):
         try:
@@ -389,7 +464,7 @@ class Entity(SM.StateMachine, Errorhandling.OCPErrorHandler):
                
         try:
             await self.__connection.api.call(u"ocp.documents.close", self._id)
-            self._id = None
+            self.id = None
             self.processEvent(Entity.Events._done)
        
         except asyncio.CancelledError:
@@ -404,6 +479,7 @@ class Entity(SM.StateMachine, Errorhandling.OCPErrorHandler):
     # #########################
  
     _onSpwanInvitedEntity = QtCore.Signal(str)
+    _keyChanged           = QtCore.Signal(str)   # "id" or "fcdocument" changed, used by manager lookup indexes
  
     @SM.onFinish
     async def _close(self):
@@ -412,6 +488,8 @@ class Entity(SM.StateMachine, Errorhandling.OCPErrorHandler):
                 await self._manager.close()
             if self._onlinedoc:
                 await self._onlinedoc._close()
+            if self._replicator:
+                await self._replicator.close()
         
         except Exception as e:
             self._processException(e)
@@ -419,6 +497,11 @@ class Entity(SM.StateMachine, Errorhandling.OCPErrorHandler):
         finally:
             self._manager = None
             self._onlinedoc = None
+            self._replicator = None
+            self._replica = None
+            if self._journal:
+                self._journal.close()
+                self._journal = None
     
     @property
     def node_document_manager(self):
@@ -438,6 +521,16 @@ class Entity(SM.StateMachine, Errorhandling.OCPErrorHandler):
 
         return self._onlinedoc
     
+    @property
+    def journal(self):
+        # the offline change journal, only available while the document is disconnected
+        
+        # if called in StateMachine __init__ we may not yet have it defined
+        if not hasattr(self, "_journal") or self._onlinedoc:
+            return None
+
+        return self._journal
+    
     @property
     def id(self):
         # if called in StateMachine __init__ we may not yet have it defined
@@ -446,6 +539,28 @@ class Entity(SM.StateMachine, Errorhandling.OCPErrorHandler):
 
         return self._id
     
+    @id.setter
+    def id(self, value):
+        if value != self._id:
+            self._id = value
+            self._mirror = None
+            self._keyChanged.emit("id")
+    
+    @property
+    def fcdocument(self):
+        # if called in StateMachine __init__ we may not yet have it defined
+        if not hasattr(self, "_fcdocument"):
+            return None
+
+        return self._fcdocument
+    
+    @fcdocument.setter
+    def fcdocument(self, doc):
+        if doc is not self._fcdocument:
+            self._fcdocument = doc
+            self._mirror = None
+            self._keyChanged.emit("fcdocument")
+    
     @property
     def status(self) -> str:
         # returns the the name of the currently active status
@@ -62,6 +62,7 @@ class Manager(QtCore.QObject, OCPErrorHandler):
         OCPErrorHandler.__init__(self)
         
         self.__entities = [] #empty list for all our document handling status, each doc is a map: {id, status, onlinedoc, doc}
+        self.__index    = {"id": {}, "fcdocument": {}, "uuid": {}} #lookup indexes for getEntity/hasEntity: key -> value -> entity
         self.__connection = None
         self.__collab_path = collab_path
         self._blockLocalEvents = False
@@ -101,10 +102,29 @@ class Manager(QtCore.QObject, OCPErrorHandler):
             attachErrorData(e, "ocp_message",  "Initalizing document manager failed")
             self._processException(e)
 
+    def _addEntity(self, entity):
+        
+        self.__entities.append(entity)
+        entity._keyChanged.connect(self.__reindex)
+        for key in self.__index:
+            self.__reindex(key)
+    
     def _removeEntity(self, entity):
         
         if entity in self.__entities:
             self.__entities.remove(entity)
+            for key in self.__index:
+                self.__reindex(key)
+    
+    def __reindex(self, key):
+        # rebuilds the lookup index for the given key. Only called on entity changes, which are rare compared to
+        # lookups. Like the linear search the first entity with a given value is found
+        
+        index = {}
+        for entity in reversed(self.__entities):
+            index[getattr(entity, key)] = entity
+            
+        self.__index[key] = index
             
     def _spawnOnlineEntity(self, docid):
         #spawns a new entity with the given id
@@ -112,7 +132,7 @@ class Manager(QtCore.QObject, OCPErrorHandler):
         entity = Entity(self.__connection, self.__dataservice, self.__collab_path, _EventBlocker(self))
         entity.finished.connect(lambda e=entity: self._removeEntity(e))
         entity._onSpwanInvitedEntity.connect(self._spawnOnlineEntity)
-        self.__entities.append(entity)
+        self._addEntity(entity)
         self.documentAdded.emit(entity.uuid)
         entity.start(id = docid)
     
@@ -137,7 +157,7 @@ class Manager(QtCore.QObject, OCPErrorHandler):
                         entity = Entity(self.__connection, self.__dataservice, self.__collab_path, _EventBlocker(self))
                         entity.finished.connect(lambda e=entity: self._removeEntity(e))
                         entity._onSpwanInvitedEntity.connect(self._spawnOnlineEntity)
-                        self.__entities.append(entity)
+                        self._addEntity(entity)
                         self.documentAdded.emit(entity.uuid)
                         
                         entity.start(id = doc)
@@ -149,7 +169,7 @@ class Manager(QtCore.QObject, OCPErrorHandler):
                         entity = Entity(self.__connection, self.__dataservice, self.__collab_path, _EventBlocker(self))     
                         entity.finished.connect(lambda e=entity: self._removeEntity(e))
                         entity._onSpwanInvitedEntity.connect(self._spawnOnlineEntity)
-                        self.__entities.append(entity)
+                        self._addEntity(entity)
                         self.documentAdded.emit(entity.uuid)
                         
                         entity.start(id = doc)
@@ -174,7 +194,7 @@ class Manager(QtCore.QObject, OCPErrorHandler):
         entity = Entity(self.__connection, self.__dataservice, self.__collab_path, _EventBlocker(self))
         entity.finished.connect(lambda e=entity: self._removeEntity(e))
         entity._onSpwanInvitedEntity.connect(self._spawnOnlineEntity)
-        self.__entities.append(entity)       
+        self._addEntity(entity)       
         self.documentAdded.emit(entity.uuid)
         
         # process the state change
@@ -207,7 +227,7 @@ class Manager(QtCore.QObject, OCPErrorHandler):
         entity = Entity(self.__connection, self.__dataservice, self.__collab_path, _EventBlocker(self))
         entity.finished.connect(lambda e=entity: self._removeEntity(e))
         entity._onSpwanInvitedEntity.connect(self._spawnOnlineEntity)
-        self.__entities.append(entity)
+        self._addEntity(entity)
         self.documentAdded.emit(entity.uuid)
         
         entity.start(id = id)
@@ -251,6 +271,9 @@ class Manager(QtCore.QObject, OCPErrorHandler):
     def getEntity(self, key, val):
         #returns the entity for the given key/value pair, e.g. "fcdoc":doc. Careful: if status is used
         #the first matching docmap is returned
+        if key in self.__index:
+            return self.__index[key].get(val, None)
+        
         for entity in self.__entities: 
             if getattr(entity, key) == val:
                 return entity
@@ -260,6 +283,9 @@ class Manager(QtCore.QObject, OCPErrorHandler):
     def hasEntity(self, key, val):
         #returns the entity for the given key/value pair, e.g. "fcdoc":doc. Careful: if status is used
         #the first matching docmap is returned
+        if key in self.__index:
+            return val in self.__index[key]
+        
         for entity in self.__entities: 
             if getattr(entity, key) == val:
                 return True
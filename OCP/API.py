@@ -20,12 +20,12 @@
 
 
 import asyncio, logging, uuid
-from asyncio.queues import Queue
 from autobahn.asyncio.component import Component
 from autobahn import wamp
 from PySide2 import QtCore
 from Qasync import asyncSlot
 import Utils
+import Utils.Priority as Priority
 import FreeCAD
 
 class _Session():
@@ -190,8 +190,7 @@ class API(QtCore.QObject, Utils.AsyncSlotObject):
 
         self.__id = uuid.uuid4()        
         self.__sessions = [_Session(self.__id, i, self.__onReady, self.__onLeave) for i in range(API._numSessions)]
-        self.__queue = Queue(API._numSessions)
-        self.__waiting = 0
+        self.__scheduler = Priority.Scheduler()
         
         self.__node = node
         self.__readyEvent = asyncio.Event()
@@ -259,34 +258,56 @@ class API(QtCore.QObject, Utils.AsyncSlotObject):
         for session in self.__sessions:
             await session.closeKey(key)
             
-    async def call(self, *args, **kwargs):
-        # calls api function
-                
-        if not self.connected:
-            raise Exception("Not connected to Node, cannot call API function")
-        
-        # get the next valid session. This means poping sessions until we get a connected one.
-        # Note: It can happen that we disconnect while waiting for a session. This means the queue 
-        # get emptied and we will wait forever. To prevent this, None object will be added to the queue
-        # in this event. Receiving this means we raise an "not connected error"           
-        
-        self.__waiting += 1
+    async def __acquire(self):
+        # get the next valid session for the current priority lane. This means taking sessions until we get a 
+        # connected one. 
+        # Note: It can happen that we disconnect while waiting for a session. This means no session will be released 
+        # anymore and we will wait forever. To prevent this, all waiters receive None in this event. Receiving this 
+        # means we raise an "not connected error"
         
-        session = await self.__queue.get()
+        session = await self.__scheduler.acquire()
         while session and not session.connected:
-            session = await self.__queue.get()
+            session = await self.__scheduler.acquire()
           
         if session is None:
             raise Exception("Not connected to Node, cannot call API function")
         
+        return session
+    
+    
+    async def call(self, *args, **kwargs):
+        # calls api function. Sessions are shared between the priority lanes by weighted round robin, the lane 
+        # is the one of the calling context
+                
+        if not self.connected:
+            raise Exception("Not connected to Node, cannot call API function")
+        
+        session = await self.__acquire()
         try:
-            self.__waiting -= 1
             result = await session.call(*args, **kwargs)
             return result
 
         finally:
             if session.connected:
-                self.__queue.put_nowait(session)
+                self.__scheduler.release(session)
+    
+    
+    @property
+    def behind(self):
+        # True if calls are waiting for a free session
+        return self.__scheduler.waiting > 0
+    
+    
+    async def waitForCapacity(self):
+        # returns as soon as the current lane would get a session. Allows low priority work to postpone reading its
+        # data till it can be send, which coalesces all changes that happen in the meantime
+        
+        if not self.behind:
+            return
+        
+        session = await self.__acquire()
+        if session.connected:
+            self.__scheduler.release(session)
  
             
     # Node callbacks
@@ -309,7 +330,10 @@ class API(QtCore.QObject, Utils.AsyncSlotObject):
     
     def __onReady(self, sessionidx):
        
-        self.__queue.put_nowait(self.__sessions[sessionidx])
+        # a reconnected session could still be stored as free slot from its last connection
+        session = self.__sessions[sessionidx]
+        self.__scheduler.discard(session)
+        self.__scheduler.release(session)
         
         if not self.__readyEvent.is_set():
             self.reconnected.emit()
@@ -332,9 +356,8 @@ class API(QtCore.QObject, Utils.AsyncSlotObject):
             self.disconnected.emit()
             self.connectedChanged.emit()
             
-            # close all waiting calls, as there will be no more sessions in the queue
-            for v in [None]*self.__waiting:
-                self.__queue.put_nowait(v)
+            # close all waiting calls, as there will be no more sessions released
+            self.__scheduler.cancelAll(None)
             
             self.__logger.info("WAMP API closed")
 
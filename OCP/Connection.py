@@ -40,6 +40,9 @@ class OCPConnection(QtCore.QObject):
         self.__node     = Node(self.__logger.getChild("Node"))
         self.__api      = API(self.__node, self.__logger.getChild("API"))
         self.__network  = Network(self.__api, self.__logger.getChild("Network"))
+        
+        # the node uses the API session state as liveness indicator
+        self.__api.connectedChanged.connect(lambda: self.__node.apiConnectionChanged(self.__api.connected))
     
     def start(self):
         self.__node.start()
@@ -0,0 +1,268 @@
+# ************************************************************************
+# *   Copyright (c) Stefan Troeger (stefantroeger@gmx.net) 2021          *
+# *                                                                      *
+# *   This library is free software; you can redistribute it and/or      *
+# *   modify it under the terms of the GNU Library General Public        *
+# *   License as published by the Free Software Foundation; either       *
+# *   version 2 of the License, or (at your option) any later version.   *
+# *                                                                      *
+# *   This library  is distributed in the hope that it will be useful,   *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of     *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the      *
+# *   GNU Library General Public License for more details.               *
+# *                                                                      *
+# *   You should have received a copy of the GNU Library General Public  *
+# *   License along with this library; see the file COPYING.LIB. If not, *
+# *   write to the Free Software Foundation, Inc., 59 Temple Place,      *
+# *   Suite 330, Boston, MA  02111-1307, USA                             *
+# ************************************************************************
+
+import os, json, sqlite3, tempfile, threading
+from PySide2 import QtCore
+
+
+class LogStore(QtCore.QObject):
+    # Stores node log entries in a SQLite database in a temporary directory. Entries are indexed by level, 
+    # module, document and time, and only the newest maxEntries are kept.
+    #
+    # Entries are added from the log reading worker thread, queries are done from the main thread. 
+    
+    def __init__(self, maxEntries = 1000000):
+        
+        QtCore.QObject.__init__(self)
+        
+        self.maxEntries = maxEntries
+        
+        self.__dir  = tempfile.TemporaryDirectory(prefix="ocp_logs_")
+        self.__lock = threading.Lock()
+        self.__db   = sqlite3.connect(os.path.join(self.__dir.name, "logs.db"), check_same_thread=False)
+        self.__db.executescript('''
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = OFF;
+            CREATE TABLE logs (id INTEGER PRIMARY KEY, time TEXT, level TEXT, module TEXT, document TEXT, message TEXT, data TEXT);
+            CREATE INDEX logs_level    ON logs (level);
+            CREATE INDEX logs_module   ON logs (module);
+            CREATE INDEX logs_document ON logs (document);
+            CREATE INDEX logs_time     ON logs (time);
+        ''')
+        self.__count = 0
+        self.__closed = False
+        
+    
+    def close(self):
+        # closes and removes the database. Entries added afterwards are dropped
+        
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+            self.__db.close()
+            
+        self.__dir.cleanup()
+    
+    
+    def add(self, entries):
+        # adds the parsed log entries. Can be called from any thread, emit "added" in the main thread afterwards
+        
+        rows = []
+        for entry in entries:
+            data = {key: value for key, value in entry.items() if not key.startswith("@")}
+            rows.append((entry.get("@timestamp", ""),
+                         entry.get("@level", ""),
+                         entry.get("@module", ""),
+                         str(data.get("document", "")),
+                         entry.get("@message", "").rstrip(),
+                         json.dumps(data)))
+        
+        if not rows:
+            return
+        
+        with self.__lock:
+            if self.__closed:
+                return
+            
+            self.__db.executemany("INSERT INTO logs (time, level, module, document, message, data) VALUES (?,?,?,?,?,?)", rows)
+            self.__count += len(rows)
+            
+            # retention: drop the oldest entries in larger steps to not delete on every insert
+            if self.__count > self.maxEntries * 1.1:
+                self.__db.execute("DELETE FROM logs WHERE id <= (SELECT MAX(id) FROM logs) - ?", (self.maxEntries,))
+                self.__count = self.__db.execute("SELECT COUNT(*) FROM logs").fetchone()[0]
+            
+            self.__db.commit()
+    
+    
+    def query(self, after, limit, levels=None, module=None, document=None, text=None):
+        # returns up to limit entries with id larger than after, matching all given filters, ordered by id
+        # Entries are (id, time, level, module, message, data)
+        
+        where, args = self.__where(levels, module, document, text)
+        sql = f"SELECT id, time, level, module, message, data FROM logs WHERE id > ?{where} ORDER BY id LIMIT ?"
+        
+        with self.__lock:
+            if self.__closed:
+                return []
+            return self.__db.execute(sql, [after] + args + [limit]).fetchall()
+    
+    
+    def latest(self, limit, levels=None, module=None, document=None, text=None):
+        # returns the newest limit entries matching all given filters, ordered by id
+        
+        where, args = self.__where(levels, module, document, text)
+        sql = f"SELECT id, time, level, module, message, data FROM logs WHERE 1{where} ORDER BY id DESC LIMIT ?"
+        
+        with self.__lock:
+            if self.__closed:
+                return []
+            rows = self.__db.execute(sql, args + [limit]).fetchall()
+            
+        rows.reverse()
+        return rows
+    
+    
+    def __where(self, levels, module, document, text):
+        # builds the sql conditions and arguments for the given filters
+        
+        sql  = ""
+        args = []
+        
+        if levels is not None:
+            sql += f" AND level IN ({','.join('?'*len(levels))})"
+            args += list(levels)
+        if module:
+            sql += " AND module = ?"
+            args.append(module)
+        if document:
+            sql += " AND document = ?"
+            args.append(document)
+        if text:
+            # the typed text is matched literally, not as LIKE pattern
+            escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            sql += " AND message LIKE ? ESCAPE '\\'"
+            args.append(f"%{escaped}%")
+            
+        return sql, args
+    
+    
+    def modules(self):
+        with self.__lock:
+            if self.__closed:
+                return []
+            return [row[0] for row in self.__db.execute("SELECT DISTINCT module FROM logs")]
+    
+    
+    # signal emitted after new entries are available
+    added = QtCore.Signal()
+    
+    
+class LogFilterModel(QtCore.QAbstractListModel):
+    # List model of the newest stored log entries matching the filter. The filtering is done by the store, the 
+    # model only holds a window of the newest WindowSize matching entries: new entries are appended and the oldest 
+    # rows removed. Older entries are found by narrowing the filter.
+    
+    RoleMessage = 1
+    RoleLevel = 2
+    RoleTime = 3
+    RoleModule = 4
+    RoleData = 5
+    
+    WindowSize = 2000
+    
+    def __init__(self, store):
+        super().__init__()
+        
+        self.__store   = store
+        self.__rows    = []
+        self.__times   = {}    # converted QDateTime per entry id, created on first access
+        self.__filter  = {}
+        
+        self.__store.added.connect(self.__onAdded)
+        self.__reload()
+    
+    
+    def setFilter(self, levels=None, module=None, document=None, text=None):
+        # sets the filter and reloads the model. None means no filtering for the given attribute
+        
+        self.__filter = {"levels": levels, "module": module, "document": document, "text": text}
+        self.__reload()
+        
+        
+    def __reload(self):
+        
+        self.beginResetModel()
+        self.__rows  = self.__store.latest(LogFilterModel.WindowSize, **self.__filter)
+        self.__times = {}
+        self.endResetModel()
+        
+        
+    def __onAdded(self):
+        
+        after = self.__rows[-1][0] if self.__rows else 0
+        rows  = self.__store.query(after, LogFilterModel.WindowSize, **self.__filter)
+        if not rows:
+            return
+        
+        if len(rows) == LogFilterModel.WindowSize:
+            # the new entries replace the whole window (and there may be even more)
+            self.__reload()
+            return
+        
+        overflow = len(self.__rows) + len(rows) - LogFilterModel.WindowSize
+        if overflow > 0:
+            self.beginRemoveRows(QtCore.QModelIndex(), 0, overflow - 1)
+            for row in self.__rows[:overflow]:
+                self.__times.pop(row[0], None)
+            del self.__rows[:overflow]
+            self.endRemoveRows()
+        
+        first = len(self.__rows)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(rows) - 1)
+        self.__rows += rows
+        self.endInsertRows()
+            
+            
+    #implementation of ListModel
+    #***************************
+    
+    def roleNames(self):
+        #return the QML accessible entries
+        
+        return {LogFilterModel.RoleLevel: QtCore.QByteArray(bytes("level", 'utf-8')),
+                LogFilterModel.RoleMessage: QtCore.QByteArray(bytes("message", 'utf-8')),
+                LogFilterModel.RoleTime: QtCore.QByteArray(bytes("time", 'utf-8')),
+                LogFilterModel.RoleModule: QtCore.QByteArray(bytes("module", 'utf-8')),
+                LogFilterModel.RoleData: QtCore.QByteArray(bytes("data", 'utf-8')),
+                QtCore.Qt.DisplayRole: QtCore.QByteArray(bytes("display", 'utf-8'))}
+    
+    def data(self, index, role):
+        #return the data for the given index and role
+        
+        id, time, level, module, message, data = self.__rows[index.row()]
+        
+        if role == LogFilterModel.RoleMessage:
+            return message
+        
+        if role == LogFilterModel.RoleLevel:
+            return level
+        
+        if role == LogFilterModel.RoleTime:
+            return self.__time(id, time)
+        
+        if role == LogFilterModel.RoleModule:
+            return module
+        
+        if role == LogFilterModel.RoleData:
+            return json.loads(data)
+        
+        if role == QtCore.Qt.DisplayRole:
+            return f"{self.__time(id, time).time().toString()} [{level}] {module}: {message}"
+        
+    def rowCount(self, index):
+        return len(self.__rows)
+    
+    def __time(self, id, time):
+        
+        if id not in self.__times:
+            self.__times[id] = QtCore.QDateTime.fromString(time, QtCore.Qt.ISODateWithMs)
+            
+        return self.__times[id]
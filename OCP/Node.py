@@ -18,30 +18,56 @@
 # ************************************************************************
 
 import ocp
-import os, sys, logging, asyncio, collections, json
-import aiofiles
-from aiofiles import os as aioos
+import os, sys, re, logging, asyncio, collections, json, time
 import Utils
 from Qasync import asyncSlot
+from OCP.LogStore import LogStore, LogFilterModel
 from PySide2 import QtCore
 
 class LogReader(QtCore.QAbstractListModel):
     # Reads log updates from rotating log file and makes it accessible as Qt List Model
+    #
+    # The file is watched for changes (inotify on linux) and new lines are read and parsed in a worker thread. 
+    # The lines read per tick are bounded, so that large updates do not block the event loop: remaining lines are 
+    # read in the next tick. 
+    # If a store is given all lines are additionally stored for searching, independent of the levels shown by the 
+    # model. Without a store lines with filtered levels are dropped before parsing. The model itself only keeps 
+    # the most recent lines.
     
     RoleMessage = 1
     RoleLevel = 2
     RoleTime = 3
     RoleModule = 4
-    RoleData = 5    
+    RoleData = 5
     
-    def __init__(self, logpath):
+    Levels = ["trace", "debug", "info", "warn", "error"]
+    LinesPerTick = 500
+    
+    __levelExpr = re.compile(rb'"@level":\s*"(\w+)"')
+    
+    def __init__(self, logpath, store = None):
         super().__init__()
         
         self.__path = logpath
-        self.__fileNo = os.stat(logpath).st_ino
+        self.__store = store
+        self.__file = None
+        self.__fileNo = None
         self.__lines = collections.deque(maxlen=100)
+        self.__levels = frozenset(LogReader.Levels)
         self.__shutdown = False
+        self.__closed = asyncio.Event()
         self.__task = None
+        self.__reading = False
+        self.__pending = False
+        
+        self.__watcher = QtCore.QFileSystemWatcher()
+        self.__watcher.fileChanged.connect(self.__onChange)
+        self.__watcher.directoryChanged.connect(self.__onChange)
+        
+        # not all file systems support change notifications, hence we additionally check from time to time
+        self.__timer = QtCore.QTimer()
+        self.__timer.setInterval(5000)
+        self.__timer.timeout.connect(self.__onChange)
     
     def taskRun(self):
         self.__task = asyncio.ensure_future(self.follow())
@@ -52,68 +78,164 @@ class LogReader(QtCore.QAbstractListModel):
     async def close(self):
         
         self.__shutdown = True
+        self.__closed.set()
+        self.__timer.stop()
+        
+        paths = self.__watcher.files() + self.__watcher.directories()
+        if paths:
+            self.__watcher.removePaths(paths)
         
         if self.__task:
             self.__task.cancel()
         
-        if self.__file:
-            await self.__file.close()
+        # if currently reading the file is closed after the worker finished
+        if self.__file and not self.__reading:
+            self.__file.close()
+            self.__file = None
+            
+    def setLevels(self, levels):
+        # only lines with the given levels are shown, used for all lines read afterwards. The store keeps all levels
+        self.__levels = frozenset(levels)
+        
+    def levels(self):
+        return list(self.__levels)
 
     async def follow(self):
         
-        await asyncio.sleep(1)
-        stat  = await aioos.stat(self.__path)
-        self.__file = await aiofiles.open(self.__path, "rb") # use rb to allow seek with offset from end
+        await asyncio.get_event_loop().run_in_executor(None, self.__open, True)
+        
+        self.__watcher.addPath(self.__path)
+        self.__watcher.addPath(os.path.dirname(self.__path))
+        self.__timer.start()
+        
+        await self.__read()
+        await self.__closed.wait()
+        
+        
+    def __onChange(self, *args):
+        if not self.__shutdown:
+            asyncio.ensure_future(self.__read())
+        
+        
+    async def __read(self):
+        # reads all new lines in bounded ticks. If called while reading, another round is done afterwards
+        
+        if self.__reading:
+            self.__pending = True
+            return
+        
+        self.__reading = True
+        try:
+            loop = asyncio.get_event_loop()
+            while not self.__shutdown:
+                
+                self.__pending = False
+                lines, stored, more = await loop.run_in_executor(None, self.__parse, LogReader.LinesPerTick, self.__levels)
+                self.__append(lines)
+                if stored:
+                    self.__store.added.emit()
+                
+                if not more and not self.__pending:
+                    break
+                
+            # the watcher drops the file if it was removed during rotation
+            if not self.__shutdown and self.__path not in self.__watcher.files() and os.path.isfile(self.__path):
+                self.__watcher.addPath(self.__path)
+                    
+        except Exception as e:
+            logging.getLogger("OCPNode").debug(f"Reading log file failed: {e}")
+            
+        finally:
+            self.__reading = False
+            if self.__shutdown and self.__file:
+                self.__file.close()
+                self.__file = None
+        
+        
+    def __open(self, initial):
+        # opens the log file, initially only the end of it is used. Runs in worker thread
+        
+        self.__file = open(self.__path, "rb")
+        self.__fileNo = os.fstat(self.__file.fileno()).st_ino
 
-        if stat.st_size > 10e3:
-            await self.__file.seek(int(-10e3), 2) # only use last 10kB
-            await self.__file.readline() # drop one line, as it is most likely truncated
+        if initial and os.fstat(self.__file.fileno()).st_size > 10e3:
+            self.__file.seek(int(-10e3), 2) # only use last 10kB
+            self.__file.readline() # drop one line, as it is most likely truncated
+    
+    
+    def __parse(self, maxLines, levels):
+        # Reads up to maxLines new lines, stores all of them and returns the ones with a level in levels. Returns 
+        # those lines, if any line was stored and if there may be more to read. Runs in worker thread
         
-        while True:
+        try:
+            # in case new file opened by rotating log provider
+            rotated = os.stat(self.__path).st_ino != self.__fileNo
+        except OSError:
+            # log file is currently rotated, the old one can still be read
+            rotated = False
+        
+        # the old file is read till its end before switching to the new one
+        lines, more = self.__readLines(maxLines, None if self.__store else levels, rotated)
+        if rotated and not more:
+            self.__file.close()
+            self.__open(False)
+            more = True
+        
+        if not self.__store:
+            return lines, False, more
+        
+        self.__store.add(lines)
+        return [line for line in lines if "@level" not in line or line["@level"] in levels], bool(lines), more
+    
+    
+    def __readLines(self, maxLines, levels, final):
+        # Reads up to maxLines lines from the current file. An incomplete last line is left for the next read,
+        # except for the final read of a rotated file, which is not written anymore. Levels None parses all lines
+        
+        lines = []
+        more  = True
+        for i in range(maxLines):
             
-            if self.__shutdown:
-                return
+            line = self.__file.readline()
+            if not line or (not line.endswith(b"\n") and not final):
+                # the line is still written (or nothing new), read it completely next time
+                self.__file.seek(-len(line), 1)
+                more = False
+                break
             
-            newlines = []
-            while True:
-                try:
-                    line = await self.__file.readline()
-                    if not line:
-                        break
-                    
-                    try:
-                        newlines.append(json.loads(line))
-                    except:
-                        # not json,  parse the printed line
-                        pass
-                                   
-                except Exception as e:
-                    break
-                        
-            if newlines:
-                # we do this here to not emit the signal on every new line. This is rather slow 
-                # if we have a large log file
-                self.layoutAboutToBeChanged.emit()
-                self.__lines += newlines
-                self.layoutChanged.emit()
-
-            try:
-                if self.__shutdown:
-                    return
+            match = LogReader.__levelExpr.search(line)
+            if levels is not None and match and match.group(1).decode() not in levels:
+                continue
             
-                #in case new file opened by rotating log provider
-                if os.stat(self.__path).st_ino != self.__fileNo:
-                    new = aiofiles.open(self.__path, "r")
-                    await self.__file.close()
-                    self.__file =new
-                    self.__fileNo = os.stat(self.__path).st_ino
-                    continue
-                else:
-                    await asyncio.sleep(2)
-                
-            except IOError:
-                await asyncio.sleep(2)
+            try:
+                lines.append(json.loads(line))
+            except ValueError:
+                # not json, ignore the printed line
                 pass
+            
+        return lines, more
+    
+    
+    def __append(self, lines):
+        # adds the lines to the model, removing the oldest ones if the maximal size is reached
+        
+        if not lines:
+            return
+        
+        maxlen = self.__lines.maxlen
+        lines = lines[-maxlen:]
+        
+        overflow = len(self.__lines) + len(lines) - maxlen
+        if overflow > 0:
+            self.beginRemoveRows(QtCore.QModelIndex(), 0, overflow-1)
+            for i in range(overflow):
+                self.__lines.popleft()
+            self.endRemoveRows()
+        
+        first = len(self.__lines)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(lines) - 1)
+        self.__lines.extend(lines)
+        self.endInsertRows()
 
 
     #implementation of ListModel
@@ -202,9 +324,19 @@ class Node(QtCore.QObject, Utils.AsyncSlotObject):
         self.__poll      = asyncio.ensure_future(self.__updateLoop())
         self.__logFile   = ""
         self.__logReader = None
+        self.__logStore  = None
+        self.__logSearch = None
         self.__logger    = logger
         self.__task      = None
         
+        # the WAMP session state tells if the node is running, the node is only probed without a session
+        self.__apiConnected   = False
+        self.__sessionChanged = asyncio.Event()
+        
+        # cached node config: read once and only refreshed if the config files change
+        self.__configCache     = {}
+        self.__configSignature = None
+        
         # Qt property storage
         self.__running   = False
         self.__p2pPort   = 0
@@ -222,23 +354,44 @@ class Node(QtCore.QObject, Utils.AsyncSlotObject):
     
     
     def stop(self):
-        # stops the node processing
+        # stops the node processing and the log handling, the stored logs are removed
         
         if self.__task and not self.__task.done():
             self.__task.cancel()
             
         self.__task = None
+        
+        if self.__logReader:
+            asyncio.ensure_future(self.__logReader.close())
+            self.__logReader = None
+            
+        if self.__logStore:
+            self.__logStore.close()
+            self.__logStore  = None
+            self.__logSearch = None
+            
+        self.logModelChanged.emit()
                       
         
     async def __startLogging(self):
         # open logfile if available
-        dir = await self.__fetchConfig("directory", self.running)  
+        dir = (await self.__nodeConfig())["directory"]
         self.__logFile   = os.path.join(dir, "Logs",  "ocp.log")
         if os.path.isfile(self.__logFile) and not self.__logReader:
-                self.__logReader = LogReader(self.__logFile)
+                self.__logReader = LogReader(self.__logFile, self.__createLogStore())
                 self.logModelChanged.emit()
                 await self.__logReader.blockRun()
 
+    def __createLogStore(self):
+        # all node logs are stored for searching, the number of kept entries is configurable
+        
+        if not self.__logStore:
+            self.__logStore  = LogStore(int(os.getenv('FC_OCP_LOG_RETENTION', "1000000")))
+            self.__logSearch = LogFilterModel(self.__logStore)
+            
+        return self.__logStore
+    
+
     async def run(self):
         # handles the full setup process till a OCP node is running       
         
@@ -295,14 +448,10 @@ class Node(QtCore.QObject, Utils.AsyncSlotObject):
                 raise Exception("Unable to initialize OCP node:", out.decode())
 
 
-    async def __fetchConfig(self, conf, online):
-        # returns the port the OCP node is listening on for WAMP connection
+    async def __fetchConfig(self, conf):
+        # returns the config value from the OCP node CLI
         
-        args = self.__ocp + ' config '
-        if online: 
-            args += '-o '
-            
-        args += conf
+        args = self.__ocp + ' config ' + conf
         
         if self.__test:
             args += " --config " + self.__conf
@@ -315,11 +464,108 @@ class Node(QtCore.QObject, Utils.AsyncSlotObject):
        
         if not out:
             raise Exception("Unable to receive config from OCP node")
-               
-        if "No node is currently running" in out.decode():
-            raise Exception("No node running: cannot read online config")
 
         return out.decode().rstrip()
+    
+    
+    def __configFiles(self):
+        # the files the node reads its config from. Only those are checked, the node directory also contains
+        # often written files like logs and the datastore
+        
+        if self.__test:
+            return [self.__conf]
+        
+        directory = self.__configCache.get("directory", None)
+        if not directory:
+            return []
+        
+        try:
+            with os.scandir(directory) as entries:
+                return sorted(entry.path for entry in entries if entry.is_file() and entry.name.startswith("config"))
+        except OSError:
+            return []
+    
+    
+    def __currentConfigSignature(self):
+        # The config only depends on the config files. Checking their modification time is cheap compared to 
+        # reading them or a CLI call
+        
+        signature = []
+        for path in self.__configFiles():
+            try:
+                signature.append((path, os.stat(path).st_mtime))
+            except OSError:
+                signature.append((path, None))
+            
+        return tuple(signature)
+    
+    
+    def __readConfigFile(self, keys):
+        # reads the config values from the nodes json config file, dotted keys are nested dicts. Returns None if 
+        # the file cannot be read or misses any key
+        
+        for path in self.__configFiles():
+            if not path.endswith(".json"):
+                continue
+            
+            try:
+                with open(path, "r") as f:
+                    content = json.load(f)
+                
+                values = {}
+                for key in keys:
+                    value = content.get(key, None) if isinstance(content, dict) else None
+                    if value is None:
+                        value = content
+                        for part in key.split("."):
+                            value = value[part]
+                    values[key] = str(value)
+                
+                return values
+            
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+            
+        return None
+    
+    
+    async def __nodeConfig(self):
+        # returns the node config as dict, read only if the config files changed since the last read. The node 
+        # directory is asked from the CLI once, the config values are read from its config file. The CLI is only
+        # used for them if the file is not readable
+        
+        if self.__configCache and self.__currentConfigSignature() == self.__configSignature:
+            return self.__configCache
+        
+        start = time.monotonic()
+        try:
+            directory = self.__configCache.get("directory", None)
+            if not directory:
+                directory = await self.__fetchConfig("directory")
+                self.__configCache = {"directory": directory}
+            
+            keys = ["p2p.port", "p2p.uri", "api.port", "api.uri"]
+            config = self.__readConfigFile(keys)
+            if config is None:
+                values = await asyncio.gather(*[self.__fetchConfig(key) for key in keys])
+                config = dict(zip(keys, values))
+        
+        except Exception as e:
+            # a partial cache would be taken as valid config
+            self.__invalidateConfig()
+            raise e
+        
+        config["directory"]    = directory
+        self.__configCache     = config
+        self.__configSignature = self.__currentConfigSignature()
+        self.__logger.debug(f"Read node config in {time.monotonic() - start:.3f}s")
+        
+        return self.__configCache
+    
+    
+    def __invalidateConfig(self):
+        self.__configCache     = {}
+        self.__configSignature = None
         
         
     async def __start(self):
@@ -335,10 +581,10 @@ class Node(QtCore.QObject, Utils.AsyncSlotObject):
             #and wait till setup fully
             try:
                 async def indicator():
-                    while True:
-                        await asyncio.sleep(0.5)
-                        if await self.__checkRunning():
-                            return                         
+                    delay = 0.05
+                    while not await self.__checkRunning():
+                        await asyncio.sleep(delay)
+                        delay = min(delay*2, 1)
             
                 await asyncio.wait_for(indicator(), timeout = 10)             
                 
@@ -348,10 +594,10 @@ class Node(QtCore.QObject, Utils.AsyncSlotObject):
         # setup logging if required
         if not self.__logReader and os.path.isfile(self.__logFile):
             #setup logging
-            dir = await self.__fetchConfig("directory", True)
+            dir = (await self.__nodeConfig())["directory"]
             self.__logFile   = os.path.join(dir, "Logs",  "ocp.log")
             if os.path.isfile(self.__logFile) and not self.__logReader:
-                self.__logReader = LogReader(self.__logFile)
+                self.__logReader = LogReader(self.__logFile, self.__createLogStore())
                 self.__logReader.taskRun()
                 self.logModelChanged.emit()
 
@@ -361,7 +607,44 @@ class Node(QtCore.QObject, Utils.AsyncSlotObject):
               
     
     async def __checkRunning(self):
-        # returns if a OCP node is running
+        # returns if a OCP node is running. A connected API session means it is, otherwise the node is probed on 
+        # its API port, which does not need to spawn a CLI process. The CLI is only asked if the API config is 
+        # unknown and cannot be read
+        
+        if self.__apiConnected:
+            return True
+        
+        if not self.__configCache:
+            try:
+                await self.__nodeConfig()
+            except Exception:
+                return await self.__checkRunningCLI()
+        
+        return await self.__probeAPI()
+    
+    
+    async def __probeAPI(self):
+        # returns if the node accepts connections on its API port
+        
+        try:
+            connection = asyncio.open_connection(self.__configCache["api.uri"], int(self.__configCache["api.port"]))
+            reader, writer = await asyncio.wait_for(connection, timeout=0.5)
+            
+        except (OSError, ValueError, asyncio.TimeoutError):
+            return False
+        
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            # the probe succeeded already, failures while closing do not matter
+            pass
+        
+        return True
+    
+    
+    async def __checkRunningCLI(self):
+        # returns if a OCP node is running by asking the CLI
         
         args = self.__ocp
         if self.__test:
@@ -384,23 +667,24 @@ class Node(QtCore.QObject, Utils.AsyncSlotObject):
         try:
             # we need to check if the node is running at the beginning, to get correct config data
             running = await self.__checkRunning()
+            config  = await self.__nodeConfig()
             
-            p2pPort = await self.__fetchConfig("p2p.port", running)
+            p2pPort = config["p2p.port"]
             if self.__p2pPort != p2pPort:
                 self.__p2pPort = p2pPort
                 self.p2pPortChanged.emit()
                 
-            p2pUri  = await self.__fetchConfig("p2p.uri", running)
+            p2pUri  = config["p2p.uri"]
             if self.__p2pUri != p2pUri:
                 self.__p2pUri = p2pUri
                 self.p2pUriChanged.emit()
                 
-            apiPort = await self.__fetchConfig("api.port", running)
+            apiPort = config["api.port"]
             if self.__apiPort != apiPort:
                 self.__apiPort = apiPort
                 self.apiPortChanged.emit()
                 
-            apiUri  = await self.__fetchConfig("api.uri", running)
+            apiUri  = config["api.uri"]
             if self.__apiUri != apiUri:
                 self.__apiUri = apiUri
                 self.apiUriChanged.emit()
@@ -417,13 +701,45 @@ class Node(QtCore.QObject, Utils.AsyncSlotObject):
         
     
     async def __updateLoop(self):
+        # Updates after each change of the API session state. While connected nothing else is needed, without a
+        # session the node is probed with growing intervals to detect a node started outside
+        
+        delay = 1
         while True:
             try:
-                await asyncio.sleep(5)
+                if self.__apiConnected:
+                    await self.__sessionChanged.wait()
+                else:
+                    try:
+                        await asyncio.wait_for(self.__sessionChanged.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                
+                if self.__sessionChanged.is_set():
+                    self.__sessionChanged.clear()
+                    delay = 1
+                else:
+                    delay = min(delay*2, 30)
+                
                 await self.__update()
+                
+            except asyncio.CancelledError:
+                raise
             except:
                 pass
     
+    
+    def apiConnectionChanged(self, connected):
+        # The WAMP session state is the fastest indicator of node changes. A connected API means the node is
+        # running, a lost connection means we need to check immediately
+        
+        self.__apiConnected = connected
+        self.__sessionChanged.set()
+        
+        if connected and not self.__running:
+            self.__running = True
+            self.runningChanged.emit()
+    
 
     # Qt Property/Signal API used from the UI
     # ********************************************************************************************
@@ -460,6 +776,10 @@ class Node(QtCore.QObject, Utils.AsyncSlotObject):
     @QtCore.Property(QtCore.QObject, notify=logModelChanged)
     def logModel(self):
         return self.__logReader
+    
+    @QtCore.Property(QtCore.QObject, notify=logModelChanged)
+    def logSearchModel(self):
+        return self.__logSearch
 
     @Utils.AsyncSlot()
     async def toggleRunningSlot(self):
@@ -469,7 +789,8 @@ class Node(QtCore.QObject, Utils.AsyncSlotObject):
             await self.run()
     
     @Utils.AsyncSlot()
-    async def updateDetails(self):        
+    async def updateDetails(self):
+        self.__invalidateConfig()
         await self.__update()        
 
     @Utils.AsyncSlot(str, str)
@@ -491,6 +812,9 @@ class Node(QtCore.QObject, Utils.AsyncSlotObject):
          
         process = await asyncio.create_subprocess_shell(args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
         await process.wait()
+        
+        self.__invalidateConfig()
+        await self.__update()
 
     
     @Utils.AsyncSlot(str, str)
@@ -513,3 +837,6 @@ class Node(QtCore.QObject, Utils.AsyncSlotObject):
         process = await asyncio.create_subprocess_shell(args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
         await process.wait()
         
+        self.__invalidateConfig()
+        await self.__update()
+        
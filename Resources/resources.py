@@ -1546,217 +1546,219 @@ m\x8d\xc3\xbf\xf7\xd8\xa5{\xa6r\xfb\x9f\xdc\xf2B'\
 \x8e\x91\xac\xb4\xb5\x19\xff\xc1$\xcfE\x08\xd2\xd5?{\
 <\xcb\xf0\xff\x09\x15.c\xea\xe6\xcc\x1f\xfc\x06\xd7@\
 \x11)\
-\x00\x00\x0d\x0d\
+\x00\x00\x0d-\
 \x00\
-\x00k\xfbx\x9c\xed]Ks\xdb8\x12\xbe\xe7W\xb0\
-|H\xed\x1e\xd6\xb4d\xc7N\x1cES\xcek\xe3\xda\
-8\xa3\x8c=\x99c\x8a\x22a\x89\x15\x8aPH\xd0\x96\
-\xa6\xe6\xc7o\x03|\x01\xc4\x83\x80$'\xf6\x8c/*\
-\x12\x04\x1b\x8dF\xa3\xfb\xeb\x06\x08\x8d~Y-\x12\xef\
-\x06ey\x8c\xd3W{\x83\xfd\x83=\x0f\xa5!\x8e\xe2\
-t\xf6j\xef\xf7\xab\xf7\xffy\xbe\xf7\xcb\xf8\xc9\xa8\x88\
-\xdbJGPi\xfc\xc4\x1b\x85I\x90\xe7\xe3\xf7Y\xb0\
-@#\xbf\xbc\x81\xd2\xdb8\x9a!\xe2\xb1\xfbW{\x9f\
-\xd9\xe3=/\x85\xdfW{\xe5\x0d\xd4\xf2F\xcb\x0c/\
-QF\xd6\xd5\x93\x19\xc2\x0bD\xb25{\xe8\x8d2\x14\
-\x12v\xe5\x8dV\xe3\x83\x91\xbf\xaan\xd6\xf4f]\xdd\
-@Kd>>zq<\xf2\xcb\xcb\xb2x\x8e\xe2\xd9\
-\x9c\x8c\x8fO^\x8c\xfc\xea\x9a\xd1\xf4k\xa2#\xbfn\
-\x5c\xc5\xc9m\x9cF\xf8\xf6*&\x09\xaa\x98\xc9I\x06\
-\xd2\xa8;Z\xdd\xc9t\x92`\x8d\x8b\xb6\xe3_^\xe3\
-\xd5GVT\xf7\x1e\x04H\xe20H\xca\xd2\xaf/*\
-\xf21A\x8b\x8a\xf5\x0e\x89\x0f\x12\x899\xce\xe2?q\
-Jj\x22%\x09\xb9\x13y\xfc'z\x83S\xe05\x88\
-\xd3\xa6\x967Bi\xb1\x18\x7f.\xdf==\xbdD\xe4\
-\x22N\xe3E\xb1\xb8\x84\xfa#\x9f=\xad\x08\x0a}\x13\
-\xd9\xf4\xa4A\xfe\x18LQR\xf3\x18\xe2$\x09\xa68\
-\x0b\x08h\xcby\x88\xd3\xa6y%\x9b\x13\x9c\xc4\xe1\xba\
-\xad\x03\xf2\x86\xd2%+\xf5\xe6\xf4\x9a\xac\x97Tw\xe2\
-\x15\x8a\xf6\xbc\x9bnI\xfb\x22\x0c=\xce\xa0\xcb\x88\x84\
-s\xaa'\xdc\x1dW\x87\xaaq[\x87\xbbk\x19\xf0[\
-\x0eZ\xd6\xbb\x02\x91{\xb3\x08V\xb5,\xbb\xdd\xe1\x19\
-(u\xf5\xd9\x81\xa0\xb5\x1e\xaf\xba\xf4\x19\xa7\xb9\x1cS\
-.\xecL\x83\x1c\xd9\xf12800\xc3\x1en\xcf\x0d\
-A+\x22p\xc2\xa6\x91\xefBb\x19\xaf\x16\xc1\x92'\
-R\x96x\x19\xcaq\x91\x85Pe\x7f\xdf\xafo\xf2\xfd\
-\xefY\xb87>\xf5\xdf\xf0\xfa\xe8S\x85\xcc\xfd\x18~\
-\xbf\xde\xceA\xa7\xf7\xf3\x9b\x19\xb4\xcd\x08\xb90\x93\xc3\
-DF\x11\xcc1\x82R\x92\xf3LM1N\xc6$+\
-`B\xb1K\x07\xa2A\x12\xcf\xd2\x05JEI!2\
-\xfe\x0c\xb3\xf5\x8c>|\x8d\x09\xc1\x8b\xbf\x9a\xfb\x8f(\
-\xa0\xa6\x9a/\xb8&0:\x88\x18\xdae\x83=k\xaa\
-\x8c|nn\x8b\xf3<_\x06!\xca$\xe3s\xc9\x8a\
-\xbf\x1e\xeag6T\x85n0\x91\xf3})\xed\x0f\xf0\
-\xfa\xa1\xa1%\x98\x1d;\xd1\x83\xea]\x81\x05\x90\x09_\
-6\xf6\xe4\xf4\x94Y\x87\xcd\x88\x7f\xa06\xd3\xcbI\x04\
-b|\xb5w`3\x81\xf4\xf3g\x93\xd9\x03\x15\x98\x84\
-\xfb\x07\xc8\xd5\xe9\x0c\x0d\xc6\x18\x9a\x04U\xe2{\x0b\xb2\
-\x9b\x02\x17\xd0\x85\xea\xcaQ\x90\x0a\x17\xe4\xe2\x84\xd4\xed\
-\xf0\xfd\xefqE\x09\xbb\xe1\x07\xc5\xc6\x01i]\xd0\xbb\
-\xd52H\xe9t\x13\xdcP\xc5\xbd@@pE\x03\x8d\
-+\xb2rF\x1aw\xa4\x14\x8d\xadK\x92\xf5\xb8\xd5\xe4\
-\xe3\x93\x93\x93\xe1\xe0\x99\xac\xcf\x9cGh\xeat\x15[\
-RmK6\xaf\xb1\xa0!P\x81\x96\x88\x8d/1\xa8\
-\x11#>\x04Q\xb5wb'J\x86N(\xff\x12o\
-\xd44'Qc\x9a\xe1R`\xbc\xd3\xa4\x15\xe3\x1d\xaf\
-\xc6\x83E\x84\xde\x9c\xbd\xf5\x04\xe7\xc3\x83G\x97VT\
-n\xa1\xeb\x18\x94\x8e\xa0\xbd\xbb\xc2K\xd1+\xa8\x9b\xee\
-x\x86\x8e\xe9\x91'\x9f3`\xe5}\x86\x8d\x09j\x8d\
-\xd0@\xb6B:\xf1\x89L\xda\xd8\x88\xafG\x9d\xe9\xdb\
-7\xce\xedH\x7f\xc2\x11\xf2\xce\xdf\x9e*\x06W\xc3\x9f\
-\xed\x00o?\xc4:\x06\xa4a\x96\x06\xdaU\x8a)H\
-\xe1<\xfa\xd8\xb5\xb7\xd6\x16\xd7\xd1\xe6N2t\x8d\xb2\
-L\x84\xff\x8c\x8aE\x08\xc0\xea\xd9X^\xad\xed\xb5\x1e\
-X\x83\xde\x5c\xc1#&\xaf\x87\xa48\xca\x0e\x9e\x03\x06\
-\xce\x82\x90Z\xb8\xf7I0\xcbu\xbc\xd0\x1e_\xa2\x04\
-\xa2\xf0`\x9a\xa0\xd7\xeb\xff\xa1\xf5\x14\x07Y\xf4\x97\xea\
-\xe1\x05.r\xb4C}\x1e\xf9\xa5\xad\xd2X\xb6\xcec\
-\xfe\xa1\xf0\x88{\xc0\x07\xee\x9d\xa9\xf1\x07\xbb\xad\xe7\x06\
-\xf4\xa8- \xf1\x0d-\x02\x1f\xa4\x8b\xdd\x17-\x1aj\
-\x03w\x110j\xc36-\xe8\x14\xfc\xb2\x1c\xdc\xbb\xdb\
-\xf1\x17-o}F\x5c\x0b#\x15\xc0\xb7C+\x01E\
-\xbd\x08\xb2Y\x9c\xee\x84\x1c\xc1\xcb\x1dR\xcb\xa8\x80w\
-Ho\xcab\xbbm\x08\x8a\xbe\xda\x1c\xbc\x0dyHn\
-\x15\xbd\xd9\x84ojT\xe1\x14c\xc9\xe0\xb4\xd2\xf7C\
-U\x98\xd5\xa8\xfcP\x11hIpT\x15O\x88\xb1V\
-\xd7.\x88\x22\xed\xcc\xf3I\x91\xcf_\x170j)\xef\
-\x07\xab\x12}\xff\xafqX\xe4\xb2\x13l\xc5\xfb\x09\xbf\
-\xa7U6\x91m\xd7\xe3\xf00E\xf646\x14\xc39\
-\x0a\xbfQ\xa3,\x90\xd5e9\xecIvrw[\x11\
-\x0c\x0a\x82\xdf\xad\xc2\xa4\xc8\xc1\xbc\xee\x8e\xecu\x12\x90\
-\x8d\xa9u\x9d\xd2v\x8a\x15\xe1\xf0^\xea\xd5[ H\
-\x01H~o\x94\xeb\xc1\xe9\x82\x88=\x84\xaa\x1a\xb8!\
-X\xf6:\xc3\xd3\xb5\xeb6F\xbdU\x8d/\x15\x95\x9e\
-U\x80\xbeT\x9cU\x22\xce\x8a\xac\xceA(\xa1\xd0P\
-\x8b\x84\x06nPH\xf0\x06v`\xef\x92\x04\xd4\x98\x89\
-\x98/\xa7\x85\xba\x91\x08\x0b\x08]R\xc0\xcd\x11Z\xb5\
-\xfd\xd2\xf8yYXF\xb0I\x1dPK\xd35=h\
-\xc8\xe8\xea\xd3\x83\x8a\xc8\xdc\x22?\xa8\x82v\xdbe\x1c\
-\x15\xe8n;\x82J\x80\xb7\x1dI5\xc6s\xa4i\xce\
-\x80\xca\xfa`\x8a>\x94L\xca+G\x0aTV\xcf=\
-\x15(3e\xbfeT\xa6I\xe3\xb8*\xef3\x91_\
-\x8b\xdcR#\xf7cEnI\x17k\xda\xe8\xb1qH\
-\xadI\xab\x14z7\x94\xd5\x9a\xbd\x1b\xda\x1a\x15\xdf\x90\
-x7\x0b%\xa9\xc5\x7f\xb38\x12\xd5b\xd6\x94\x08A\
-NC\xce\xcb\xf0-\xf5(^\x88\x93bAw=H\
-Y$\xf7x\xf8\xa4K\xc3N\x01y\xb1(3\x9c\x06\
-\xd9\xa8\x1a\xd1ic\xaf\xf8{\x9a\x91\x86\x81\x95\xf6e\
-\x04\x15\xf9@\xb5htI\xc1\xb2\xf6\xd6\xab15!\
-\xcb\xe4`Y\xd9.CX\x09N\x93&\xec\x11\xab\x0a\
-\xc2K\xb9\xbc\xb2\x9e\xb4 \xd2\x10hVB\x06\xdau\
-\x91\xba\xaeyy\xa4\xaeeX%iz\xa4f\xc7\xa5\
-\xa7\x8a\xd4hY\xaf\x0a#~}3\xf1\xa8\x0eyY\
-\x91\xa6P\xa0L\x93\xf6\xb5\xaaH\x0cV\xe5*\x85\xb6\
-\xd3r96\x03\xb0\x97\x91b)\xc5g\xba\xaek\xe2\
-\xb4\xa6z_\xbcf\xd1qgq_\x96}\xd8H\xca\
-vQ]S\x99EK\xd7A\x92K\x91\x93E[N\
-#*%}\xb5U\xd5\x8e\xe1@r\x0c\xbdk `\
-\x91\xc2\x80\xe0\xac\xd7\x1d\xe8\x96f\xcb\xca\xea)\xac\x8d\
-v\xda\x1a\xa6lX\xdd}\x15q{\x17\xa3\xd6$i\
-C\x8f3]i{OSo\xe3]>\xf5`|\xc5\
-\xa9r\x9f\x8f3\x8f\xda]?u}mR\xa0\xa7%\
-\xb5Z\xf7h\xea\xc0\x01\xc2\xf4\xa1\xe7\xed\xe1\x8b\x12C\
-\xbb\x89\xf7\xc7\xa2\x17\x07 ia\xd4M\xbc[p\xef\
-f`\xf9\x9c\x8frP\xda\x16\x0f7l\xd1\x0e)\xb3\
-\xaa]\xa3\x18\xa7\xe8]\x147b\x5c\x0e\x97\xbfg\xb1\
-\x1a\x919\x01AG((\xed\x0f\xe5\x09q\xe0o\xd8\
-\x07\x05\xdd\xc0`\x1f\x1c4\xcb]\x81\x16\x9aM\xd3r\
-\xd5\x1es\xe3\xde\xd82\x09B4\x07\xd4\x87\xb2+\x0d\
-bh1\xc3Y\x14\x81\x1dVd~-[\xd7\xf9r\
-\x1d>\x13\xb4rhp\xd3\xacj\xff\xa6\x0f9fS\
-\x89D\x87\x9c89L\xce\xbd$\xce\xc1'x\xcaM\
->?V\x1a\xdd\x98W-\x8d\xce\x1c\x0d\x96\xf1\x04g\
-\xea~\xde\x8bI\xaa\xdfD\xd7V\xff\x89\x93\xd4i\xde\
-PI\xff\x1c59\xd8RM\xc0\x94?\xaaI\xe7\xf9\
-\xfdT\x139&KP\x90\x95!\xea\xbb\x94\xc6f\x1a\
-qZ\x84g?HC75\xeb\xc7;2\xeb\x93\xe1\
-\xe4\x1e\x99\xf5\x8d\xa0\x17\x98\xf5G\xe8%>\xff\xfb\xa0\
-!uvc\xbb\xe4\xd6\x1b\x9a\xb9\x81P\xb1\x99Qx\
-\x96\xb3\xb2)^Y\x04A\xbdY\xa69\xbe\xf5(\xcd\
-{\x93\xcd\xfb\x08\x13\xfcK\x8cn\xf9\x0e\xb3\xfb\xfe\xce\
-2`~9\x0f\x96\xea4W\x99\xc5c_\x0d\x9e\x9e\
-^\x925X\xdcI\x90\x22i\xc7\x94E\xc7\xb5MG\
-X\xc5h\xb7\xed\x22\xfd\x86\xd2]4\x8b\xc0\xb4\x5ce\
-\xf1l\x06\x93P=\xcct\xab\xe7\xd9\x94~\xf4\x11\x92\
-s\x90?\x15%\xcdc\xbe\xe3\xde\x94wu:3\x92\
-\x83\x1e\xbd\x85\xa26\xdd\xa6\xdeJ\xd6\xbc\xbfU\xceQ\
-n\x9emT\x8dqz\xc1\xaf\xb6\xf3/\x94\x03\xa0\x92\
-\xc4e\xfd\xee\x06\x03r7\xc9OUEy;\xb8T\
-\xc9\xf5[\x01\xe3258\xaa\xdeUj\xf7E\xb9\x81\
-\xa8\x0c\x8fK\xc2\x06\xca\xff\x94%\xe1\xc3\xce|\xb5\xfe\
-n\xad\xac\xed\xf0\xf1\x9a\xa1\x0f\xde\xa6i\x5c\x0b\xa5\x7f\
-\xbe}*\xf7\xa1/DwQL\x86B\x9c\xa6`v\
-w\x08e\xce\x0aPi0U\xa1W\xd1\xf6n\xe7\x10\
-)\xb0%\xcb8\xdfj\xd5\xd2f\xbflS\xb57\x05\
-x_\x16\xd3v\xa1\xdbG?G\xb7\xddw?\x80?\
-\xfb\x09\x9b\x1f\xb4\x9fE\x95\xa4\x1e\xb7?<\x9c\xed\x0f\
-4\xa7\x5c\x19\x16\xc0\x8a\x1e\xca\xe9wQq>\xa7[\
-i\xefI\xe8$o\x84\xa8\x18~\xd0\x1b!\xde\x94}\
-x\xdc\x08\xb1\xf9F\x080~\x0e\xfb \x14\x9f\xbb\xb5\
-\x95\x8d\xfb \xfa\xb7A\xdc\xdd.\x88\xc7\xed\x1b\x8f\xdb\
-7\xf8\x07\x96\xdb7~P\xac\xed\x12\x10\x09\x98\xca\xe5\
-\x8b|U\x84\xac\xff \xbf'\xd6q\xde\xed\xddY\xbc\
-\xb5\xc3\x81\xe6\xbd*\x96\xdf<kC\x1b3\xc4\xd4Q\
-W\xd8`w`\xfcL2\xd0\x96\xb8\xb8\xe6y\xa8\xc3\
-\xc5z\x9d\xb7\x8f\xf8\xfa\xb0\xb7\xbe\x0d%:\xe9\x89\xf6\
-\x96\x08e\xfa@\xcf\x12\x0f\x08\x19\xeb\x09*\xd3\x96j\
-D`\xb0?j\x1f\xadv\xd16]\x15\xdc,\xeb'\
-.R\xa2\x894\x9c\x02\x8d\xdd\xc5\x19.a\x86C\x94\
-a\x0c2L8\xc9m\xbc+\xf8\x87\x22\x8f`\xef\x80\
-\x85\xf3\xf9\xfe\xdd\x0e\xbd\x12\x9c\xa9|\x87\xe2\xd5\x9e\xd5\
-\x0c\xaa\x22\xaa\xd5\x0c\xa7\xc4\xfe\xe6Y}k\xdbaN\
-\xa8o\x9cM\xd7&\xdfT\x83#K\x5c10\xeac\
-Rzr\x1d\xe6]\xc3\x88\xdc\xe2\xec\x9b\xc5\xd1)\x8a\
-\xe0X\x15\x17[\x86\xc4\xbd\xd1\xb09\x10V\xc4\xc0\xdb\
-\x9f\x89\xc2\xce\xd2\x09\x834\xc5\x04\xf0b\x10\xce=\xba\
-\x06_I\xc8\xe1\x9c\x14\xeb\xf3mz\x02\x1d\x9b\x81\xd3\
-D:\xf6\xf1\x82*X\xe8\x89\x14\xfa\xc2\x04E\x8c\xb0\
-\xf5\xe0\xf8\x9b\x90S\x06\x05;\x89\x08\xae\xaf\xb5!\x81\
-%o\xc6`\xc0\x18\x09\xdc\xd5!4[\xc1x\x01\x01\
-Z!\xee\xfe\x9d4\x83C\xb3R\x1b\xa6\xf2\xd3\x84\xbc\
-\x9c\x93E\xf2tF^\xb2k\x14D~}3\xc5\xd1\
-\xba\xbe^\xd2\x8b\xf3k\x0f:\x91\x95\x93>\x98\xc6I\
-\x0cm\xc4\xb9\xf74X,_~/0y9\xc9\xe2\
-\x9b\x80\xa0\xb6\xc0\xc3dN\xbf\x81\xa7\x0e\xba\xb6\x19(\
-/\x93d^\xc0\xe7\xce\xc0\x91\x03\xf1}\xef\x02\xe7\xc4\
-K\xe2o(Y\xd3\x02/\xc8\x907EsP*\xa8\
-\xff\x1b\xc8\x10\xc8\x91y@M\xcf\xf7\x22\x06\x85\xf4\x96\
-8#\xde5\xcen\x83\x8cb\xa0}o\x92\xa0 \x07\
-\x13E\xd1e\xc5q\xf9\x1e\xf8>\x025\xf2}\xda%\
-\x7fYw\xce\xe7{\xea\xd7\xf2\xd8\xe6\xc4'09\xd1\
-\x1f\x99<\xa7\xeeD_\xed\xbc\x9b{\xb4r\xfc\xe3b\
-7\x0b\xcc\xc4\xeb=\xaf\x80\x17A\x9c*\xa1\xb5U\xd6\
-Z\x9d\xb2\xb6\xceW[$\xab\xfb2\xd5\xca4\xb55\
-$S\xe2\xe4\xc6Q\x97\xbeO\x98\xaf\xea\x13\xf0\xb6\x06\
-a[\x0d\xa1\xd5\xf0\x19\xe2\xa2]EE\xf61\x91u\
-Dd\x88\x87\xac\xc7\xf8\x9f\xa7\xb8\x93\x02\x1cDx7\
-\x9a\xbay\xb8\xe0\x80:y\xed~\x84\x9e\x06r\x8f\xd0\
-s+\xe8i8b\xc8\x94/\xd6\x9c\x1c\xd7w\xd0\x90\
-\xb6k\xbd\x07\x0eq\xc4\xf9C\x87\x1a\x0b\xbdy3\x86\
-\x13\xea\xf4\x87\xa1<{n:\x0d\xe5x\xe3\xd3P\xba\
-\xa7\xd4u\x86O:\xbeR<\xe0\xdd\xb8\xf5.\xaaO\
-\xf0jz\xe8\x9c\x8b\x1fp\x88\xd0\xfe\xdc\xa0\x07pl\
-\xd0@\xfez\xf2o{n\xd0e\x98\x81\xdd;\x03\x07\
-\xc3i\x06\xbb5L\x14\xcd\x1ehq\x03\xf2'\x5c\xfd\
-w\xca&S\x91;\xb8\x921\xf8:\xc8T'\xb67\
-\xf6\xa5\xa9u\x96\xdc\x06\xeb\xfc\xd7\xeb\xeb\xcd\xda-\xa5\
-\xf3\x1b\x82\xc9)-\xe0\x1bL\xb4\x9a\xb6q\x02\xe6\x8d\
-\xe0\xcbr\xa5_\xe8\xb2'\xfeaNS\xab\xfd\xe3\x9c\
-\xa6\x88\xff\x03\x9d\xa6\x90\xff#\x1d\x9eK\xdd\xbf\x81x\
-\xad\x11\x1b\x9c(=\x7f\xfb\xff:fQH\xae\xaag\
-m\xd3h\xda4\x87\xe5q\xefp5F\x8d\xa3gu\
-\xe24L\x8a\x08y\x09\x0e\x99\xbfR`\x01\x9f\x11\xe0\
-_\x1b\xb5y\x85\x92J{_\xf2\x90\xa34\x82i\xc8\
-\x7f7A3\xe3\xac\xb0\xac\x10\xcf\xd2\x00\x94\x07\xcff\
-\x80\x01\xfeE\xd5\xe7\xdf\xd4\x05\xb0\xd2'\xd5\x18\xa2\xf8\
-\xa6\x22B\x13\xddL\xb4eQI\x22\xc1d\x0c^\xe9\
-K\x9c\xc7\xa0\x9a\x0d\x0dZ\xcc*\xcc)8\xaf$D\
-\xaf\xbd2@)\xbb!\xfc)\x02h\xc7pp\xd4\xea\
-\x07(\xc6\xf0\xf0\xb8\xfd\x8f%\x9f\xbe.S\x8aPN\
-\xe2\x94\x89\xad\x97\xdc\xf1\x91\x8a\x5cyY\xca\xd0\x17\x85\
-\xa8\x93)\xbf\xae\xb7\xb1L\xeb\x15\x91\xbb\x95\xe9\xf1\x89\
- \x83\xa3\x81R\x06\x9b\x8a\xf4\xe8d\xe0&R\xfe\x16\
-\x9e\x8f\xfc\x22\x1e?\xf9?\x031^\xeb\
+\x00m\xd0x\x9c\xed]_s\xdb8\x0e\x7f\xef\xa7\xd0\
+\xe4\xa1s\xf7pQ\xec\xa4I\x9b\xba\xdeI\xd3\xf6\x9a\
+\xb9\xa6\xebn\xb2\xdd\xc7\x8e,\xd16\xa7\xb2\xe8JT\
+b\xef\xec\x87?\x90\xfaG\x89\xa4D\xcaN\x9a\xec\xe6\
+%cQ0\x08\x82 \xf0\x03H3\xa3_\xd6\xcb\xd0\
+\xb9Aq\x82I\xf4fo\xb0\x7f\xb0\xe7\xa0\xc8'\x01\
+\x8e\xe6o\xf6~\xbf\xfe\xf0\x9f\x97{\xbf\x8c\x9f\x8dR\
+\x5c\x11\x1d\x01\xd1\xf8\x993\xf2C/I\xc6\x1fbo\
+\x89Fn\xf6\x00\xad\xb78\x98#\xea\xf0\xe77{_\
+\xf8\xeb='\x82\xbfo\xf6\xb2\x07\xa0rF\xab\x98\xac\
+PL7\xf9\x9b9\x22KD\xe3\x0d\x7f\xe9\x8cb\xe4\
+S\xfe\xc9\x19\xad\xc7\x07#w\x9d?l\xd8\xc3&\x7f\
+\x80\x9e\xe8b|\xf4\xeax\xe4f\x1f\xb3\xe6\x05\xc2\xf3\
+\x05\x1d\x1f\x9f\xbc\x1a\xb9\xf9g\xce\xd3-\x98\x8e\xdc\xa2\
+s\x95$\xb78\x0a\xc8\xed5\xa6!\xca\x85Ih\x0c\
+\xda(\x06\x9a?\xc9|BoC\xd2j\xe0_\xdf\x92\
+\xf5'\xdeT\x8c\x1e\x14H\xb1\xef\x85Y\xeb\xb7W9\
+{L\xd12\x17\xbd\xc1\xe2\xa3\xc4bAb\xfc'\x89\
+h\xc1$c!\x0f\x22\xc1\x7f\xa2s\x12\x81\xac\x1e\x8e\
+J*g\x84\xa2t9\xfe\x92}\xf7\xf4\xf4\x0a\xd1K\
+\x1c\xe1e\xba\xbc\x02\xfa\x91\xcb\xdf\xe6\x0ckc\xab\x8b\
+\xe9H\x93\xfc\xc9\x9b\xa2\xb0\x90\xd1'a\xe8MI\xec\
+Q\xb0\x96\x0b\x9fDe\xf7J1'$\xc4\xfe\xa6\xa2\
+\x01}C\xeb\x8a\xb7:\x0b\xf6\x99nV\xccv\xf0\x1a\
+\x05{\xceM\xb3\xa5\xfa\x22L=\x89a\xc8\x88\xfa\x0b\
+f'\xc2\x93@\xc3\xcc\xb8\xa2\x11\x9e*\x01\xdcJ\x82\
+J\xf4\xa6B\xe4\xd1,\xbdu\xa1\xcb\xe6pD\x012\
+[}qP\xb3ZG4]\xf6N\xb0\x5cA(\x1b\
+q\xa6^\x82\xccd\x19\x1c\xb4\x08\xc3_n/\x0dE\
+kZ\x93\x84/#\xd7\x86\xc5\x0a\xaf\x97\xdeJd\x92\
+\xb581JH\x1a\xfb@\xb2\xbf\xef\x16\x0f\xc9\xfe\x8f\
+\xd8\xdf\x1b\x9f\xba\xe7\xa2=\xba\xcc \x13\x17\xc3\xdfo\
+\xb7\x0b\xb0\xe9\xfd\xe4f\x0e}sF6\xc2$\xb0\x90\
+Q\x00k\x8c\xa2\x88&\xa2PSB\xc21\x8dSX\
+P\xfc\xa3\x05S/\xc4\xf3h\x89\xa2\xba\xa6\x10\x1d\x7f\
+\x81\xd5z\xc6^\xbe%\x94\x92\xe5_\xe5\xf3'\xe41\
+W-6\xcc(\xcc\x0e\xa2-\xfd\xf2\xc9\x9e\x97$#\
+WX\xdb\xf5u\x9e\xac<\x1f\xc5\x92\xf3\xb9\xe2\xcd\xdf\
+\x0e\xf5+\x1bHa\x18\x5c\xe5\xe2X2\xff\x03\xb2~\
+,y\xd5\xdc\x8e\x99\xea\xc1\xf4\xae\xc1\x03\xc8\x8c\xafJ\
+\x7frz\xca\xbdC?\xe6\x1f\x99\xcft\x12\x1a\x80\x1a\
+\xdf\xec\x1d\x98, \xfd\xfa\xe9\xb3z\x80\x80k\xb8{\
+\x82l\x83\xce\xb0\xc5\x19C\x97`J\xe2hAwS\
+\x90\x02\x86\x90\x7f\xb2T\xa4\x22\x04\xd9\x04!u?\xe2\
+\xf8;BQ\xc8\x1f\xc4I1\x09@\xda\x10\xf4~\xbd\
+\xf2\x22\xb6\xdcja(\x97\xbe\xc6\xa0\x16\x8a\x06\x9aP\
+d\x14\x8c4\xe1H\xa9\x1a\xd3\x90$\xdbqe\xc9\xc7\
+'''\xc3\xc1\x0b\xd9\x9e\x85\x88P\xd24\x0d[2\
+mC1g\xa4f!@\xc0Z\xea\x9d\xaf\x08\x98\x11\
+g>\x04UUO\xf5Ad\x02\x9d0\xf9%\xd9\x98\
+k\x0e\x83\xd25\xc3\xc7\x9a\xe0\x8d.\x8d\x04oD5\
+\x11,\x22t~\xf6\xce\xa9\x05\x1f\x11<\xda\xf4\xa2\x0a\
+\x0b\xcd\xc0\xa0\x0c\x04\xd5\xd35Y\xd5\xa3\x82\xba\xebF\
+dh\xb8\x1ey\xf1Y\x03V1f\x98\xb8\xa0\xca\x09\
+\x0dd/\xa4S_]H\x13\x1f\xf1\xed\xa8\xb1|\xbb\
+\xe6\xb9\x9a\xe9\xcf$@\xce\xc5\xbbS\xc5\xe4j\xe43\
+\x9d\xe0\xed\xa7X'\x804\xcd\xd2D\xdbj1\x02-\
+\x5c\x04\x9f\x9a\xfe\xd6\xd8\xe3Z\xfa\xdcI\x8cf(\x8e\
+\xeb\xf0\x9fs1H\x018\x9d\x89\xe7\xd5\xfa^\xe3\x89\
+m\xb1\x9bkx\xc5\xf5\xf5\x98\x0cG9\xc0\x0b\xc0\xc0\
+\xb1\xe73\x0f\xf7!\xf4\xe6\x89N\x166\xe2+\x14B\
+\x16\xeeMC\xf4v\xf3?\xb4\x99\x12/\x0e\xfeR\xbd\
+\xbc$i\x82vh\xcf#7\xf3U\x1a\xcf\xd6x-\
+\xbe\xac\xbd\x12^\x88\x89{ci\xfc\xc1\x1f\x8b\xb5\x01\
+#\xaa\x1a(\xbeaM\x10\x83t\xb9\xfb\xb2BCU\
+\xe2^\x07\x8c\xda\xb4M\x0b:kqYN\xee\xed\xfd\
+\xf8\xabJ\xb6.'\xae\x85\x91\x0a\xe0\xdb\xe0\x15\x82\xa1\
+^z\xf1\x1cG;aG\xc9j\x87\xdcb\xa6\xe0\x1d\
+\xf2\x9b\xf2\xdcn\x1b\x86\xf5X\xdd\x9e\xbc\x0dEHn\
+\x94\xbd\x99\xa4ojTa\x95c\xc9\xe04\xb7\xf7C\
+U\x9aU\x9a\xfcP\x91hIpT\x95O\xd4s\xad\
+\xa6_\xa8\xab\xb4\xb1\xce'i\xb2x\x9b\xc2\xacEb\
+\x1c\xcc[\xf4\xe3\x9f\x11?M\xe4 X\xa9\xf73\xf9\
+\xc0H\xfa\xe8\xb6\x19qD\x98\x22G\x1a\x13\x8e\xfe\x02\
+\xf9\xdf\x99S\xae\xb1\xd5U9\xccY6jw[1\
+\xf4RJ\xde\xaf\xfd0M\xc0\xbd\xee\x8e\xed,\xf4h\
+on\xcd\xa0\xb4\x9da\x05\xc4\x7f\x90v\xf5\x0e\x182\
+\x00\x92<\x18\xe3zt\xb6P\xc7\x1e5R\x0d\xdc\xa8\
+y\xf6\xa2\xc2\xd3\xf4\xeb&N\xbd2\x8d\xaf9\x97\x8e\
+]\x80\xaeR\x9cQ!\xce\x88\xad.@(\xa1\xd0P\
+\x8b\x84\x06vP\xa8\x16\x0d\xcc\xc0\xde\x15\xf5\x983\xab\
+c\xbe\x845\xeaf\xc2O!u\x89\x007\x07h]\
+\x8dK\x13\xe7ee\xb5\x82M\x16\x80*\x9e\xb6\xe5\xc1\
+\x96\x8a\xae\xbe<\xa8\xc8\xcc\x0d\xea\x83*h\xb7]\xc5\
+Q\x81\xee\xb6c\xa8\x04x\xdb\xb1Tc<K\x9e\xed\
+\x15P\xd9\x1e\xda\xb2\x0f\xa5\x90\xf2\xce\x91\x02\x95\x15k\
+O\x05\xca\xda\xaa\xdf2*\xd3\x94ql\x8d\xf7E]\
+^\x83\xdaR\xa9\xf7cEmI\x97k\x9a\xd8q\xeb\
+\x94\x1a\xb3V\x19\xf4n8\xab-{7\xbc5&\xde\
+\x93y\xb3\x0a%\x99\xc5\x7fc\x1c\xd4\xcdb^\xb6\xd4\
+\x92\x9c\x92\x9d\x13\x93[\x16Q\x1c\x9f\x84\xe9\x92\x9dz\
+\x90\xaaH\xf6\xf9\xf0I\x93\x87\x99\x01\x8ajQV8\
+[t\xa3\xeaDg\x8d\x9d\xea\xef\xe8F\x9a\x06\xde\xda\
+U\x11T\xd4\x03\xd5\xaa\xd1\x15\x053\xea\xadwc\x0a\
+F\x86\xc5\xc1\x8c\xd8\xacB\x98+NS&\xecP\xab\
+\x0a\xc2K\xb5\xbc\x8cN\xda\x10)\x19\x94;!\x03\xed\
+\xbeHA\xdb\xbe=RP\xb5\xec\x92\x94#R\x8bc\
+3REi4\xa3\xcb\xd3\x88_\xcf'\x0e\xb3!'\
+N\xa3\x08\x1a\x94e\xd2\xae^\x15\x85\xc1\xbc]e\xd0\
+fV.\xe7f\x00\xf6b\x9a\xae\xa4\xfcL7tM\
+\x9eV\x92w\xe5k\x06\x03\xb7V\xf7U6\x86^Z\
+6\xcb\xeaJb\x9e-\xcd\xbc0\x912'\x83\xbe\xac\
+fT*\xfajI\xd5\x81\xe1@\x0a\x0c\x9d{ \xe0\
+\x91|\x8f\x92\xb83\x1c\xe8\xb6f3b\xf5\x12\xd6f\
+;\x15E[5\xac\x18\xbe\x8a\xb9y\x88Q[\x92t\
+\xa0\xc7\x9a\xaft\xbc\xa7\xa4\xeb}\xca\xa7\x98\x8co$\
+R\x9e\xf3\xb1\x96Q{\xea\xa7\xa0\xd7\x16\x05:zR\
+\x9bu\x87\xa5\x0e, L\x17z\xde\x1e\xbe(1\xb4\
+\x9dz\xef\x17\xbdX\x00I\x03\xa7\xde&\xbb\x81\xf4v\
+\x0eV\xac\xf9('\xa5\xea\xf1\xb0g\x8ffH\x99\x93\
+6\x9d\x22\x8e\xd0\xfb\x00\x97j\x5c\x0dW\xbf\xc7X\x8d\
+\xc8\xac\x80\xa0%\x14\x94\xce\x87\x8a\x8c\x04\xf07\xec\x82\
+\x82v`\xb0\x0b\x0e\xb6\xeb]\x81\x16\xcaC\xd32i\
+\x87\xbb\xb1\xefl\x15z>Z\x00\xeaC\xf1\xb5\x061\
+T\x98\xe1,\x08\xc0\x0f+*\xbf\x86\xbd\xebb\xb9\x0e\
+\x9f\xd5\xacr\xd8\x12\xa69i\xf7\xa1\x0f9gS\xa9\
+D\x87\x9c\x04=L.\x9c\x10'\x10\x13\x1c\xe5!\x9f\
+\xfb\xd5F3\xe7Uk\xa3\xb1F\xbd\x15\x9e\x90X=\
+\xce\x07\xb1H\xf5\x87\xe8*\xf2\x9f\xb8H\xad\xd6\x0d\xd3\
+\xf4\xcf1\x93\x83-\xcd\x04\x5c\xf9\x93\x994\xde?L\
+3\x91s\xb2\x10yq\x96\xa2\xbe\x8fXn\xa6Q\xa7\
+AzvO\x16\xda\xd7\xad\x1f\xef\xc8\xadO\x86\x93\x07\
+\xe4\xd6{A/p\xebO\xd0\xab\xfe\xfe\xef\x83\x86\xd4\
+\xd5\x8d\xed\x8a[\xe7\xacr\x03\xa9b\xb9\xa2\xc8<\xe1\
+mS\xb26H\x82:\xabL\x0br\xeb0\x9e\x0f\xa6\
+\x9a\xf7\x09\x16\xf8W\x8cn\xc5\x01\xf3\xe7\xee\xc1r`\
+~\xb5\xf0V\xea2WV\xc5\xe3\xbf\x1a<=\xbd\xa2\
+\x1b\xf0\xb8\x13/B\xd2\x89)\x83\x81k\xbb\x0e\x88J\
+\xd0f\xdfi\xf4\x1dE\xbb\xe8\x16\x81k\xb9\x8e\xf1|\
+\x0e\x8bP=\xcd\xec\xa8\xe7\xd9\x94\xfd\xe8\xc3\xa7\x17\xa0\
+\x7f\xa6JV\xc7|/|S>\xd5i-H\x02v\
+\xf4\x0e\x9a\xaar\x9b\xfa(Y\xf9\xfd\xadj\x8er\xf7\
+\xfc\xa0*&\xd1\xa5\xb8\xdb.~!\x9b\x00\x95&\xae\
+\x8a\xef\xf6\x98\x90\xbb)~\xaa\x08\xe5\xe3\xe0\x12\x91\xed\
+o\x05Z\xb7\xa9!Pu\xeeR\xdbo\xca\x0d\xea\xc6\
+\xf0\xb4%\xdc\xc2\xf9\x9f\xb2%|\xd8X\xaf\xc6\xbf[\
+\xcb\xa8-~\xbc\xd62\x06\xa7o\x19\xd7\xc0\xe8_n\
+_\xca}\xec\x1b\xd1M\x14\x13#\x9fD\x11\xb8\xdd\x1d\
+B\x99\xb3\x14L\x1a\x5c\x95\xef\xe4\xbc\x9d\xdb\x05d\x0a\
+|\xcb\x12'[\xedZ\x9a\x9c\x97-I;K\x80?\
+}{\x14\xba\x9f\xe1P>\x16\xad\x1b\xedC\xdc\x1e\xfd\
+\x0d,(\x0e\x1c\xf8\xca\xec\xde\xb6H\xefcR\xb7\xdd\
+!\xdd\x85\xc3:\xfa9\x0e\xcb\xfeH\x0b\x80\x94\x9fp\
+\xa2E\xfb[\xb7\x8c\xd5\xd3\x99\x96\xc7s\xa6\x85m\x14\
+\xe4\xd1\x02\x12\x00\x07%\xec\xc7n8Y\xb0\xf3\xd1\x0f\
+$\x1f\x96\xddw.\xf0\xa3v\xdf\xe7\xd9\x18\x9eN\xb7\
+\xf4?\xdd\x02\xce\xcf\xe2p\x8b\xe27\x8c\x15q\xeb\xe1\
+\x96\xee\xb3-ww\xb4\xe5\xe9L\xce\xd3\x99\x1c\xf1\x85\
+\xe1\x99\x9c{*\xa0\xd8d\xb95Les\xcd\x82\xaa\
+\xec\xa1\xbfe\xa1#\x81\xb5>\xc2\xdf\xd8\x917\xc3\x81\
+\xed\x07\x90\x0c\x7f\xc8\xae\xcdW\xdb!\xa6\x8e\xbb\xc2\x07\
+\xdb\x03\xe3\x17\x92\x836\xc4\xc5\x85\xccC\x1d.\xd6\xdb\
+\xbcy\x1a\xdf\x85\xbd\xf5}(\xd1IG\x0a\xbfB(\
+\xd6g\xef\x86x\xa0\xb6\x0d1AY-Z\x8d\x08Z\
+\xfc\x8f:F\xabC\xb4\xc9Pka\x96\x8f\x93\xa4\x11\
+\xd5d\x1aV\x89\xc6\xee\xf2\x0c\x9b4\xc3\x22\xcbhM\
+2\xdap\x92\xdd|\xe7\xf0\x0f\x05\x0e%\xce\x01\xaf\xd1\
+$\xfbw;\xf5Jp\xa6\x8a\x1d\x8a\xafvlQ1\
+\x13QmQY\xed\xd6\xf4\xdf\xaa1\xf6\x1d\xed\xbb$\
+\xbd\xb7H\xb4\x15U\xd5\xe4\xc8\x1aWL\x8c\xfa\xee\x9b\
+\x8eZG\xfbQpDoI\xfc\xdd\xe0>\x1cEr\
+\xac\xca\x8b\x0dS\xe2\xcel\xb8=\x11V\xe4\xc0\xdb_\
+t\xc3/H\xf2\xbd(\x22\x14\xf0\xa2\xe7/\x1cv\xb0\
+\x22\xd7\x90\xc5\xe57\xc6\x97\x16u$:&\x13\xa7\xc9\
+t\xcc\xf3\x05U\xb2\xd0\x91)t\xa5\x09\x8a\x1ca\xeb\
+\xc9q\xfb\xb0S&\x05;\xc9\x08f3mJ`(\
+[k2\xd0\x9a\x09\xdc\xd5\xcdB[\xc1\xf8\x1a\x024\
+B\xdc\xdd\xc7\xa3\x06\x87\xedF\xdd\xb2\x94\x9f\x87\xf4\xf5\
+\x82.\xc3\xe7s\xfa\x9a\x7fF^\xe0\x16\x0fS\x12l\
+\x8a\xcf+\xf6\xe1b\xe6\xc0 \xe2l\xd1{S\x1cb\
+\xe8\x03'\xceso\xb9z\xfd#%\xf4\xf5$\xc67\
+\x1eEU\x83C\xe8\x82]l\xc0\x02t\xe13P\x92\
+\x15\xc9\x1cO\xac\x9dA \x07\xe6\xfb\xce%I\xa8\x13\
+\xe2\xef(\xdc\xb0\x06\xc7\x8b\x913E\x0b0*\xa0\xff\
+\x0dt\x08\xec\xe8\xc2c\xae\xe7G\x8a\xc1 \x9d\x15\x89\
+\xa93#\xf1\xad\x173\x0c\xb4\xefLB\xe4%\xe0\xa2\
+\x18\xba\xcc%\xce\xbe\x07\xb1\x8f\x02E\xb2\xcf\x86\xe4\xae\
+\x8a\xc1\xb9\xe2H\xddB\x1f\xdb\x5c\xe3\x05.'\xf8#\
+\x96\xd7\xd4\x9d\xd8\xabYt\xb3\xcfV\x8e\xef/w3\
+\xc0L\xa2\xdd\x8b\x06x\xe9\xe1H\x09\xad\x8d\xaa\xd6\xea\
+\x92\xb5q\xbd\xda\xa0X\xddU\xa9V\x96\xa9\x8d!\x99\
+\x12'\x97\x81:\x8b}\xb5\xf5\xaa\xbe\xd6pk\x10\xb6\
+\xd5\x14\x1aM_K^\xb4\xab\xac\xc8<'2\xce\x88\
+Z\xf2!\xe39\xfe\xe7\x19\xee$\x85\x00\xe1\xdf\x8d\xa5\
+\xf6O\x17,P\xa7h\xddO\xd0\xb3\x85\xdd\x13\xf4\xdc\
+\x0az\xb6\xdc\x1b\xd5V/\xd6\x5c\x07\xd8u{\x94v\
+h\x9d\xb7H\x09\xcc\xc5\x9b\xa4J\x0f\xdd\xbf\x9b\x96k\
+\x07\xf57\xdc\xbcx\xd9v\xc5\xcdq\xef+n\x9aW\
+\x0f6\xa6O\xba\x93\xb4~k\x7f\xeby\xca\xa0\xb8\x96\
+\xad\x1c\xa1u-~  B\xf3\xcb\xa0\x1e\xc1]P\
+\x03\xf9'\xb1\x7f\xdb\xcb\xa0\xae\xfc\x18\xfc\xde\x19\x04\x18\
+\xc12\xf8c\xcbB\xd1\x1cl\xaf\x9f*\xffL\xf2\x7f\
+\x88\xd3g)\x0a\xb7\x91r\x01\xdfz\xb1\xea\x1a\xfe\xd2\
+\xbf\x94Tg\xe1\xad\xb7I~\x9d\xcd\xfa\xf5\x9bi\xe7\
+7\x04\x8bS\xda\xc0oq\xd1j\xde\xad\x0b0)\x15\
+\x9f\xb5+\xe3BS\xbc\xfa\x7fA*\xa9\xaa\xff\x86T\
+6\x89\xff\x15\xa9l\x14\xff;\x92(\xa5\xee_\xbc8\
+\x95\x13\x1b\x9c(#\x7f\xf5O\x93\xdaU!\x85\xaa\x8e\
+\xbd\xcdV\xd7\xa6\xb9\x01Q\xf8\x8e@1*\x03=\xa7\
+\xc1\x91\x1f\xa6\x01rB\xe2\xf3x\xa5\xc0\x02.g \
+~mT\xd5\x152.\xd5s&C\x82\xa2\x00\x96\xa1\
+\xf8c\x18V\x19\xe7\x8d\x19\x01\x9eG\x1e\x18\x0f\x99\xcf\
+\x01\x03\xfc\x8b\x99\xcf\xbfY\x08\xe0\xad\xcf\xf29D\xf8\
+&g\xc2\x0a\xdd\x5c\xb5YS\xc6\x22$t\x0cQ\xe9\
++N0\x98f\xc9\x835s\x82\x05\x03\xe7\xb9\x86\xd8\
+g'KP\xb2a\xd4\xfe\xd3\x05X\xc7ppT\xd9\
+\x07\x18\xc6\xf0\xf0\xb8\xfa\xc7Y.\xfb\xba\xcc)@\x09\
+\xc5\x11W['\xbb\xe3#\x15\xbb\xecc\xa6C\xb7\xae\
+D\x9dN\xc5}\xbd\xde:-vD\xeeV\xa7\xc7'\
+5\x1d\x1c\x0d\x94:\xe8\xab\xd2\xa3\x93\x81\x9dJ\xc5G\
+x?rS<~\xf6\x7f\x08\x10\xd4\xfb\
 \x00\x00\x03\x86\
 \x00\
 \x00\x10Cx\x9c\xcdW\xdbn\xdb0\x0c}\xefW\x18\
@@ -1911,7 +1913,7 @@ qt_resource_struct = b"\
 \x00\x00\x00\xe6\x00\x00\x00\x00\x00\x01\x00\x00.\xba\
 \x00\x00\x01D\x00\x00\x00\x00\x00\x01\x00\x00D\xcf\
 \x00\x00\x01\x90\x00\x01\x00\x00\x00\x01\x00\x00O\xd7\
-\x00\x00\x01\xfc\x00\x01\x00\x00\x00\x01\x00\x00ke\
+\x00\x00\x01\xfc\x00\x01\x00\x00\x00\x01\x00\x00k\x85\
 \x00\x00\x01\xac\x00\x00\x00\x00\x00\x01\x00\x00U\x5c\
 \x00\x00\x01\xca\x00\x01\x00\x00\x00\x01\x00\x00[\xbd\
 \x00\x00\x01\xe0\x00\x01\x00\x00\x00\x01\x00\x00^T\
@@ -0,0 +1,137 @@
+import unittest, json, os, random, re, shutil, subprocess, sys
+
+# the documents are imported with the headless FreeCAD stand-ins
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Benchmark
+import Documents.Digest as Digest
+
+
+def applied(operations):
+    # tree after applying the operations (group, name, prop, value), a value of False removes the property
+    
+    tree = Digest.Tree()
+    for group, name, prop, value in operations:
+        if value is False:
+            tree.remove(group, name, prop)
+        else:
+            tree.set(group, name, prop, value)
+    return tree
+
+
+class TestTree(unittest.TestCase):
+    
+    def assertConsistent(self, tree, group):
+        # every inner tree node is the sum of its children, every leaf the sum of its objects
+        
+        def check(path):
+            if len(path) == Digest.depth:
+                objects = tree.objects(group, path)
+                for name in objects:
+                    self.assertEqual(Digest.bucket(name), tuple(path))
+                return sum(objects.values()) & 0xffffffff
+            
+            children = tree.children(group, path)
+            for i in range(Digest.fanout):
+                self.assertEqual(children[i], check(path + [i]))
+            return sum(children) & 0xffffffff
+        
+        self.assertEqual(tree.root(group), check([]))
+    
+    def test_set_remove(self):
+        
+        random.seed(42)
+        operations = []
+        for i in range(2000):
+            name  = f"Object{random.randrange(200)}"
+            prop  = f"Prop{random.randrange(5)}"
+            value = random.choice([None, False, 1.5, "text", [1, 2], {"a": True}, i])
+            operations.append((random.choice(["Objects", "ViewProviders"]), name, prop, value))
+        
+        tree = applied(operations)
+        for group in ["Objects", "ViewProviders"]:
+            self.assertConsistent(tree, group)
+        
+        #the incremental result only depends on the final state
+        final = {}
+        for group, name, prop, value in operations:
+            final[(group, name, prop)] = value
+        rebuilt = applied([key + (value,) for key, value in final.items() if value is not False])
+        for group in ["Objects", "ViewProviders"]:
+            self.assertEqual(tree.root(group), rebuilt.root(group))
+            for i in range(Digest.fanout):
+                for j in range(Digest.fanout):
+                    self.assertEqual(tree.objects(group, [i, j]), rebuilt.objects(group, [i, j]))
+    
+    def test_remove_object(self):
+        
+        tree = applied([("Objects", "A", "P1", 1), ("Objects", "A", "P2", "x"), ("Objects", "B", "P1", 1)])
+        path = list(Digest.bucket("A"))
+        self.assertIn("A", tree.objects("Objects", path))
+        
+        tree.remove("Objects", "A")
+        self.assertNotIn("A", tree.objects("Objects", path))
+        self.assertEqual(tree.root("Objects"), applied([("Objects", "B", "P1", 1)]).root("Objects"))
+        self.assertConsistent(tree, "Objects")
+        
+        #objects without data are not part of the digest
+        tree.set("Objects", "B", "P1", None)
+        self.assertEqual(tree.root("Objects"), 0)
+        self.assertEqual(tree.objects("Objects", list(Digest.bucket("B"))), {})
+    
+    def test_clear(self):
+        
+        tree = applied([("Objects", "A", "P", 1), ("ViewProviders", "A", "P", 2)])
+        tree.clear()
+        for group in ["Objects", "ViewProviders"]:
+            self.assertEqual(tree.root(group), 0)
+            self.assertEqual(tree.objects(group, list(Digest.bucket("A"))), {})
+            self.assertConsistent(tree, group)
+        
+        tree.set("Objects", "A", "P", 1)
+        self.assertEqual(tree.root("Objects"), applied([("Objects", "A", "P", 1)]).root("Objects"))
+
+
+class TestEncoding(unittest.TestCase):
+    # The node calculates the same hashes in main.dml. Its hash functions are run with node.js
+    
+    Values = [None, True, False, 0, 1, -1.5, 1e300, 0.1, "", "text", "Ümlaut €", "\U0001F600", [], [1, "a", [True, None]],
+              {}, {"b": 1, "a": [2.5, "x"]}, {"nested": {"z": 1, "y": [{}]}}]
+    
+    @classmethod
+    def setUpClass(cls):
+        
+        cls.node = shutil.which("node") or shutil.which("nodejs")
+        if not cls.node:
+            raise unittest.SkipTest("node.js not available")
+        
+        #the Document functions of main.dml as plain javascript
+        path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Dml", "main.dml")
+        with open(path) as f:
+            dml = f.read()
+        
+        functions = []
+        for match in re.finditer(r"const function (\w+)\((.*?)\) \{", dml):
+            depth, end = 1, match.end()
+            while depth:
+                depth += {"{": 1, "}": -1}.get(dml[end], 0)
+                end += 1
+            functions.append(f"Document.{match.group(1)} = function({match.group(2)}) {{{dml[match.end():end]}")
+        
+        cls.script = "var Document = {}\n" + "\n".join(functions)
+    
+    def run_node(self, code, data):
+        
+        script = self.script + f"\nvar data = {json.dumps(data)}\nconsole.log(JSON.stringify({code}))"
+        result = subprocess.run([self.node, "-e", script], capture_output=True, text=True, check=True)
+        return json.loads(result.stdout)
+    
+    def test_property(self):
+        
+        remote = self.run_node("data.map(function(v) { return Document.HashProperty('Prop', v) })", self.Values)
+        self.assertEqual(remote, [Digest.hashProperty("Prop", value) for value in self.Values])
+    
+    def test_object_and_bucket(self):
+        
+        names = ["Box", "Feature001", "Ümlaut", "\U0001F600"]
+        remote = self.run_node("data.map(function(n) { return [Document.HashObject(n, 0xdeadbeef), Document.Bucket(n)] })", names)
+        self.assertEqual(remote, [[Digest.hashObject(name, 0xdeadbeef), list(Digest.bucket(name))] for name in names])
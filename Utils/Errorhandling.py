@@ -94,7 +94,7 @@ def isOCPError(error: Exception, errclass: OCPErrorClass=OCPErrorClass.none, sou
             return False
         
         comps = uri.split(".")
-        if errclass != OCPErrorClass.none and [2] != errclass.name:
+        if errclass != OCPErrorClass.none and comps[2] != errclass.name:
             return False
             
         if source and comps[3] != source:
@@ -187,6 +187,7 @@ class WampErrorHandler(ErrorHandler):
         
         if not isinstance(exception, wamp.Error):
             super()._processException(exception)
+            return
         
         data = self._extractErrorData(exception)
         data["arguments"] = exception.args
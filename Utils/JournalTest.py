@@ -0,0 +1,221 @@
+import unittest, asyncio, json, os, shutil, sys, tempfile, uuid
+
+# the journal is tested with the headless FreeCAD stand-ins
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Benchmark
+import FreeCAD
+import Documents.Observer as Observer
+from Benchmark.Harness import _Handler
+from Documents.Journal import Journal
+
+
+class Recorder():
+    # online document replacement, recording the calls of a replay
+
+    def __init__(self, objects = ()):
+        self.objects = {name: None for name in objects}
+        self.calls   = []
+
+    def __getattr__(self, name):
+        def record(obj, *args):
+            self.calls.append((name, obj.Name if hasattr(obj, "Name") else obj.Object.Name) + args)
+        return record
+
+
+class JournalTestBase(unittest.IsolatedAsyncioTestCase):
+    # the journal buffers its file writes with the event loop
+
+    def setUp(self):
+        # replay blocks the observers, which report to a handler without entities
+        self.handler = _Handler()
+        self.handler.previous = Observer.setHandler(self.handler)
+        self.directory = tempfile.mkdtemp()
+        os.environ["FC_OCP_JOURNAL_DIR"] = self.directory
+        self.document = FreeCAD.newDocument("JournalTest")
+        self.journal  = Journal(str(uuid.uuid4()), self.document)
+
+    def tearDown(self):
+        self.journal.discard()
+        FreeCAD.closeDocument(self.document.Name)
+        shutil.rmtree(self.directory, ignore_errors=True)
+        del os.environ["FC_OCP_JOURNAL_DIR"]
+        Observer.setHandler(self.handler.previous)
+
+    def addObject(self, name, scalar = 1.0):
+        obj = self.document.addObject("App::FeaturePython", name)
+        obj.addProperty("App::PropertyFloat", "Scalar", "Test")
+        obj.Scalar = scalar
+        return obj
+
+    def fileRecords(self):
+        with open(self.journal.path) as f:
+            return [json.loads(line) for line in f]
+
+
+class TestCompact(JournalTestBase):
+
+    def test_properties_once(self):
+
+        obj = self.addObject("A")
+        for i in range(3):
+            self.journal.changeObject(obj, "Scalar")
+            self.journal.changeObject(obj, "Label")
+        self.journal.changePropertyStatus(obj, "Scalar")
+
+        self.assertEqual(self.journal.size, 7)
+        self.assertEqual(self.journal.compact(),
+                         [{"op": "change", "group": "Objects", "name": "A", "prop": "Scalar"},
+                          {"op": "change", "group": "Objects", "name": "A", "prop": "Label"},
+                          {"op": "status", "group": "Objects", "name": "A", "prop": "Scalar"}])
+
+    def test_created_and_removed(self):
+
+        obj = self.addObject("A")
+        self.journal.newObject(obj)
+        self.journal.changeObject(obj, "Scalar")
+        self.journal.removeObject(obj)
+
+        #changes of removed objects are dropped, creations and removals keep their order
+        other = self.addObject("B")
+        self.journal.changeObject(other, "Scalar")
+        self.journal.removeObject(other)
+        new = self.addObject("C")
+        self.journal.newObject(new)
+        self.journal.changeObject(new, "Scalar")
+
+        self.assertEqual(self.journal.compact(), [{"op": "remove", "name": "B"}, {"op": "new", "name": "C"}])
+
+    def test_dynamic_properties(self):
+
+        obj = self.addObject("A")
+        self.journal.newDynamicProperty(obj, "Added")
+        self.journal.changeObject(obj, "Added")
+        self.journal.removeDynamicProperty(obj, "Added")
+        self.journal.changeObject(obj, "Existing")
+        self.journal.removeDynamicProperty(obj, "Existing")
+        self.journal.addDynamicExtension(obj, "App::GroupExtensionPython", [])
+
+        self.assertEqual(self.journal.compact(),
+                         [{"op": "extension", "group": "Objects", "name": "A", "ext": "App::GroupExtensionPython"},
+                          {"op": "removeProperty", "group": "Objects", "name": "A", "prop": "Existing"}])
+
+    def test_rewrite(self):
+        # the file is replaced by the compacted records every _compactEvery appends
+
+        obj = self.addObject("A")
+        compactEvery = Journal._compactEvery
+        Journal._compactEvery = 10
+        try:
+            for i in range(10):
+                self.journal.changeObject(obj, "Scalar")
+        finally:
+            Journal._compactEvery = compactEvery
+
+        self.assertEqual(self.journal.size, 1)
+        self.assertEqual(len(self.fileRecords()), 1)
+
+        #reopened journals continue with the file content
+        self.journal.changeObject(obj, "Label")
+        self.journal.close()
+        reopened = Journal(self.journal.id, self.document)
+        self.assertEqual(reopened.size, 2)
+        reopened.close()
+
+
+class TestBuffering(JournalTestBase):
+
+    async def test_recompute_flush(self):
+
+        obj = self.addObject("A")
+        self.journal.beginRecompute()
+        self.journal.changeObject(obj, "Scalar")
+        self.journal.changeObject(obj, "Label")
+        self.assertEqual(self.fileRecords(), [])
+
+        self.journal.endRecompute()
+        self.assertEqual(len(self.fileRecords()), 2)
+
+    async def test_timed_flush(self):
+
+        obj = self.addObject("A")
+        self.journal.changeObject(obj, "Scalar")
+        self.assertEqual(self.fileRecords(), [])
+
+        await asyncio.sleep(Journal._flushDelay * 2)
+        self.assertEqual(len(self.fileRecords()), 1)
+
+    async def test_close_flush(self):
+
+        obj = self.addObject("A")
+        self.journal.changeObject(obj, "Scalar")
+        self.journal.close()
+        self.assertEqual(len(self.fileRecords()), 1)
+
+
+class TestSnapshot(JournalTestBase):
+
+    def test_capture(self):
+
+        obj = self.addObject("A", 2.0)
+        self.journal.changeObject(obj, "Scalar")
+        self.journal.changeObject(obj, "Missing")
+        snapshot = self.journal.capture()
+
+        #values are captured, records of unavailable properties skipped
+        obj.Scalar = 5.0
+        self.assertEqual(len(snapshot.records), 1)
+        self.assertEqual(snapshot.records[0]["value"], 2.0)
+
+    def test_replay(self):
+
+        obj = self.addObject("A", 2.0)
+        self.journal.changeObject(obj, "Scalar")
+        removed = self.addObject("B")
+        self.journal.removeObject(removed)
+        snapshot = self.journal.capture()
+
+        #the loaded node state overrides the value
+        obj.Scalar = 5.0
+        recorder = Recorder(["A", "B"])
+        snapshot.replay(recorder)
+
+        self.assertEqual(obj.Scalar, 2.0)
+        self.assertIsNone(self.document.getObject("B"))
+        self.assertEqual(recorder.calls, [("removeObject", "B"), ("changeObject", "A", "Scalar")])
+
+    def test_created_offline(self):
+
+        obj = self.addObject("A", 2.0)
+        self.journal.newObject(obj)
+        snapshot = self.journal.capture()
+
+        recorder = Recorder()
+        snapshot.replay(recorder)
+
+        self.assertIn(("newObject", "A"), recorder.calls)
+        self.assertIn(("changeObject", "A", "Scalar"), recorder.calls)
+        self.assertIn(("newViewProvider", "A"), recorder.calls)
+
+    def test_name_clash(self):
+        # the node got an object with the same name, which replaced ours when the node state was loaded
+
+        obj = self.addObject("A", 2.0)
+        obj.addProperty("App::PropertyString", "Offline", "Test")
+        obj.Offline = "created offline"
+        self.journal.newObject(obj)
+        snapshot = self.journal.capture()
+
+        self.document.removeObject("A")
+        self.addObject("A", 7.0)
+        recorder = Recorder(["A"])
+        snapshot.replay(recorder)
+
+        names = [o.Name for o in self.document.Objects]
+        self.assertEqual(len(names), 2)
+        recreated = [self.document.getObject(name) for name in names if name != "A"][0]
+        self.assertEqual(self.document.getObject("A").Scalar, 7.0)
+        self.assertEqual(recreated.Scalar, 2.0)
+        self.assertEqual(recreated.Offline, "created offline")
+        self.assertIn(("newObject", recreated.Name), recorder.calls)
+        self.assertIn(("changeObject", recreated.Name, "Offline"), recorder.calls)
+        self.assertNotIn(("newObject", "A"), recorder.calls)
@@ -0,0 +1,171 @@
+# ************************************************************************
+# *   Copyright (c) Stefan Troeger (stefantroeger@gmx.net) 2021          *
+# *                                                                      *
+# *   This library is free software; you can redistribute it and/or      *
+# *   modify it under the terms of the GNU Library General Public        *
+# *   License as published by the Free Software Foundation; either       *
+# *   version 2 of the License, or (at your option) any later version.   *
+# *                                                                      *
+# *   This library  is distributed in the hope that it will be useful,   *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of     *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the      *
+# *   GNU Library General Public License for more details.               *
+# *                                                                      *
+# *   You should have received a copy of the GNU Library General Public  *
+# *   License along with this library; see the file COPYING.LIB. If not, *
+# *   write to the Free Software Foundation, Inc., 59 Temple Place,      *
+# *   Suite 330, Boston, MA  02111-1307, USA                             *
+# ************************************************************************
+
+# Priority lanes for the traffic to the OCP node
+#
+# Every action runs in a lane, from interactive object edits down to bulk transfers of whole documents. The lane is
+# stored in a context variable: the runners capture it when a task is added and restore it on execution, and the 
+# API uses it to schedule its sessions. Sessions are shared by weighted round robin between all lanes with waiting
+# calls, hence higher lanes are served first without starving the lower ones.
+#
+# IMPORTANT: Used by Utils, hence only stdlib imports are allowed
+
+import asyncio, contextvars, functools
+from enum import IntEnum
+
+
+class Lane(IntEnum):
+    # lower value means higher priority
+    Interactive  = 0    # object property changes
+    Structure    = 1    # object creation and removal
+    ViewProvider = 2    # all viewprovider changes
+    Bulk         = 3    # setup and load of whole documents
+
+# share of sessions each lane gets if all lanes are waiting
+weights = {Lane.Interactive: 8, Lane.Structure: 4, Lane.ViewProvider: 2, Lane.Bulk: 1}
+
+_current = contextvars.ContextVar("ocp_lane", default=Lane.Interactive)
+
+
+def current():
+    return _current.get()
+
+
+class lane():
+    # context manager to run all actions within in the given lane
+    
+    def __init__(self, value):
+        self.__value = value
+        self.__token = None
+    
+    def __enter__(self):
+        self.__token = _current.set(self.__value)
+        return self
+    
+    def __exit__(self, exc_type, exc_value, tb):
+        _current.reset(self.__token)
+        return False
+
+
+def inLane(value):
+    # decorator to run a function or coroutine function in the given lane
+    
+    def decorator(fnc):
+        
+        if asyncio.iscoroutinefunction(fnc):
+            @functools.wraps(fnc)
+            async def wrapper(*args, **kwargs):
+                with lane(value):
+                    return await fnc(*args, **kwargs)
+        else:
+            @functools.wraps(fnc)
+            def wrapper(*args, **kwargs):
+                with lane(value):
+                    return fnc(*args, **kwargs)
+            
+        return wrapper
+    
+    return decorator
+
+
+class Scheduler():
+    # Hands out slots (e.g. sessions) to waiting lanes by smooth weighted round robin. Releasing a slot gives it 
+    # directly to the next waiter, or stores it as free if no one waits.
+    
+    def __init__(self):
+        self.__free    = []
+        self.__waiters = {l: [] for l in Lane}
+        self.__credit  = {l: 0 for l in Lane}
+    
+    @property
+    def waiting(self):
+        return sum(len(w) for w in self.__waiters.values())
+    
+    @property
+    def free(self):
+        return len(self.__free)
+    
+    async def acquire(self, value = None):
+        # returns the next slot for the lane (default: current one). 
+        
+        if value is None:
+            value = current()
+        
+        if self.__free and not self.waiting:
+            return self.__free.pop()
+        
+        future = asyncio.get_event_loop().create_future()
+        self.__waiters[value].append(future)
+        try:
+            return await future
+        
+        except asyncio.CancelledError:
+            if future in self.__waiters[value]:
+                self.__waiters[value].remove(future)
+            elif future.done() and not future.cancelled() and future.result() is not None:
+                # slot was granted but we cannot use it anymore
+                self.release(future.result())
+            raise
+    
+    def release(self, slot):
+        
+        future = self.__next()
+        if future is None:
+            self.__free.append(slot)
+        else:
+            future.set_result(slot)
+    
+    def discard(self, slot):
+        # removes a free slot, e.g. if the session disconnected
+        if slot in self.__free:
+            self.__free.remove(slot)
+    
+    def cancelAll(self, result = None):
+        # wakes all waiters with the given result, and forgets all free slots
+        
+        self.__free = []
+        for waiters in self.__waiters.values():
+            for future in waiters:
+                if not future.done():
+                    future.set_result(result)
+            waiters.clear()
+    
+    def __next(self):
+        # smooth weighted round robin over all lanes with waiters
+        
+        for waiters in self.__waiters.values():
+            while waiters and waiters[0].done():
+                waiters.pop(0)
+        
+        active = [l for l in Lane if self.__waiters[l]]
+        for l in Lane:
+            if l not in active:
+                self.__credit[l] = 0
+        
+        if not active:
+            return None
+        
+        total = 0
+        for l in active:
+            self.__credit[l] += weights[l]
+            total += weights[l]
+        
+        chosen = max(active, key=lambda l: (self.__credit[l], -l))
+        self.__credit[chosen] -= total
+        return self.__waiters[chosen].pop(0)
@@ -0,0 +1,119 @@
+import unittest, asyncio, os, sys
+
+# the scheduler is tested with plain slots instead of api sessions
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Benchmark
+from Utils.Priority import Lane, Scheduler, weights, lane, inLane, current
+
+
+class TestLane(unittest.IsolatedAsyncioTestCase):
+
+    async def test_context(self):
+
+        self.assertEqual(current(), Lane.Interactive)
+        with lane(Lane.Bulk):
+            self.assertEqual(current(), Lane.Bulk)
+            with lane(Lane.Structure):
+                self.assertEqual(current(), Lane.Structure)
+            self.assertEqual(current(), Lane.Bulk)
+        self.assertEqual(current(), Lane.Interactive)
+
+    async def test_decorator(self):
+
+        @inLane(Lane.ViewProvider)
+        async def coroutine():
+            await asyncio.sleep(0)
+            return current()
+
+        @inLane(Lane.Structure)
+        def function():
+            return current()
+
+        self.assertEqual(await coroutine(), Lane.ViewProvider)
+        self.assertEqual(function(), Lane.Structure)
+        self.assertEqual(current(), Lane.Interactive)
+
+
+class TestScheduler(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.scheduler = Scheduler()
+        self.order     = []
+
+    async def contend(self, counts, slots = 1):
+        # queues counts[lane] waiters per lane for the given number of slots. Every waiter records its lane and
+        # directly releases its slot again
+
+        async def use(value):
+            slot = await self.scheduler.acquire(value)
+            self.order.append(value)
+            await asyncio.sleep(0)
+            self.scheduler.release(slot)
+
+        tasks = [asyncio.create_task(use(l)) for l in Lane for i in range(counts.get(l, 0))]
+        await asyncio.sleep(0)
+        self.assertEqual(self.scheduler.waiting, len(tasks))
+
+        for slot in range(slots):
+            self.scheduler.release(slot)
+        await asyncio.gather(*tasks)
+
+    async def test_free_slot(self):
+
+        self.scheduler.release("slot")
+        self.assertEqual(self.scheduler.free, 1)
+        self.assertEqual(await self.scheduler.acquire(Lane.Bulk), "slot")
+        self.assertEqual(self.scheduler.free, 0)
+
+    async def test_weights(self):
+        # every round of sum(weights) grants gives each lane its weight
+
+        rounds = 3
+        await self.contend({l: weights[l] * rounds for l in Lane})
+
+        size = sum(weights.values())
+        for r in range(rounds):
+            grants = self.order[r*size:(r+1)*size]
+            self.assertEqual({l: grants.count(l) for l in Lane}, weights)
+
+        #smooth: the highest lane comes first, and the lowest is not left to the end of the round
+        self.assertEqual(self.order[0], Lane.Interactive)
+        self.assertLess(self.order.index(Lane.Bulk), size)
+
+    async def test_weights_of_active_lanes(self):
+        # lanes without waiters do not take a share
+
+        await self.contend({Lane.Structure: 8, Lane.Bulk: 8}, slots = 2)
+
+        grants = self.order[:10]
+        self.assertEqual(grants.count(Lane.Structure), 8)
+        self.assertEqual(grants.count(Lane.Bulk), 2)
+        self.assertEqual(self.scheduler.free, 2)
+
+    async def test_no_starvation(self):
+        # the bulk lane gets its share even if higher lanes always have waiters
+
+        await self.contend({Lane.Interactive: 80, Lane.Bulk: 10})
+        self.assertEqual(self.order[:45].count(Lane.Bulk), 5)
+        self.assertLess(self.order.index(Lane.Bulk), 9)
+
+    async def test_cancelled_waiter(self):
+
+        waiter = asyncio.create_task(self.scheduler.acquire(Lane.Interactive))
+        other  = asyncio.create_task(self.scheduler.acquire(Lane.Bulk))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        await asyncio.sleep(0)
+        self.scheduler.release("slot")
+        self.assertEqual(await other, "slot")
+        self.assertEqual(self.scheduler.waiting, 0)
+
+    async def test_cancel_all(self):
+
+        waiters = [asyncio.create_task(self.scheduler.acquire(l)) for l in Lane]
+        await asyncio.sleep(0)
+        self.scheduler.cancelAll()
+
+        self.assertEqual(await asyncio.gather(*waiters), [None] * len(Lane))
+        self.assertEqual(self.scheduler.waiting, 0)
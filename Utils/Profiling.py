@@ -0,0 +1,215 @@
+# ************************************************************************
+# *   Copyright (c) Stefan Troeger (stefantroeger@gmx.net) 2021          *
+# *                                                                      *
+# *   This library is free software; you can redistribute it and/or      *
+# *   modify it under the terms of the GNU Library General Public        *
+# *   License as published by the Free Software Foundation; either       *
+# *   version 2 of the License, or (at your option) any later version.   *
+# *                                                                      *
+# *   This library  is distributed in the hope that it will be useful,   *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of     *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the      *
+# *   GNU Library General Public License for more details.               *
+# *                                                                      *
+# *   You should have received a copy of the GNU Library General Public  *
+# *   License along with this library; see the file COPYING.LIB. If not, *
+# *   write to the Free Software Foundation, Inc., 59 Temple Place,      *
+# *   Suite 330, Boston, MA  02111-1307, USA                             *
+# ************************************************************************
+
+# Performance instrumentation for the document pipeline
+#
+# The runners, batchers and the FreeCAD apply functions record into this module: queue wait and execution time
+# per task name, batch sizes per batcher and apply times. Recording is opt-in and costs a single flag check when
+# disabled. Additionally a statistical sampler can be started, which records the main thread stacks in regular
+# intervals. dump() writes everything as collapsed stacks ("a;b;c count" lines) which can be processed by
+# flamegraph.pl, speedscope or similar tools.
+#
+# Enable at startup with FC_OCP_PROFILE=1, the sampler with FC_OCP_PROFILE_SAMPLE=<interval in ms>.
+#
+# IMPORTANT: Used by Utils, hence only stdlib imports are allowed
+
+import os, sys, time, threading, json, collections
+
+enabled = os.getenv("FC_OCP_PROFILE", "0") not in ["", "0"]
+
+
+class _Stat():
+    # accumulates count, sum and maximum of a recorded value
+
+    __slots__ = ["count", "total", "max"]
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max   = 0.0
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def toDict(self):
+        return {"count": self.count, "total": self.total, "max": self.max,
+                "mean": self.total / self.count if self.count else 0.0}
+
+
+_stats   = collections.defaultdict(_Stat)   # (category, name) -> _Stat
+_sampler = None
+
+
+def setEnabled(value):
+    global enabled
+    enabled = value
+
+
+def record(category, name, value):
+    # records a single value (seconds or counts) for the named entry of the category
+    if enabled:
+        _stats[(category, name)].add(value)
+
+
+class timed():
+    # context measuring the wall time of the enclosed code, works within coroutines too
+    #   with Profiling.timed("apply", "setProperty"):
+    #       ...
+
+    __slots__ = ["category", "name", "start"]
+
+    def __init__(self, category, name):
+        self.category = category
+        self.name     = name
+
+    def __enter__(self):
+        # decided on entry: enabling or disabling while the code runs (e.g. awaiting) does not record a partial time
+        self.start = time.perf_counter() if enabled else None
+        return self
+
+    def __exit__(self, *args):
+        if self.start is not None:
+            _stats[(self.category, self.name)].add(time.perf_counter() - self.start)
+        return False
+
+
+def reset():
+    _stats.clear()
+    if _sampler:
+        _sampler.samples.clear()
+
+
+def statistics():
+    # returns all recorded values as {category: {name: {count, total, max, mean}}}
+
+    result = {}
+    for (category, name), stat in list(_stats.items()):
+        result.setdefault(category, {})[name] = stat.toDict()
+
+    return result
+
+
+# Statistical sampler
+# ********************************************************************************************
+
+class _Sampler(threading.Thread):
+    # Samples the stack of the given thread in regular intervals. Runs as daemon, so it never blocks shutdown
+
+    def __init__(self, thread, interval):
+        super().__init__(name="OCP Profiling Sampler", daemon=True)
+
+        self.thread   = thread
+        self.interval = interval
+        self.samples  = collections.Counter()
+        self.__lock   = threading.Lock()      # guards samples, which are copied while sampling continues
+        self.__stop   = threading.Event()
+
+    def stop(self):
+        self.__stop.set()
+
+    def snapshot(self):
+        with self.__lock:
+            return collections.Counter(self.samples)
+
+    def run(self):
+
+        while not self.__stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread, None)
+            stack = []
+            while frame:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+
+            if stack:
+                stack = ";".join(reversed(stack))
+                with self.__lock:
+                    self.samples[stack] += 1
+
+
+def startSampling(interval = 0.005):
+    # starts the sampler for the main thread, interval in seconds. Also enables recording
+    global _sampler
+
+    setEnabled(True)
+    if _sampler:
+        return
+
+    _sampler = _Sampler(threading.main_thread().ident, interval)
+    _sampler.start()
+
+
+def stopSampling():
+    global _sampler
+
+    if _sampler:
+        _sampler.stop()
+        _sampler.join()
+
+    samples = _sampler.samples if _sampler else collections.Counter()
+    _sampler = None
+    return samples
+
+
+def sampling():
+    return _sampler is not None
+
+
+# Report
+# ********************************************************************************************
+
+_lastSamples = collections.Counter()
+
+def dump(path):
+    # Writes the report as collapsed stacks into path. The recorded timings are added in microseconds as
+    # "ocp;<category>;<name>" stacks, the sampler stacks (if any) below "sampled". A JSON file with the full
+    # statistics is written next to it (path + ".json")
+    global _lastSamples
+
+    if _sampler:
+        samples = _sampler.snapshot()
+    else:
+        samples = _lastSamples
+
+    with open(path, "w") as file:
+        for (category, name), stat in sorted(list(_stats.items())):
+            if category in ["queue", "execute", "batch", "apply"]:
+                file.write(f"ocp;{category};{name} {int(stat.total*1e6)}\n")
+
+        for stack, count in samples.items():
+            file.write(f"sampled;{stack} {count}\n")
+
+    with open(path + ".json", "w") as file:
+        json.dump({"statistics": statistics(), "samples": sum(samples.values())}, file, indent=2)
+
+
+def stop():
+    # stops sampling and recording, the results are kept for a later dump
+    global _lastSamples
+
+    _lastSamples = stopSampling()
+    setEnabled(False)
+
+
+sampleInterval = os.getenv("FC_OCP_PROFILE_SAMPLE", "")
+if sampleInterval:
+    startSampling(float(sampleInterval) / 1000.0)
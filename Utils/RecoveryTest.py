@@ -0,0 +1,153 @@
+import unittest, asyncio, os, sys
+from unittest import mock
+from autobahn import wamp
+
+# recovery is tested without node: the clock and the retry delay are patched
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Benchmark
+import Documents.Recovery as Recovery
+
+
+class Clock():
+    # replacement for time.monotonic, advanced by the tests
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = Clock()
+        patcher = mock.patch.object(Recovery.time, "monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = Recovery.Breaker(threshold = 3, window = 10, cooldown = 30, interval = 1)
+
+    def test_opens_on_threshold(self):
+
+        self.breaker.failure()
+        self.breaker.failure()
+        self.assertFalse(self.breaker.isOpen)
+
+        self.breaker.failure()
+        self.assertTrue(self.breaker.isOpen)
+
+    def test_window(self):
+        # failures older than the window are not counted
+
+        self.breaker.failure()
+        self.breaker.failure()
+        self.clock.now += 11
+        self.breaker.failure()
+        self.breaker.failure()
+        self.assertFalse(self.breaker.isOpen)
+
+        self.breaker.failure()
+        self.assertTrue(self.breaker.isOpen)
+
+    def test_cooldown(self):
+
+        for i in range(3):
+            self.breaker.failure()
+
+        self.clock.now += 29
+        self.assertTrue(self.breaker.isOpen)
+        self.assertAlmostEqual(self.breaker.schedule(), 1)
+
+        self.clock.now += 1
+        self.assertFalse(self.breaker.isOpen)
+
+    def test_half_open_failure(self):
+        # after the cooldown a single failed trial opens the breaker again
+
+        for i in range(3):
+            self.breaker.failure()
+        self.clock.now += 30
+
+        self.breaker.failure()
+        self.assertTrue(self.breaker.isOpen)
+        self.clock.now += 30
+        self.assertFalse(self.breaker.isOpen)
+
+    def test_half_open_success(self):
+        # a successful trial closes the breaker, it needs the full threshold to open again
+
+        for i in range(3):
+            self.breaker.failure()
+        self.clock.now += 30
+
+        self.breaker.success()
+        self.breaker.failure()
+        self.breaker.failure()
+        self.assertFalse(self.breaker.isOpen)
+        self.breaker.failure()
+        self.assertTrue(self.breaker.isOpen)
+
+    def test_schedule_interval(self):
+
+        self.assertEqual(self.breaker.schedule(), 0)
+        self.assertEqual(self.breaker.schedule(), 1)
+        self.assertEqual(self.breaker.schedule(), 2)
+
+        #slots not used in the past are not accumulated
+        self.clock.now += 10
+        self.assertEqual(self.breaker.schedule(), 0)
+
+
+class TestRetry(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(Recovery, "delay", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.calls = 0
+
+    def failing(self, errors, result = "done"):
+        # coroutine function raising the given errors one after the other, and returning the result afterwards
+
+        async def call():
+            self.calls += 1
+            if self.calls <= len(errors):
+                raise errors[self.calls - 1]
+            return result
+
+        return call
+
+    def test_classification(self):
+
+        self.assertTrue(Recovery.isTransient(asyncio.TimeoutError()))
+        self.assertTrue(Recovery.isTransient(wamp.TransportLost()))
+        self.assertTrue(Recovery.isTransient(wamp.ApplicationError(wamp.ApplicationError.CANCELED)))
+        self.assertTrue(Recovery.isTransient(wamp.ApplicationError("ocp.error.connection.node.timeout")))
+        self.assertFalse(Recovery.isTransient(wamp.ApplicationError("ocp.error.user.document.invalid")))
+        self.assertFalse(Recovery.isTransient(wamp.ApplicationError(wamp.ApplicationError.NO_SUCH_PROCEDURE)))
+        self.assertFalse(Recovery.isTransient(ValueError()))
+
+    async def test_transient_retried(self):
+
+        call = self.failing([asyncio.TimeoutError(), wamp.TransportLost()])
+        self.assertEqual(await Recovery.retry(call), "done")
+        self.assertEqual(self.calls, 3)
+
+    async def test_gives_up_on_permanent(self):
+
+        call = self.failing([wamp.ApplicationError("ocp.error.user.document.invalid")])
+        with self.assertRaises(wamp.ApplicationError):
+            await Recovery.retry(call)
+        self.assertEqual(self.calls, 1)
+
+        self.calls = 0
+        with self.assertRaises(ValueError):
+            await Recovery.retry(self.failing([asyncio.TimeoutError(), ValueError()]))
+        self.assertEqual(self.calls, 2)
+
+    async def test_gives_up_after_attempts(self):
+
+        call = self.failing([asyncio.TimeoutError()] * Recovery.attempts)
+        with self.assertRaises(asyncio.TimeoutError):
+            await Recovery.retry(call)
+        self.assertEqual(self.calls, Recovery.attempts)
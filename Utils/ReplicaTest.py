@@ -0,0 +1,147 @@
+import unittest, asyncio, json, os, shutil, sys, tempfile
+
+# the replica is tested with the headless FreeCAD stand-ins and the in-process benchmark node
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Benchmark
+import Documents.Observer as Observer
+from Benchmark.Harness import Peer, _Handler, _createObjects
+from Documents.Replica import Replica
+
+
+class TestReplica(unittest.IsolatedAsyncioTestCase):
+    # a first peer edits the node document, the second one replicates it
+
+    async def asyncSetUp(self):
+
+        self.path    = tempfile.mkdtemp()
+        self.node    = Benchmark.FakeNode()
+        self.handler = _Handler()
+        self.handler.previous = Observer.setHandler(self.handler)
+        self.sender   = Peer(self.node, "ReplicaSender")
+        self.receiver = Peer(self.node, "ReplicaReceiver")
+        self.handler.peers = [self.sender, self.receiver]
+
+        self.docId = await self.sender.connection.api.call("ocp.documents.create", "")
+        await self.sender.setup(self.docId)
+        with Observer.blocked(self.sender.fcdocument):
+            _createObjects(self.sender.fcdocument, 5, 100)
+            for i in range(5):
+                #distinct binary data per object
+                self.sender.fcdocument.getObject(f"Feature{i}").Values = [float(v + i) for v in range(100)]
+        await self.sender.online_document.asyncSetup()
+        await self.sender.online_document.waitTillCloseout(10)
+
+        await self.receiver.dataservice.setup()
+        self.replica = Replica(self.docId, self.receiver.connection, self.receiver.dataservice, self.path)
+        await self.replica.refresh()
+
+    async def asyncTearDown(self):
+
+        await self.sender.close()
+        await self.receiver.close()
+        Observer.setHandler(self.handler.previous)
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def reopen(self):
+        return Replica(self.docId, self.receiver.connection, self.receiver.dataservice, self.path)
+
+    def files(self, group = "Objects"):
+        return sorted(os.listdir(os.path.join(self.replica.path, group)))
+
+    def blobs(self):
+        return os.listdir(os.path.join(self.replica.path, "blobs"))
+
+    def cid(self, name):
+        return self.replica.objects["Objects"][name]["properties"]["Values"][0]
+
+    async def load(self):
+        # applies the replica to the receivers document and loads the remaining changes
+
+        mirror = self.replica.apply(self.receiver.fcdocument)
+        await self.receiver.setup(self.docId, mirror)
+        before = self.node.stats(self.receiver.connection.api)
+        await self.receiver.online_document.asyncLoad()
+        await self.receiver.online_document.waitTillCloseout(10)
+        return self.node.stats(self.receiver.connection.api) - before
+
+    async def test_refresh(self):
+
+        self.assertEqual(self.files(), [f"Feature{i}.json" for i in range(5)])
+        for i in range(5):
+            self.assertIn(self.cid(f"Feature{i}"), self.blobs())
+
+        #the reopened replica knows everything
+        reopened = self.reopen()
+        self.assertEqual(reopened.objects, self.replica.objects)
+        self.assertEqual(reopened.mirror.versions, self.replica.mirror.versions)
+
+    async def test_refresh_writes_changes_only(self):
+
+        stamps = {file: os.stat(os.path.join(self.replica.path, "Objects", file)).st_mtime_ns for file in self.files()}
+        self.sender.fcdocument.getObject("Feature2").Text = "Changed"
+        await self.sender.online_document.waitTillCloseout(10)
+        await self.replica.refresh()
+
+        changed = [file for file, stamp in stamps.items()
+                   if os.stat(os.path.join(self.replica.path, "Objects", file)).st_mtime_ns != stamp]
+        self.assertEqual(changed, ["Feature2.json"])
+        self.assertEqual(self.reopen().objects["Objects"]["Feature2"]["properties"]["Text"][0], "Changed")
+
+    async def test_removed_and_recreated(self):
+
+        removed = self.cid("Feature1")
+        doc = self.sender.fcdocument
+        doc.removeObject("Feature1")
+        doc.removeObject("Feature4")
+        await self.sender.online_document.waitTillCloseout(10)
+        obj = doc.addObject("App::FeaturePython", "Feature4")
+        obj.addProperty("App::PropertyString", "Text", "Benchmark")
+        obj.Text = "Recreated"
+        await self.sender.online_document.waitTillCloseout(10)
+        await self.replica.refresh()
+
+        self.assertNotIn("Feature1.json", self.files())
+        self.assertNotIn("Feature1", self.replica.objects["Objects"])
+        self.assertNotIn("Scalar", self.replica.objects["Objects"]["Feature4"]["properties"])
+        self.assertNotIn(removed, self.blobs())
+
+        #reopened and applied the replica reflects the recreated object, and nothing is left to load
+        self.replica = self.reopen()
+        stats = await self.load()
+        fcdoc = self.receiver.fcdocument
+        self.assertIsNone(fcdoc.getObject("Feature1"))
+        self.assertEqual(fcdoc.getObject("Feature4").Text, "Recreated")
+        self.assertNotIn("Scalar", fcdoc.getObject("Feature4").PropertiesList)
+        self.assertEqual(stats.functions["GetValue"] + stats.functions["GetValues"], 0)
+        #the headless stand-ins keep removed viewproviders on the node, hence only the objects are verified
+        self.assertEqual((await self.receiver.online_document.verify())["Objects"], {})
+
+    async def test_missing_blob(self):
+        # binary data missing in the replica is loaded from the node
+
+        cid = self.cid("Feature3")
+        os.remove(os.path.join(self.replica.path, "blobs", cid))
+
+        stats = await self.load()
+        self.assertEqual(list(self.receiver.fcdocument.getObject("Feature3").Values), [float(v + 3) for v in range(100)])
+        self.assertEqual(stats.functions["GetValue"] + stats.functions["GetValues"], 1)
+        self.assertEqual(stats.functions["BinariesByCid"], 1)
+
+        #the next refresh stores it again
+        await self.replica.refresh()
+        self.assertIn(cid, self.blobs())
+
+    async def test_broken_file(self):
+        # only the unreadable object is fetched again
+
+        with open(os.path.join(self.replica.path, "Objects", "Feature0.json"), "w") as f:
+            f.write("{broken")
+
+        replica = self.reopen()
+        self.assertNotIn("Feature0", replica.objects["Objects"])
+        self.assertIn("Feature1", replica.objects["Objects"])
+
+        await replica.refresh()
+        self.assertEqual(replica.objects, self.replica.objects)
+        with open(os.path.join(self.replica.path, "Objects", "Feature0.json")) as f:
+            self.assertEqual(json.load(f)["entry"], self.replica.objects["Objects"]["Feature0"])
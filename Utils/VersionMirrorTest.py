@@ -0,0 +1,188 @@
+import unittest, asyncio, os, sys
+
+# the documents are tested with the headless FreeCAD stand-ins and the in-process benchmark node
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Benchmark
+import Documents.Observer as Observer
+from Benchmark.Harness import Peer, _Handler, _createObjects
+from Documents.OnlineDocument import VersionMirror, OnlineDocument
+
+
+def change(version, props, extVersion = 0, created = 1, typeid = "App::FeaturePython"):
+    # a GetChanges entry
+    return [typeid, f"{created}:{version}", props, extVersion, created]
+
+
+class TestVersionMirror(unittest.TestCase):
+
+    def test_known(self):
+
+        mirror = VersionMirror()
+        self.assertFalse(mirror.synced)
+        self.assertEqual(mirror.known("Objects"), {})
+
+        mirror.update("Objects", {"objects": {"A": change(2, {"P": 1}), "B": change(5, {"P": 3})}, "removed": []})
+        self.assertTrue(mirror.synced)
+        self.assertEqual(mirror.known("Objects"), {"A": "1:2", "B": "1:5"})
+
+        #touched objects are always reported
+        mirror.touch("Objects", "A", "P")
+        self.assertEqual(mirror.known("Objects"), {"A": -1, "B": "1:5"})
+
+    def test_version_delta(self):
+
+        mirror = VersionMirror()
+        mirror.update("Objects", {"objects": {"A": change(3, {"P1": 1, "P2": 1, "P3": 1})}, "removed": []})
+
+        #only the properties with different version are divergent
+        self.assertEqual(mirror.divergent("Objects", "A", change(5, {"P1": 1, "P2": 3, "P3": 1})), ["P2"])
+
+        #locally touched properties are added
+        mirror.touch("Objects", "A", "P3")
+        self.assertEqual(sorted(mirror.divergent("Objects", "A", change(5, {"P1": 1, "P2": 3, "P3": 1}))), ["P2", "P3"])
+
+        #unknown touches, new or removed properties and extension changes require the full object
+        self.assertIsNone(mirror.divergent("Objects", "A", change(5, {"P1": 1, "P2": 1})))
+        self.assertIsNone(mirror.divergent("Objects", "A", change(5, {"P1": 1, "P2": 1, "P3": 1}, extVersion = 1)))
+        self.assertIsNone(mirror.divergent("Objects", "B", change(5, {"P1": 1})))
+        mirror.touch("Objects", "A")
+        self.assertIsNone(mirror.divergent("Objects", "A", change(5, {"P1": 1, "P2": 3, "P3": 1})))
+
+    def test_removed_and_recreated(self):
+
+        mirror = VersionMirror()
+        mirror.update("Objects", {"objects": {"A": change(2, {"P": 1}), "B": change(2, {"P": 1})}, "removed": []})
+
+        #a recreated object may have identical versions, but not the same creation id
+        self.assertIsNone(mirror.divergent("Objects", "A", change(2, {"P": 1}, created = 7)))
+        self.assertEqual(mirror.divergent("Objects", "A", change(2, {"P": 1})), [])
+
+        mirror.update("Objects", {"objects": {"A": change(2, {"P": 1}, created = 7)}, "removed": ["B"]})
+        self.assertEqual(mirror.known("Objects"), {"A": "7:2"})
+
+        mirror.remove("A")
+        self.assertFalse(mirror.synced)
+
+    def test_touch_while_loading(self):
+
+        mirror = VersionMirror()
+        mirror.update("Objects", {"objects": {"A": change(1, {"P1": 1, "P2": 1}), "B": change(1, {"P1": 1})}, "removed": []})
+
+        mirror.touch("Objects", "A", "P1")
+        mirror.known("Objects")                 #load starts
+        mirror.touch("Objects", "A", "P2")      #changed while loading
+        mirror.touch("Objects", "B")
+        mirror.update("Objects", {"objects": {}, "removed": []})
+
+        #only the touches reported to the load are cleared
+        self.assertEqual(mirror.touched["Objects"], {"A": {"P2"}, "B": True})
+        self.assertEqual(mirror.known("Objects"), {"A": -1, "B": -1})
+
+        #a full touch during the load survives a partial one reported before
+        mirror.update("Objects", {"objects": {}, "removed": []})
+        mirror.touch("Objects", "A", "P1")
+        mirror.known("Objects")
+        mirror.touch("Objects", "A")
+        mirror.update("Objects", {"objects": {}, "removed": []})
+        self.assertEqual(mirror.touched["Objects"], {"A": True})
+
+
+class TestIncrementalLoad(unittest.IsolatedAsyncioTestCase):
+    # asyncLoad against the benchmark node: a first peer edits the document while the second one is offline
+
+    async def asyncSetUp(self):
+
+        self.node    = Benchmark.FakeNode()
+        self.handler = _Handler()
+        self.handler.previous = Observer.setHandler(self.handler)
+        self.sender   = Peer(self.node, "MirrorSender")
+        self.receiver = Peer(self.node, "MirrorReceiver")
+        self.handler.peers = [self.sender, self.receiver]
+
+        self.docId = await self.sender.connection.api.call("ocp.documents.create", "")
+        await self.sender.setup(self.docId)
+        with Observer.blocked(self.sender.fcdocument):
+            _createObjects(self.sender.fcdocument, 5, 10)
+        await self.sender.online_document.asyncSetup()
+        await self.sender.online_document.waitTillCloseout(10)
+
+        await self.receiver.setup(self.docId)
+        await self.receiver.online_document.asyncLoad()
+        await self.receiver.online_document.waitTillCloseout(10)
+
+    async def asyncTearDown(self):
+
+        await self.sender.close()
+        await self.receiver.close()
+        Observer.setHandler(self.handler.previous)
+
+    async def disconnect(self):
+
+        doc = self.receiver.online_document
+        await doc.close()
+        self.receiver.online_document = None
+        return doc.mirror
+
+    async def reconnect(self, mirror):
+
+        doc = OnlineDocument(self.docId, self.receiver.fcdocument, self.receiver.connection, self.receiver.dataservice, mirror)
+        self.receiver.online_document = doc
+        await doc.setup()
+
+        before = self.node.stats(self.receiver.connection.api)
+        await doc.asyncLoad()
+        await doc.waitTillCloseout(10)
+        return self.node.stats(self.receiver.connection.api) - before
+
+    async def test_initial_load(self):
+
+        mirror = self.receiver.online_document.mirror
+        self.assertEqual(len(mirror.versions["Objects"]), 5)
+        self.assertEqual(self.receiver.fcdocument.getObject("Feature3").Text, "Feature 3")
+
+    async def test_only_changes_loaded(self):
+
+        mirror = await self.disconnect()
+        self.sender.fcdocument.getObject("Feature2").Scalar = 3.5
+        await self.sender.online_document.waitTillCloseout(10)
+
+        stats = await self.reconnect(mirror)
+        self.assertEqual(self.receiver.fcdocument.getObject("Feature2").Scalar, 3.5)
+        self.assertEqual(stats.functions["GetValue"] + stats.functions["GetValues"], 1)
+
+        #nothing changed: nothing to load
+        mirror = await self.disconnect()
+        stats = await self.reconnect(mirror)
+        self.assertEqual(stats.functions["GetValue"] + stats.functions["GetValues"], 0)
+
+    async def test_removed_and_recreated(self):
+
+        mirror = await self.disconnect()
+
+        #removed, and recreated under the same name with other properties
+        doc = self.sender.fcdocument
+        doc.removeObject("Feature1")
+        doc.removeObject("Feature4")
+        await self.sender.online_document.waitTillCloseout(10)
+        obj = doc.addObject("App::FeaturePython", "Feature4")
+        obj.addProperty("App::PropertyString", "Text", "Benchmark")
+        obj.Text = "Recreated"
+        await self.sender.online_document.waitTillCloseout(10)
+
+        await self.reconnect(mirror)
+        self.assertIsNone(self.receiver.fcdocument.getObject("Feature1"))
+        self.assertEqual(self.receiver.fcdocument.getObject("Feature4").Text, "Recreated")
+        self.assertNotIn("Scalar", self.receiver.fcdocument.getObject("Feature4").PropertiesList)
+
+    async def test_watermark_mid_load(self):
+        # a node change after GetChanges is not part of the stored versions, hence loaded by the next load
+
+        mirror  = await self.disconnect()
+        uri     = f"ocp.documents.{self.docId}.content.Document.Objects."
+        changes = await self.sender.connection.api.call(uri + "GetChanges", mirror.known("Objects"))
+        self.sender.fcdocument.getObject("Feature0").Scalar = 1.5
+        await self.sender.online_document.waitTillCloseout(10)
+        mirror.update("Objects", changes)
+
+        await self.reconnect(mirror)
+        self.assertEqual(self.receiver.fcdocument.getObject("Feature0").Scalar, 1.5)